@@ -0,0 +1,238 @@
+"""Vision pipeline benchmark.
+
+Times each stage of the capture/classify path over a matrix of ROI sizes
+and compares the results against a stored baseline.
+
+Usage:
+    python -m src.bench
+    python -m src.bench --out bench.json --baseline bench_baseline.json
+    python -m src.bench --save-baseline bench_baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import cv2
+
+from .core.engine import ROI
+from .core.vision import (HSV_GREEN_LOW, HSV_GREEN_HIGH, HSV_RED_LOW1, HSV_RED_HIGH1,
+                          HSV_RED_LOW2, HSV_RED_HIGH2)
+from .core.classifier import LutClassifier, HsvClassifier
+from .core.sources import MssFrameSource, SyntheticFrameSource
+from .utils.config import DEFAULT_CONFIG
+from .utils.screen import roi_for_screen
+
+# Screens the default ROI ratio is evaluated at
+SCREENS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+STAGES = ("capture", "convert", "mask", "count", "hsv_total", "lut_total")
+
+# Allowed p50 slowdown before a stage counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+
+def roi_matrix() -> dict:
+    """ROI sizes to benchmark, keyed by name."""
+    rois = {name: roi_for_screen(w, h) for name, (w, h) in SCREENS.items()}
+    stored = DEFAULT_CONFIG["roi"]
+    rois["config"] = ROI(stored["x"], stored["y"], stored["w"], stored["h"])
+    return rois
+
+
+def summarize(samples) -> dict:
+    """Latency percentiles (ms) and throughput for a list of durations (s)."""
+    arr = np.asarray(samples, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    mean = float(arr.mean())
+    return {
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "fps": round(1000.0 / mean, 1) if mean > 0 else None,
+    }
+
+
+def _time(fn, iterations: int, warmup: int = 10):
+    """Run fn repeatedly and return per-call durations in seconds."""
+    for _ in range(warmup):
+        fn()
+    out = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        t0 = clock()
+        fn()
+        out.append(clock() - t0)
+    return out
+
+
+def bench_roi(roi: ROI, source, iterations: int) -> dict:
+    """Benchmark all stages for one ROI size.
+
+    Args:
+        roi: Region to capture / render
+        source: FrameSource used for the capture stage
+        iterations: Timed iterations per stage
+
+    Returns:
+        dict: Per-stage summaries (capture is None if it failed)
+    """
+    stages = {}
+    try:
+        frame = source.grab(roi)
+        stages["capture"] = summarize(_time(lambda: source.grab(roi), iterations))
+    except Exception:
+        # ROI larger than the real screen, or no display at all
+        frame = None
+        stages["capture"] = None
+    if frame is None or frame.bgra.shape[:2] != (roi.h, roi.w):
+        synthetic = SyntheticFrameSource(idle_s=0.0)
+        frame = synthetic.grab(roi)
+    bgra = np.ascontiguousarray(frame.bgra)
+
+    bgr = np.empty((roi.h, roi.w, 3), dtype=np.uint8)
+    hsv = cv2.cvtColor(cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR), cv2.COLOR_BGR2HSV)
+    masks = {}
+
+    def convert():
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=bgr)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=hsv)
+
+    def mask():
+        masks["g"] = cv2.inRange(hsv, HSV_GREEN_LOW, HSV_GREEN_HIGH)
+        masks["r"] = cv2.bitwise_or(cv2.inRange(hsv, HSV_RED_LOW1, HSV_RED_HIGH1),
+                                    cv2.inRange(hsv, HSV_RED_LOW2, HSV_RED_HIGH2))
+
+    mask()
+
+    def count():
+        np.count_nonzero(masks["g"])
+        np.count_nonzero(masks["r"])
+
+    hsv_clf = HsvClassifier()
+    lut_clf = LutClassifier()
+    stages["convert"] = summarize(_time(convert, iterations))
+    stages["mask"] = summarize(_time(mask, iterations))
+    stages["count"] = summarize(_time(count, iterations))
+    stages["hsv_total"] = summarize(_time(lambda: hsv_clf.ratios(bgra), iterations))
+    stages["lut_total"] = summarize(_time(lambda: lut_clf.ratios(bgra), iterations))
+    return stages
+
+
+def run_benchmarks(iterations: int = 300, source=None) -> dict:
+    """Run the full ROI matrix.
+
+    Returns:
+        dict: {"meta": {...}, "results": {roi_name: {...}}}
+    """
+    source = source or MssFrameSource()
+    results = {}
+    for name, roi in roi_matrix().items():
+        results[name] = {"w": roi.w, "h": roi.h, "stages": bench_roi(roi, source, iterations)}
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "iterations": iterations,
+            "source": type(source).__name__,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Find stages whose p50 latency regressed beyond the tolerance.
+
+    Returns:
+        list: Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, entry in current["results"].items():
+        base_entry = baseline.get("results", {}).get(name)
+        if not base_entry:
+            continue
+        for stage, stats in entry["stages"].items():
+            base = base_entry["stages"].get(stage)
+            if not stats or not base:
+                continue
+            if stats["p50_ms"] > base["p50_ms"] * (1.0 + tolerance):
+                regressions.append(
+                    f"{name}/{stage}: p50 {stats['p50_ms']:.3f} ms "
+                    f"vs baseline {base['p50_ms']:.3f} ms")
+    return regressions
+
+
+def format_table(report: dict) -> str:
+    """Render a report as a plain-text table."""
+    lines = [f"{'roi':<8} {'size':>10} {'stage':<10} {'p50 ms':>9} {'p95 ms':>9} "
+             f"{'p99 ms':>9} {'fps':>9}"]
+    for name, entry in report["results"].items():
+        size = f"{entry['w']}x{entry['h']}"
+        for stage in STAGES:
+            stats = entry["stages"].get(stage)
+            if stats is None:
+                lines.append(f"{name:<8} {size:>10} {stage:<10} {'n/a':>9}")
+                continue
+            lines.append(f"{name:<8} {size:>10} {stage:<10} {stats['p50_ms']:>9.3f} "
+                         f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['fps']:>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the vision pipeline.")
+    parser.add_argument("-n", "--iterations", type=int, default=300)
+    parser.add_argument("--source", choices=("mss", "synthetic"), default="mss",
+                        help="Frame source for the capture stage")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare against a stored JSON baseline")
+    parser.add_argument("--save-baseline", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed p50 slowdown (fraction) before failing")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"Baseline file not found: {args.baseline}\n"
+                  f"Record one on this machine first with --save-baseline {args.baseline}")
+            return 2
+        except ValueError as e:
+            print(f"Baseline file {args.baseline} is not valid JSON: {e}")
+            return 2
+
+    source = SyntheticFrameSource(idle_s=0.0) if args.source == "synthetic" else MssFrameSource()
+    report = run_benchmarks(args.iterations, source)
+    print(format_table(report))
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Headless command-line runner (no Tk / customtkinter).
+
+Usage:
+    python -m src.cli run --config config/settings.json
+    python -m src.cli run --stats-interval 10 --auto-pause
+    python -m src.cli run --source synthetic --duration 30
+    python -m src.cli run --region popup=0,80,200,40
+    python -m src.cli run --record session.mfr --compress
+    python -m src.cli host --count 3 --source synthetic --input mock --duration 30
+    python -m src.cli host --instance a=0,0,526,70 --instance b=0,400,526,70
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+
+from .core.engine import FishingEngine, ROI
+from .core.regions import RegionSet
+from .core.sources import MssFrameSource, SyntheticFrameSource
+from .core.telemetry import format_action
+from .utils.config import ConfigManager
+
+
+def parse_roi(text: str) -> ROI:
+    """Parse "x,y,w,h" into an ROI."""
+    try:
+        x, y, w, h = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ROI harus x,y,w,h: {text}")
+    return ROI(x, y, w, h)
+
+
+def parse_region(text: str):
+    """Parse "name=x,y,w,h" into (name, ROI)."""
+    name, sep, rect = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"Region harus name=x,y,w,h: {text}")
+    return name, parse_roi(rect)
+
+
+def format_stats(engine: FishingEngine, elapsed: float) -> str:
+    """One status line for periodic output."""
+    sample = engine.telemetry.read()
+    state = engine.states.state.value if engine.states.state else "stopped"
+    if engine.metrics is not None:
+        fps = engine.metrics.fps
+        clicks = engine.metrics.clicks
+    else:
+        fps = engine.scheduler.achieved_hz
+        clicks = engine.actuator.sent
+    line = (f"[{elapsed:7.1f}s] {fps:6.1f} fps  clicks {clicks:5d}  "
+            f"G {sample.green:.3f} R {sample.red:.3f}  {state:<16} {format_action(sample)}")
+    for region in sample.regions:
+        line += (f"  | {region.name} G {region.green:.3f} R {region.red:.3f}"
+                 f"{' aktif' if region.active else ''}")
+    return line
+
+
+def start_auto_pause(engine: FishingEngine, config: dict):
+    """Start the auto-pause monitor if its dependencies are available."""
+    try:
+        from .utils.auto_pause import AutoPauseMonitor
+    except ImportError as e:
+        print(f"Auto-pause tidak tersedia: {e}")
+        return None
+    monitor = AutoPauseMonitor(pause_callback=engine.pause, resume_callback=engine.resume)
+    monitor.set_pause_on_typing(config.get("pause_on_typing", True))
+    monitor.set_pause_on_focus_loss(config.get("pause_on_focus_loss", False))
+    monitor.set_resume_delay(config.get("auto_pause_resume_delay", 2.0))
+    monitor.start()
+    return monitor
+
+
+def load_config(path: str) -> dict:
+    """Load settings, with metrics_dir resolved against the file's folder."""
+    manager = ConfigManager(path)
+    config = dict(manager.load())
+    config["metrics_dir"] = manager.resolve_path(config.get("metrics_dir"))
+    return config
+
+
+def run(args) -> int:
+    """Run the engine until stopped by a signal, --duration or EOF."""
+    config = load_config(args.config)
+    if args.input:
+        config["input_backend"] = args.input
+    if args.region:
+        # Copy: the loaded config shares nested defaults with DEFAULT_CONFIG
+        extra = dict(config.get("regions") or {})
+        for name, rect in args.region:
+            extra[name] = dict(extra.get(name) or {}, x=rect.x, y=rect.y, w=rect.w, h=rect.h)
+        config["regions"] = extra
+    regions = RegionSet.from_config(config, args.roi)
+    roi = regions.rois[regions.primary]
+
+    source = SyntheticFrameSource() if args.source == "synthetic" else MssFrameSource()
+    recorder = None
+    if args.record:
+        from .core.recording import FrameRecorder
+        recorder = FrameRecorder(args.record, compress=args.compress)
+    engine = FishingEngine(config, source=source, recorder=recorder)
+
+    def on_signal(signum, frame):
+        print(f"\nSignal {signum} diterima, berhenti...")
+        engine.stop()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    monitor = None
+    if args.auto_pause or config.get("auto_pause_enabled", False):
+        monitor = start_auto_pause(engine, config)
+
+    print(f"Engine jalan: ROI {roi.x},{roi.y} {roi.w}x{roi.h}, source {args.source}. "
+          f"Ctrl+C untuk berhenti.")
+    if regions.extra:
+        union = regions.union
+        print(f"Region tambahan: {', '.join(regions.extra)} "
+              f"(1 capture {union.w}x{union.h} per iterasi)")
+    engine.start()
+    worker = threading.Thread(target=engine.run, args=(regions,), name="engine", daemon=True)
+    started = time.perf_counter()
+    worker.start()
+    try:
+        next_stats = started + args.stats_interval
+        while worker.is_alive():
+            # Short joins keep the main thread responsive to signals
+            worker.join(0.2)
+            now = time.perf_counter()
+            if args.duration and now - started >= args.duration:
+                engine.stop()
+            if args.stats_interval > 0 and now >= next_stats:
+                print(format_stats(engine, now - started), flush=True)
+                next_stats += args.stats_interval
+    finally:
+        engine.stop()
+        worker.join(2.0)
+        if monitor is not None:
+            monitor.stop()
+
+    print(format_stats(engine, time.perf_counter() - started))
+    actuator = engine.actuator.stats()
+    print(f"Selesai. Input terkirim {actuator['sent']}, "
+          f"latency p50 {actuator['latency_p50_ms']:.2f} ms")
+    stop = engine.control_stats()["stop"]
+    if stop["count"]:
+        print(f"Stop → engine berhenti dalam {stop['max_ms']:.2f} ms")
+    if recorder is not None:
+        print(f"Rekaman {args.record}: {recorder.written} frame "
+              f"({recorder.bytes_written / 1e6:.1f} MB), {recorder.dropped} dibuang")
+    return 0
+
+
+def host(args) -> int:
+    """Run several engines (one per game window) in this process."""
+    from .core.host import EngineHost
+
+    config = load_config(args.config)
+    if args.input:
+        config["input_backend"] = args.input
+    instances = args.instance
+    if not instances:
+        # Copies of the configured ROI stacked downwards, one per window
+        stored = config["roi"]
+        instances = [(f"w{i + 1}", ROI(stored["x"], stored["y"] + i * stored["h"],
+                                       stored["w"], stored["h"]))
+                     for i in range(max(1, args.count))]
+
+    source = SyntheticFrameSource() if args.source == "synthetic" else MssFrameSource()
+    engine_host = EngineHost(config, source=source)
+    for name, roi in instances:
+        engine_host.add(name, RegionSet.from_config(config, roi))
+
+    stopping = threading.Event()
+
+    def on_signal(signum, frame):
+        print(f"\nSignal {signum} diterima, berhenti...")
+        stopping.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    print(f"Host jalan: {len(instances)} instance, source {args.source}. Ctrl+C untuk berhenti.")
+    started = time.perf_counter()
+    engine_host.start()
+    try:
+        next_stats = started + args.stats_interval
+        while engine_host.running and not stopping.wait(0.2):
+            now = time.perf_counter()
+            if args.duration and now - started >= args.duration:
+                break
+            if args.stats_interval > 0 and now >= next_stats:
+                for name, inst in engine_host.instances.items():
+                    print(f"{name:>6} {format_stats(inst.engine, now - started)}", flush=True)
+                next_stats += args.stats_interval
+    finally:
+        engine_host.close()
+
+    metrics = engine_host.metrics()
+    for name, inst in engine_host.instances.items():
+        print(f"{name:>6} {format_stats(inst.engine, time.perf_counter() - started)}")
+        inp = metrics["instances"][name]["input"]
+        print(f"{'':>6} input {inp['presses']} press, {inp['switches']} pindah window, "
+              f"tunggu klik p99 {inp['click_wait_p99_ms']:.2f} ms, "
+              f"{inp['stale_clicks']} klik basi dibuang, {inp['deferred_casts']} cast ditunda")
+    capture = metrics["capture"]
+    union = capture["union"] or {"w": 0, "h": 0}
+    print(f"Selesai. {capture['requests']} frame dari {capture['grabs']} capture "
+          f"({capture['shared'] * 100:.0f}% dibagi), area {union['w']}x{union['h']}")
+    return 0
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Macro Mancing Indovoice (headless).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the fishing engine without the GUI")
+    p_run.add_argument("--config", default="config/settings.json",
+                       help="Settings JSON (missing keys use defaults)")
+    p_run.add_argument("--roi", type=parse_roi, help="Override ROI as x,y,w,h")
+    p_run.add_argument("--region", type=parse_region, action="append",
+                       help="Extra region as name=x,y,w,h (repeatable)")
+    p_run.add_argument("--source", choices=("mss", "synthetic"), default="mss",
+                       help="Frame source (synthetic needs no screen)")
+    p_run.add_argument("--input", choices=("pyautogui", "direct", "mock"),
+                       help="Override the input backend")
+    p_run.add_argument("--record", metavar="PATH",
+                       help="Record captured frames to a .mfr file")
+    p_run.add_argument("--compress", action="store_true",
+                       help="With --record: store delta/RLE payloads")
+    p_run.add_argument("--auto-pause", action="store_true",
+                       help="Enable auto-pause (also on if set in config)")
+    p_run.add_argument("--stats-interval", type=float, default=5.0,
+                       help="Seconds between stats lines (0 disables)")
+    p_run.add_argument("--duration", type=float, default=0.0,
+                       help="Stop after this many seconds (0 = until Ctrl+C)")
+    p_run.set_defaults(func=run)
+
+    p_host = sub.add_parser("host", help="Run one engine per game window in one process")
+    p_host.add_argument("--config", default="config/settings.json",
+                        help="Settings JSON shared by all instances")
+    p_host.add_argument("--instance", type=parse_region, action="append",
+                        help="Instance bar ROI as name=x,y,w,h (repeatable)")
+    p_host.add_argument("--count", type=int, default=2,
+                        help="Without --instance: stack this many copies of the config ROI")
+    p_host.add_argument("--source", choices=("mss", "synthetic"), default="mss",
+                        help="Frame source (synthetic needs no screen)")
+    p_host.add_argument("--input", choices=("pyautogui", "direct", "mock"),
+                        help="Override the input backend")
+    p_host.add_argument("--stats-interval", type=float, default=5.0,
+                        help="Seconds between stats lines (0 disables)")
+    p_host.add_argument("--duration", type=float, default=0.0,
+                        help="Stop after this many seconds (0 = until Ctrl+C)")
+    p_host.set_defaults(func=host)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,32 @@
 """Core fishing macro engine modules."""
 
-from .vision import calc_color_ratios, grab_bgr
+from .vision import calc_color_ratios, grab_bgr, grab_frame, Frame, ScreenGrabber
+from .classifier import ColorThresholds, LutClassifier, HsvClassifier, make_classifier
+from .recording import FrameRecorder, FrameRecording
+from .sources import FrameSource, MssFrameSource, ReplayFrameSource, SyntheticFrameSource
+from .capture import CaptureService, Subscription
+from .tap import FrameTap, TapFrame
+from .regions import RegionDetector, RegionResult, RegionSet, RegionThresholds
+from .settings import EngineSettings, SettingsStore
+from .states import EngineState, StateMachine
+from .telemetry import Action, Telemetry, format_action
+from .metrics import EngineMetrics, LatencyHistogram
+from .profiler import ProfileSession
+from .input import (InputBackend, PyAutoGuiBackend, DirectInputBackend, MockInputBackend,
+                    make_input_backend)
+from .actuator import Actuator
+from .timing import Clock, VirtualClock
 from .engine import FishingEngine, ROI
+from .host import EngineHost, SharedCapture, SharedInput
 
-__all__ = ["calc_color_ratios", "grab_bgr", "FishingEngine", "ROI"]
+__all__ = ["calc_color_ratios", "grab_bgr", "grab_frame", "Frame", "ScreenGrabber",
+           "ColorThresholds", "LutClassifier", "HsvClassifier", "make_classifier",
+           "FrameRecorder", "FrameRecording",
+           "FrameSource", "MssFrameSource", "ReplayFrameSource", "SyntheticFrameSource",
+           "CaptureService", "Subscription", "FrameTap", "TapFrame",
+           "RegionDetector", "RegionResult", "RegionSet", "RegionThresholds",
+           "EngineSettings", "SettingsStore", "EngineState", "StateMachine",
+           "Action", "Telemetry", "format_action", "EngineMetrics", "LatencyHistogram",
+           "ProfileSession", "InputBackend", "PyAutoGuiBackend", "DirectInputBackend",
+           "MockInputBackend", "make_input_backend", "Actuator", "Clock", "VirtualClock",
+           "FishingEngine", "ROI", "EngineHost", "SharedCapture", "SharedInput"]
@@ -0,0 +1,309 @@
+"""Mouse actuator thread fed by a bounded command queue."""
+
+import queue
+import threading
+from collections import deque
+from typing import Optional
+
+from .input import InputBackend
+from .metrics import LatencyHistogram
+from .timing import Clock
+
+CLICK = "click"
+HOLD = "hold"
+
+
+class Command:
+    """One input action and its latency stamps (perf_counter seconds).
+
+    ``decided_at`` is when the engine asked for the action, ``sent_at``
+    when the press was handed to the OS and ``released_at`` when the
+    button went back up.
+    """
+
+    __slots__ = ("kind", "duration", "decided_at", "sent_at", "released_at", "done")
+
+    def __init__(self, kind: str, duration: float, decided_at: float):
+        self.kind = kind
+        self.duration = duration
+        self.decided_at = decided_at
+        self.sent_at = None
+        self.released_at = None
+        self.done = threading.Event()
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Decision-to-OS latency in seconds (None until sent)."""
+        return None if self.sent_at is None else self.sent_at - self.decided_at
+
+
+class Actuator:
+    """Executes clicks and holds on its own thread.
+
+    The engine enqueues commands and keeps capturing while the button is
+    held. Coalescing: a click requested while another click is queued or
+    in progress is dropped (``coalesced``), and anything that does not fit
+    in the bounded queue is dropped as well (``dropped``).
+
+    With a virtual clock there is no thread: the press is sent right away
+    and the release is scheduled on the clock.
+
+    ``abort()`` cuts a hold in progress short (the button is released at
+    once) and drops whatever is still queued, until the next ``start()``.
+
+    Every ``start()`` begins a new session with its own thread, queue and
+    abort flag and returns its generation; ``close(generation=...)`` from
+    an older session is ignored, so a run that exits late cannot shut
+    down the thread a newer run is using.
+    """
+
+    def __init__(self, backend: InputBackend, clock: Optional[Clock] = None,
+                 max_queue: int = 4, history: int = 256):
+        """Initialize actuator.
+
+        Args:
+            backend: Input backend that talks to the OS
+            clock: Clock used for stamps and hold timing
+            max_queue: Bounded command queue size
+            history: Completed commands kept for inspection
+        """
+        self.backend = backend
+        self.clock = clock or Clock()
+        self.history = deque(maxlen=history)
+        self.latency = LatencyHistogram()
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._inline = self.clock.virtual
+        self._thread = None
+        self._generation = 0
+        self._pending_click = None
+        self._pressed = False
+        self._abort = threading.Event()
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def start(self) -> int:
+        """Begin a new session with a fresh thread, queue and abort flag.
+
+        A thread left over from the previous session is aborted and joined
+        first, so only one thread ever drives the backend.
+
+        Returns:
+            int: Generation of the new session (pass it to ``close()``)
+        """
+        old = self._thread
+        if old is not None and old.is_alive():
+            # Aborted, the old thread drops what is queued, releases the
+            # button itself and exits at the sentinel
+            self._abort.set()
+            self._queue.put(None)
+            old.join()
+        self._thread = None
+        self._generation += 1
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._abort = threading.Event()
+        self._pending_click = None
+        if not self._inline:
+            self._thread = threading.Thread(target=self._run, args=(self._queue, self._abort),
+                                            name="actuator", daemon=True)
+            self._thread.start()
+        return self._generation
+
+    def close(self, timeout: float = 1.0, generation: Optional[int] = None):
+        """Stop the thread and make sure the button is released.
+
+        If the thread does not exit in time (e.g. it is inside a hold),
+        the hold is aborted and the thread releases the button itself;
+        releasing from here as well would send a second mouse_up.
+
+        Args:
+            timeout: Seconds to wait for queued commands to finish
+            generation: Session to close; a stale one (an older ``start()``)
+                        is ignored
+        """
+        if generation is not None and generation != self._generation:
+            return
+        thread = self._thread
+        if thread is not None:
+            if not self._stop_thread(thread, self._queue, self._abort, timeout):
+                return
+            self._thread = None
+        if self._pressed:
+            self._release()
+
+    @staticmethod
+    def _stop_thread(thread: threading.Thread, q: "queue.Queue", abort: threading.Event,
+                     timeout: float) -> bool:
+        """Ask a session thread to exit; abort it if it is still busy after ``timeout``.
+
+        Returns:
+            bool: True if the thread has exited
+        """
+        try:
+            q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        if thread.is_alive():
+            abort.set()
+            return False
+        return True
+
+    def abort(self):
+        """Release the button now and drop queued commands (safe from any thread)."""
+        self._abort.set()
+
+    @property
+    def aborted(self) -> bool:
+        """True between ``abort()`` and the next ``start()``."""
+        return self._abort.is_set()
+
+    @property
+    def busy(self) -> bool:
+        """True while a command is queued or executing."""
+        return self._queue.unfinished_tasks > 0 or (self._inline and self._pressed)
+
+    def click(self, down_s: float, decided_at: Optional[float] = None) -> Optional[Command]:
+        """Request a click.
+
+        Args:
+            down_s: How long to hold the button
+            decided_at: Time the decision was made (defaults to now)
+
+        Returns:
+            Command, or None if the click was coalesced or dropped
+        """
+        if self._pending_click is not None:
+            self.coalesced += 1
+            return None
+        cmd = Command(CLICK, down_s, self.clock.now() if decided_at is None else decided_at)
+        self._pending_click = cmd
+        if not self._submit(cmd):
+            self._pending_click = None
+            return None
+        return cmd
+
+    def hold(self, seconds: float, decided_at: Optional[float] = None) -> Optional[Command]:
+        """Request a long press (cast); wait on ``command.done`` to block."""
+        cmd = Command(HOLD, seconds, self.clock.now() if decided_at is None else decided_at)
+        return cmd if self._submit(cmd) else None
+
+    def wait(self, cmd: Command):
+        """Block until a command has been executed."""
+        if self._inline:
+            while not cmd.done.is_set() and self._pressed and not self._abort.is_set():
+                self.clock.sleep(0.001)
+        else:
+            cmd.done.wait()
+
+    def wait_idle(self, timeout: Optional[float] = None):
+        """Block until every queued command has been executed."""
+        deadline = None if timeout is None else self.clock.now() + timeout
+        while self.busy:
+            if deadline is not None and self.clock.now() >= deadline:
+                return False
+            self.clock.sleep(0.001)
+        return True
+
+    def stats(self) -> dict:
+        """Counters and decision-to-OS latency."""
+        lat = self.latency.snapshot()
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "latency_p50_ms": lat["p50_ms"],
+            "latency_p99_ms": lat["p99_ms"],
+            "latency_max_ms": lat["max_ms"],
+        }
+
+    def _submit(self, cmd: Command) -> bool:
+        if self._abort.is_set():
+            self.dropped += 1
+            return False
+        if self._inline:
+            if self._pressed or not self.backend.prepare(cmd.kind, cmd.decided_at, self._abort):
+                self.dropped += 1
+                return False
+            self._execute_inline(cmd)
+            return True
+        try:
+            self._queue.put_nowait(cmd)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _release(self):
+        try:
+            self.backend.mouse_up()
+        finally:
+            self._pressed = False
+
+    def _record_press(self, cmd: Command):
+        """Log the press against the time it was decided (clicks only)."""
+        jitter = self.clock.jitter
+        if jitter is not None and cmd.kind == CLICK:
+            jitter.record("click", cmd.decided_at, cmd.sent_at)
+
+    def _record_release(self, cmd: Command, abort: threading.Event):
+        """Log the release against the end of the requested press."""
+        jitter = self.clock.jitter
+        if jitter is not None and not abort.is_set():
+            jitter.record("down_s" if cmd.kind == CLICK else "hold_s",
+                          cmd.sent_at + cmd.duration, cmd.released_at)
+
+    def _execute_inline(self, cmd: Command):
+        self.backend.mouse_down()
+        self._pressed = True
+        cmd.sent_at = self.clock.now()
+        self._record_press(cmd)
+
+        def release():
+            self._release()
+            cmd.released_at = self.clock.now()
+            self._record_release(cmd, self._abort)
+            self.sent += 1
+            self.latency.record(cmd.latency)
+            self.history.append(cmd)
+            if cmd is self._pending_click:
+                self._pending_click = None
+            cmd.done.set()
+
+        self.clock.call_at(cmd.sent_at + cmd.duration, release)
+
+    def _run(self, q: "queue.Queue", abort: threading.Event):
+        """Session thread: execute commands from its own queue until None."""
+        while True:
+            cmd = q.get()
+            if cmd is None:
+                q.task_done()
+                return
+            try:
+                if abort.is_set() or not self.backend.prepare(cmd.kind, cmd.decided_at, abort):
+                    self.dropped += 1
+                    continue
+                self.backend.mouse_down()
+                self._pressed = True
+                cmd.sent_at = self.clock.now()
+                self._record_press(cmd)
+                # Hold measured from when the press went out; abort() ends it early
+                self.clock.sleep_until(cmd.sent_at + cmd.duration, interrupt=abort)
+                self._release()
+                cmd.released_at = self.clock.now()
+                self._record_release(cmd, abort)
+                self.sent += 1
+                self.latency.record(cmd.latency)
+                self.history.append(cmd)
+            except Exception:
+                if self._pressed:
+                    try:
+                        self._release()
+                    except Exception:
+                        pass
+            finally:
+                if cmd is self._pending_click:
+                    self._pending_click = None
+                cmd.done.set()
+                q.task_done()
@@ -0,0 +1,223 @@
+"""Shared screen capture with rate-limited, downscaled subscribers."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import cv2
+
+from .sources import FrameSource, MssFrameSource
+from .vision import Frame
+
+
+class Subscription:
+    """Decimated view of the frames captured by a CaptureService.
+
+    Frames are delivered at most ``max_hz`` times per second, resized by
+    ``scale`` into two buffers owned by the subscription that are used in
+    turn. A delivered frame stays valid until the delivery after next, so
+    consumers should finish with a frame before polling twice more.
+    ``view`` picks the part of each frame that is copied (e.g. one region
+    of a union frame); nothing outside it is touched.
+    """
+
+    def __init__(self, service: "CaptureService", max_hz: float, scale: float, name: str):
+        """Initialize subscription (use CaptureService.subscribe).
+
+        Args:
+            service: Owning capture service
+            max_hz: Maximum delivery rate
+            scale: Downscale factor (0 < scale <= 1)
+            name: Label for stats
+        """
+        self.service = service
+        self.name = name
+        self.max_hz = max_hz
+        self.interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self.scale = scale
+        self.delivered = 0
+        self.skipped = 0
+        # Inactive subscriptions are not fed (e.g. preview while hidden)
+        self.active = True
+        # Optional Frame -> Frame applied before copying (None = whole frame)
+        self.view: Optional[Callable[[Frame], Frame]] = None
+        self._buffers = [None, None]
+        self._bgr_buffers = [None, None]
+        self._index = 0
+        self._latest = None
+        self._last_ts = None
+        self._fresh = False
+        self._cond = threading.Condition()
+
+    def _deliver(self, frame: Frame):
+        """Store a scaled copy of frame (called by the capturing thread)."""
+        if self._last_ts is not None and frame.timestamp - self._last_ts < self.interval:
+            self.skipped += 1
+            return
+        view = self.view
+        if view is not None:
+            frame = view(frame)
+        src = frame.bgra
+        h, w = src.shape[:2]
+        if self.scale < 1.0:
+            h = max(1, int(round(h * self.scale)))
+            w = max(1, int(round(w * self.scale)))
+        i = self._index
+        buf = self._buffers[i]
+        if buf is None or buf.shape[:2] != (h, w) or buf.shape[2] != src.shape[2]:
+            buf = self._buffers[i] = np.empty((h, w, src.shape[2]), dtype=np.uint8)
+            self._bgr_buffers[i] = np.empty((h, w, 3), dtype=np.uint8)
+        if (h, w) == src.shape[:2]:
+            np.copyto(buf, src)
+        else:
+            cv2.resize(src, (w, h), dst=buf, interpolation=cv2.INTER_AREA)
+        with self._cond:
+            self._latest = Frame(buf, frame.timestamp, self._bgr_buffers[i])
+            self._last_ts = frame.timestamp
+            self._index = 1 - i
+            self._fresh = True
+            self.delivered += 1
+            self._cond.notify_all()
+
+    def _take(self) -> Optional[Frame]:
+        if not self._fresh:
+            return None
+        self._fresh = False
+        return self._latest
+
+    def poll(self, roi=None) -> Optional[Frame]:
+        """Get the newest frame not returned before.
+
+        When nobody else is capturing (e.g. the engine is stopped) and
+        ``roi`` is given, a frame is captured on demand.
+
+        Args:
+            roi: Region to capture if the service is idle
+
+        Returns:
+            Frame or None if nothing new arrived
+        """
+        with self._cond:
+            frame = self._take()
+        if frame is None and roi is not None and self.service.idle_for(self.interval):
+            self.service.grab(roi)
+            with self._cond:
+                frame = self._take()
+        return frame
+
+    def wait(self, timeout: float, roi=None) -> Optional[Frame]:
+        """Block until a new frame is delivered.
+
+        Args:
+            timeout: Seconds to wait
+            roi: Region to capture on demand if the service stays idle
+
+        Returns:
+            Frame or None on timeout
+        """
+        with self._cond:
+            if not self._fresh:
+                self._cond.wait(timeout)
+            frame = self._take()
+        if frame is None and roi is not None:
+            return self.poll(roi)
+        return frame
+
+    @property
+    def latest(self) -> Optional[Frame]:
+        """Last delivered frame, whether or not it was already returned."""
+        return self._latest
+
+    def close(self):
+        """Stop receiving frames."""
+        self.service.unsubscribe(self)
+
+
+class CaptureService(FrameSource):
+    """Single owner of the screen grabber, shared by every frame consumer.
+
+    The engine uses the service as its frame source and gets every frame.
+    Each grab is also handed to the subscribers (preview, debug window),
+    which receive rate-limited, downscaled copies instead of capturing
+    the same region again.
+    """
+
+    def __init__(self, source: FrameSource = None, clock: Optional[Callable[[], float]] = None):
+        """Initialize capture service.
+
+        Args:
+            source: Underlying frame source (defaults to live MSS capture)
+            clock: Time function for idle detection (defaults to perf_counter)
+        """
+        self.source = source or MssFrameSource()
+        self.clock = clock or time.perf_counter
+        self.frames = 0
+        self.last_frame = None
+        self._last_capture = None
+        self._subscribers = ()
+        self._grab_lock = threading.Lock()
+        self._sub_lock = threading.Lock()
+
+    def subscribe(self, max_hz: float = 10.0, scale: float = 1.0, name: str = "") -> Subscription:
+        """Register a consumer of decimated frames.
+
+        Args:
+            max_hz: Maximum delivery rate (0 = every frame)
+            scale: Downscale factor applied before delivery
+            name: Label for stats
+
+        Returns:
+            Subscription
+        """
+        if not 0.0 < scale <= 1.0:
+            raise ValueError(f"scale must be in (0, 1], got {scale}")
+        sub = Subscription(self, max_hz, scale, name)
+        with self._sub_lock:
+            # Copy-on-write so grab() can iterate without locking
+            self._subscribers = self._subscribers + (sub,)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        """Remove a subscription (no-op if already removed)."""
+        with self._sub_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+
+    @property
+    def subscribers(self) -> tuple:
+        """Current subscriptions."""
+        return self._subscribers
+
+    def idle_for(self, seconds: float) -> bool:
+        """True if no frame was captured in the last ``seconds``."""
+        last = self._last_capture
+        return last is None or self.clock() - last >= seconds
+
+    def grab(self, roi) -> Frame:
+        """Capture a frame and publish it to the subscribers."""
+        with self._grab_lock:
+            frame = self.source.grab(roi)
+            self._last_capture = self.clock()
+            self.frames += 1
+            self.last_frame = frame
+            for sub in self._subscribers:
+                if not sub.active:
+                    continue
+                try:
+                    sub._deliver(frame)
+                except Exception:
+                    pass
+        return frame
+
+    def stats(self) -> dict:
+        """Captured frames and per-subscriber delivery counts."""
+        return {
+            "frames": self.frames,
+            "subscribers": {sub.name or str(i): {"delivered": sub.delivered,
+                                                  "skipped": sub.skipped}
+                            for i, sub in enumerate(self._subscribers)},
+        }
+
+    def close(self):
+        """Release the underlying source."""
+        self.source.close()
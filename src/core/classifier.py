@@ -0,0 +1,280 @@
+"""Color classifiers for the fishing mini-game bar."""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .vision import (HSV_GREEN_LOW, HSV_GREEN_HIGH, HSV_RED_LOW1, HSV_RED_HIGH1,
+                     HSV_RED_LOW2, HSV_RED_HIGH2)
+
+# Class bits stored in the lookup table
+CLASS_OTHER = 0
+CLASS_GREEN = 1
+CLASS_RED = 2
+
+# Number of 8-bit BGR colors
+_LUT_SIZE = 1 << 24
+
+
+def _triple(values) -> Tuple[int, int, int]:
+    """Normalize an HSV bound to a tuple of three ints."""
+    h, s, v = (int(x) for x in values)
+    return h, s, v
+
+
+@dataclass(frozen=True)
+class ColorThresholds:
+    """HSV ranges used to classify green and red pixels."""
+    green_low: Tuple[int, int, int] = _triple(HSV_GREEN_LOW)
+    green_high: Tuple[int, int, int] = _triple(HSV_GREEN_HIGH)
+    red_low1: Tuple[int, int, int] = _triple(HSV_RED_LOW1)
+    red_high1: Tuple[int, int, int] = _triple(HSV_RED_HIGH1)
+    red_low2: Tuple[int, int, int] = _triple(HSV_RED_LOW2)
+    red_high2: Tuple[int, int, int] = _triple(HSV_RED_HIGH2)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ColorThresholds":
+        """Build thresholds from the optional ``hsv`` config section.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            ColorThresholds: Thresholds with missing keys taken from defaults
+        """
+        section = config.get("hsv") or {}
+        defaults = cls()
+        fields = {}
+        for name in defaults.__dataclass_fields__:
+            value = section.get(name)
+            fields[name] = _triple(value) if value is not None else getattr(defaults, name)
+        return cls(**fields)
+
+
+def build_lut(thresholds: ColorThresholds) -> np.ndarray:
+    """Build the BGR -> class lookup table for a threshold set.
+
+    The table is indexed by ``(r << 16) | (g << 8) | b`` and holds
+    CLASS_GREEN / CLASS_RED bits. Every 8-bit color is converted with
+    the same ``cv2.cvtColor`` + ``cv2.inRange`` calls used by
+    ``calc_color_ratios``, so lookups match it exactly.
+
+    Args:
+        thresholds: HSV ranges to bake into the table
+
+    Returns:
+        numpy.ndarray: uint8 table with 2**24 entries
+    """
+    lut = np.empty(_LUT_SIZE, dtype=np.uint8)
+    g, b = np.meshgrid(np.arange(256, dtype=np.uint8), np.arange(256, dtype=np.uint8),
+                       indexing="ij")
+    # One red value per row, processed in slabs to keep memory low
+    slab = 16
+    block = np.empty((slab, 65536, 3), dtype=np.uint8)
+    block[:, :, 0] = b.ravel()
+    block[:, :, 1] = g.ravel()
+    green_low = np.array(thresholds.green_low, dtype=np.uint8)
+    green_high = np.array(thresholds.green_high, dtype=np.uint8)
+    red_low1 = np.array(thresholds.red_low1, dtype=np.uint8)
+    red_high1 = np.array(thresholds.red_high1, dtype=np.uint8)
+    red_low2 = np.array(thresholds.red_low2, dtype=np.uint8)
+    red_high2 = np.array(thresholds.red_high2, dtype=np.uint8)
+    for r0 in range(0, 256, slab):
+        block[:, :, 2] = np.arange(r0, r0 + slab, dtype=np.uint8)[:, None]
+        hsv = cv2.cvtColor(block, cv2.COLOR_BGR2HSV)
+        green = cv2.inRange(hsv, green_low, green_high)
+        red = cv2.bitwise_or(cv2.inRange(hsv, red_low1, red_high1),
+                             cv2.inRange(hsv, red_low2, red_high2))
+        out = lut[r0 * 65536:(r0 + slab) * 65536].reshape(slab, 65536)
+        out[:] = (green & CLASS_GREEN) | (red & CLASS_RED)
+    return lut
+
+
+# Tables shared between classifier instances, keyed by thresholds
+_lut_cache: dict = {}
+_lut_lock = threading.Lock()
+
+
+def get_lut(thresholds: ColorThresholds) -> np.ndarray:
+    """Get (or build once) the lookup table for a threshold set."""
+    with _lut_lock:
+        lut = _lut_cache.get(thresholds)
+        if lut is None:
+            lut = build_lut(thresholds)
+            _lut_cache.clear()  # Only the active set is worth 16 MB
+            _lut_cache[thresholds] = lut
+        return lut
+
+
+class HsvClassifier:
+    """Reference classifier: cvtColor + inRange, as in ``calc_color_ratios``."""
+
+    name = "hsv"
+
+    def __init__(self, thresholds: Optional[ColorThresholds] = None):
+        self.thresholds = None
+        self._bgr = None
+        self._masks = None
+        self.set_thresholds(thresholds or ColorThresholds())
+
+    def set_thresholds(self, thresholds: ColorThresholds):
+        """Replace HSV thresholds."""
+        self.thresholds = thresholds
+        self._bounds = [np.array(b, dtype=np.uint8) for b in (
+            thresholds.green_low, thresholds.green_high,
+            thresholds.red_low1, thresholds.red_high1,
+            thresholds.red_low2, thresholds.red_high2)]
+
+    def ratios(self, frame: np.ndarray) -> Tuple[float, float]:
+        """Calculate (green_ratio, red_ratio) for a BGR or BGRA frame."""
+        if frame.size == 0:
+            return 0.0, 0.0
+        if frame.shape[2] == 4:
+            if self._bgr is None or self._bgr.shape[:2] != frame.shape[:2]:
+                self._bgr = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=self._bgr)
+        g_lo, g_hi, r_lo1, r_hi1, r_lo2, r_hi2 = self._bounds
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        green_mask = cv2.inRange(hsv, g_lo, g_hi)
+        red_mask = cv2.bitwise_or(cv2.inRange(hsv, r_lo1, r_hi1),
+                                  cv2.inRange(hsv, r_lo2, r_hi2))
+        self._masks = (green_mask, red_mask)
+        total = float(frame.shape[0] * frame.shape[1])
+        g_ratio = np.count_nonzero(green_mask) / total
+        r_ratio = np.count_nonzero(red_mask) / total
+        return float(g_ratio), float(r_ratio)
+
+    @property
+    def last_classes(self) -> Optional[np.ndarray]:
+        """Class map of the last ``ratios()`` frame (built from its masks on request)."""
+        if self._masks is None:
+            return None
+        green_mask, red_mask = self._masks
+        classes = np.where(green_mask, CLASS_GREEN, CLASS_OTHER).astype(np.uint8)
+        classes[red_mask != 0] |= CLASS_RED
+        return classes
+
+
+class LutClassifier:
+    """Single-pass classifier backed by a precomputed BGR lookup table.
+
+    Each pixel is read as a packed 24-bit color, mapped to its class
+    through the table, and both ratios are counted from the class map.
+    BGRA frames are read in place; BGR frames are first expanded into a
+    reused BGRA buffer. Work buffers are reused between frames of the
+    same size.
+    """
+
+    name = "lut"
+
+    def __init__(self, thresholds: Optional[ColorThresholds] = None):
+        self.thresholds = None
+        self.lut = None
+        self._overlap = False
+        self._shape = None
+        self._bgra = None
+        self._index = None
+        self._classes = None
+        self._classified = False
+        self.set_thresholds(thresholds or ColorThresholds())
+
+    def set_thresholds(self, thresholds: ColorThresholds):
+        """Replace thresholds, rebuilding the table only if they changed."""
+        if thresholds == self.thresholds:
+            return
+        lut = get_lut(thresholds)
+        # Overlapping green/red ranges need a full histogram to count
+        self._overlap = bool(np.any(lut == CLASS_GREEN | CLASS_RED))
+        self.lut = lut
+        self.thresholds = thresholds
+
+    def _buffers(self, shape):
+        """Get work buffers for a frame of the given (h, w)."""
+        if shape != self._shape:
+            self._bgra = np.empty(shape + (4,), dtype=np.uint8)
+            self._index = np.empty(shape, dtype=np.intp)
+            self._classes = np.empty(shape, dtype=np.uint8)
+            self._shape = shape
+        return self._bgra, self._index, self._classes
+
+    def classify(self, frame: np.ndarray) -> np.ndarray:
+        """Map every pixel of a BGR or BGRA frame to its class bits.
+
+        Returns:
+            numpy.ndarray: uint8 class map (reused on the next call)
+        """
+        bgra, index, classes = self._buffers(frame.shape[:2])
+        if frame.shape[2] == 4:
+            bgra = frame
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA, dst=bgra)
+        # Little-endian BGRA read as uint32 is 0xAARRGGBB
+        packed = bgra.view(np.uint32)[:, :, 0]
+        np.bitwise_and(packed, 0xFFFFFF, out=index, casting="unsafe")
+        np.take(self.lut, index, out=classes)
+        self._classified = True
+        return classes
+
+    def ratios(self, frame: np.ndarray) -> Tuple[float, float]:
+        """Calculate (green_ratio, red_ratio) for a BGR or BGRA frame."""
+        if frame.size == 0:
+            return 0.0, 0.0
+        classes = self.classify(frame)
+        total = float(classes.size)
+        if self._overlap:
+            counts = np.bincount(classes.ravel(), minlength=4)
+            both = counts[CLASS_GREEN | CLASS_RED]
+            return (counts[CLASS_GREEN] + both) / total, (counts[CLASS_RED] + both) / total
+        # Classes are 0/1/2 only: sum = green + 2 * red, nonzero = green + red
+        nonzero = cv2.countNonZero(classes)
+        red = int(cv2.sumElems(classes)[0]) - nonzero
+        return (nonzero - red) / total, red / total
+
+    @property
+    def last_classes(self) -> Optional[np.ndarray]:
+        """Class map of the last classified frame (reused buffer, copy to keep)."""
+        return self._classes if self._classified else None
+
+
+CLASSIFIERS = {
+    LutClassifier.name: LutClassifier,
+    HsvClassifier.name: HsvClassifier,
+}
+
+
+def make_classifier(config: dict, current=None):
+    """Create the classifier selected by ``config["classifier"]``.
+
+    An existing classifier of the same kind is reused so its lookup
+    table is only rebuilt when the thresholds actually change.
+
+    Args:
+        config: Configuration dictionary
+        current: Classifier currently in use, if any
+
+    Returns:
+        Classifier instance with ``ratios(frame)``
+    """
+    name = str(config.get("classifier", LutClassifier.name)).lower()
+    return select_classifier(name, ColorThresholds.from_config(config), current)
+
+
+def select_classifier(name: str, thresholds: ColorThresholds, current=None):
+    """Create or update the classifier registered under ``name``.
+
+    Args:
+        name: Key in CLASSIFIERS (unknown names fall back to "lut")
+        thresholds: Color ranges to classify with
+        current: Classifier currently in use, if any
+
+    Returns:
+        Classifier instance with ``ratios(frame)``
+    """
+    cls = CLASSIFIERS.get(name, LutClassifier)
+    if isinstance(current, cls):
+        current.set_thresholds(thresholds)
+        return current
+    return cls(thresholds)
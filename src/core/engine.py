@@ -1,155 +1,424 @@
 """Core fishing macro engine."""
 
+import threading
 import time
-from dataclasses import dataclass
-import pyautogui as pag
-from .vision import grab_bgr, calc_color_ratios
+from typing import Union
+from .classifier import select_classifier
+from .regions import PRIMARY_REGION, ROI, RegionDetector, RegionSet
+from .settings import EngineSettings, SettingsStore
+from .sources import FrameSource, MssFrameSource
+from .scheduler import PollScheduler
+from .timing import Clock, JitterLog, timer_resolution
+from .states import EngineState, StateMachine
+from .telemetry import Action, Telemetry
+from .metrics import EngineMetrics, LatencyHistogram
+from .profiler import ProfileSession
+from .input import InputBackend, make_input_backend
+from .actuator import Actuator
+from ..utils.config import DEFAULT_CONFIG
 
-# PyAutoGUI safety
-pag.FAILSAFE = True
-pag.PAUSE = 0.01
-
-@dataclass
-class ROI:
-    """Region of Interest for screen capture."""
-    x: int
-    y: int
-    w: int
-    h: int
-    
-    def to_monitor(self) -> dict:
-        """Convert to MSS monitor dict."""
-        return {"left": self.x, "top": self.y, "width": self.w, "height": self.h}
+# Control requests whose request-to-effect latency is measured
+CONTROL_KINDS = ("stop", "pause", "resume")
 
 class FishingEngine:
     """Main fishing automation engine."""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, source: FrameSource = None, recorder=None,
+                 input_backend: InputBackend = None, clock: Clock = None):
         """Initialize engine with configuration.
         
         Args:
             config: Configuration dictionary with thresholds and settings
+            source: Frame source (defaults to live MSS capture)
+            recorder: Optional FrameRecorder that receives the bar region of
+                      every captured frame (started and closed by run())
+            input_backend: Mouse backend (defaults to ``config["input_backend"]``)
+            clock: Time base (a VirtualClock runs the engine in simulated time)
         """
-        self.config = config
+        self.source = source or MssFrameSource()
+        self.recorder = recorder
+        self.input = input_backend
+        # Backends passed in by the caller are never swapped by config
+        self._own_input = input_backend is None
+        self.classifier = None
+        # Classifiers of the extra regions (the bar uses self.classifier)
+        self.detector = RegionDetector()
+        self.clock = clock or Clock(jitter=JitterLog())
+        self.scheduler = PollScheduler(clock=self.clock)
+        self.states = StateMachine(clock=self.clock.now)
+        self._resume_state = None
+        # Clicks and casts run on their own thread so capture never blocks
+        self.actuator = Actuator(input_backend, self.clock)
+        self._next_click_at = 0.0
+        self.settings_store = SettingsStore(config)
+        self.settings: EngineSettings = None
+        self._apply_settings(self.settings_store.current)
         self.running = False
+        # Set while no run() is executing: only then may other threads
+        # apply settings directly (running=False alone does not mean the
+        # loop has exited)
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._settings_lock = threading.Lock()
+        # One run() at a time; start() bumps the session so a loop that
+        # has not noticed a quick stop/start exits instead of resuming
+        self._run_lock = threading.Lock()
+        self._session = 0
         self.paused = False  # Auto-pause state
-        self.last_active_ts = time.time()
-        self.callbacks = {
-            "on_green_ratio": None,
-            "on_red_ratio": None,
-            "on_action": None,
-        }
+        # Set by stop/pause/resume: every engine wait returns as soon as it is
+        self._wake = threading.Event()
+        self._control_at = {}
+        self.control_latency = {kind: LatencyHistogram() for kind in CONTROL_KINDS}
+        self.last_active_ts = self.clock.now()
+        # Latest ratios/action for the UI to poll
+        self.telemetry = Telemetry()
+        # Loop instrumentation (None when disabled: no timing at all)
+        self.metrics = EngineMetrics() if config.get("metrics", True) else None
+        # Used as given: callers resolve it with ConfigManager.resolve_path
+        self.metrics_dir = config.get("metrics_dir", DEFAULT_CONFIG["metrics_dir"])
+        # Active profiling session and the worker thread it targets
+        self.profile_session = None
+        self.thread_id = None
+        # Optional FrameTap: copies of classified frames for a debug view
+        self.tap = None
+        
+    @property
+    def config(self) -> dict:
+        """Copy of the most recently published configuration."""
+        return self.settings_store.config
+        
+    @config.setter
+    def config(self, config: dict):
+        self.publish_config(config)
         
-    def set_callback(self, event: str, callback):
-        """Set callback for events.
+    def publish_config(self, config: dict) -> EngineSettings:
+        """Compile and publish new settings (safe from any thread).
+        
+        A running engine switches to the new snapshot at the start of its
+        next iteration; once the engine thread has exited, the snapshot is
+        applied immediately on the caller's thread.
         
         Args:
-            event: Event name (on_green_ratio, on_red_ratio, on_action)
-            callback: Callback function
+            config: Configuration dictionary
+            
+        Returns:
+            EngineSettings: The published snapshot
         """
-        if event in self.callbacks:
-            self.callbacks[event] = callback
+        settings = self.settings_store.publish(config)
+        with self._settings_lock:
+            if self._stopped.is_set():
+                self._apply_settings(settings)
+        return settings
+        
+    def _apply_settings(self, settings: EngineSettings):
+        """Switch to a settings snapshot (engine thread or after it exited)."""
+        if settings is self.settings:
+            return
+        # Re-select the classifier; its lookup table is rebuilt only
+        # when the color thresholds change
+        self.classifier = select_classifier(settings.classifier, settings.thresholds,
+                                            self.classifier)
+        self.detector.configure(settings)
+        self.clock.spin = settings.spin_s
+        self.scheduler.configure(settings.active_i, settings.idle_i,
+                                 settings.idle_max_i, settings.idle_backoff)
+        if self._own_input and (self.input is None or self.settings is None
+                                or settings.input_backend != self.settings.input_backend):
+            if self.input is not None:
+                # Let a click in flight finish on the backend that started it
+                self.actuator.wait_idle(1.0)
+                self.input.close()
+            self.input = make_input_backend(settings.input_backend)
+            self.actuator.backend = self.input
+        self.settings = settings
+        
+    def metrics_snapshot(self):
+        """Current loop metrics (None when metrics are disabled)."""
+        if self.metrics is None:
+            return None
+        return self.metrics.snapshot(extra=self._metrics_extra())
+        
+    def _metrics_extra(self) -> dict:
+        """Actuator, control and timing-jitter figures stored with the metrics."""
+        jitter = self.clock.jitter
+        return {"actuator": self.actuator.stats(),
+                "control": self.control_stats(),
+                "jitter": jitter.summary() if jitter is not None else {}}
+        
+    def _dump_metrics(self):
+        """Write metrics.json / metrics.csv to ``metrics_dir`` on stop."""
+        if self.metrics is None or not self.metrics_dir or not self.metrics.iterations:
+            return
+        try:
+            self.metrics.dump(self.metrics_dir, extra=self._metrics_extra())
+        except Exception:
+            pass
+    
+    def control_stats(self) -> dict:
+        """Control-to-effect latency per request kind (stop, pause, resume)."""
+        return {kind: hist.snapshot() for kind, hist in self.control_latency.items()}
+    
+    def _request_control(self, kind: str):
+        """Stamp a control request and wake the engine thread."""
+        self._control_at[kind] = time.perf_counter()
+        self._wake.set()
+        
+    def _control_done(self, kind: str):
+        """Record the latency of a control request once it took effect."""
+        requested = self._control_at.pop(kind, None)
+        if requested is not None:
+            self.control_latency[kind].record(time.perf_counter() - requested)
+    
+    def start_profile(self, mode: str = "sample", duration: float = 10.0,
+                      output_dir: str = "config") -> ProfileSession:
+        """Profile the running engine thread without stopping it.
+        
+        Args:
+            mode: "sample" (stack sampling) or "cprofile"
+            duration: Seconds to profile
+            output_dir: Where results are written
             
-    def _notify(self, event: str, *args):
-        """Trigger callback if set."""
-        if self.callbacks.get(event):
-            try:
-                self.callbacks[event](*args)
-            except Exception:
-                pass
+        Returns:
+            ProfileSession: Poll ``finished`` / ``path`` for the result
+        """
+        if not self.running or self.thread_id is None:
+            raise RuntimeError("Engine is not running")
+        if self.profile_session is not None and not self.profile_session.finished:
+            raise RuntimeError("Profiling already in progress")
+        session = ProfileSession(mode, duration, output_dir)
+        if mode == "sample":
+            session.start_sampler(self.thread_id)
+        self.profile_session = session
+        return session
     
-    def _click_once(self):
-        """Execute single mouse click."""
-        down_duration = max(0.001, float(self.config.get("down_s", 0.01)))
-        pag.mouseDown(button="left")
-        time.sleep(down_duration)
-        pag.mouseUp(button="left")
+    def _request_click(self, settings: EngineSettings) -> bool:
+        """Queue a click unless the previous one is still in its interval.
+        
+        The actuator holds the button for ``down_s`` on its own thread; the
+        next click is allowed ``down_s + click_i`` after this decision.
+        
+        Returns:
+            bool: True if a click was queued
+        """
+        now = self.clock.now()
+        if now < self._next_click_at:
+            return False
+        if self.actuator.click(settings.down_s, decided_at=now) is None:
+            return False
+        self._next_click_at = now + settings.down_s + settings.click_i
+        return True
         
     def _hold_cast(self):
         """Hold mouse button to cast fishing rod."""
-        hold_duration = max(0.1, float(self.config.get("hold_s", 3.0)))
-        self._notify("on_action", f"Hold {hold_duration:.2f}s...")
-        pag.mouseDown(button="left")
-        time.sleep(hold_duration)
-        pag.mouseUp(button="left")
-        self._notify("on_action", "Monitoring...")
-        
-    def run(self, roi: ROI):
+        hold_duration = self.settings.hold_s
+        self.telemetry.publish_action(Action.HOLD, hold_duration)
+        cmd = self.actuator.hold(hold_duration)
+        if cmd is not None:
+            self.actuator.wait(cmd)
+        self.telemetry.publish_action(Action.MONITORING)
+        
+    def run(self, roi: Union[ROI, RegionSet]):
         """Main fishing loop.
         
         Args:
-            roi: Screen region to monitor
+            roi: Bar region to monitor, or a RegionSet with extra regions
+                 (captured together as one union frame per iteration)
         """
-        try:
-            # Initial cast
-            self._hold_cast()
-            self.last_active_ts = time.time()
-            
-            # Main monitoring loop
-            while self.running:
-                # Check if paused by auto-pause system
-                if self.paused:
-                    self._notify("on_action", "⏸️ Auto-Paused...")
-                    time.sleep(0.5)
-                    continue
-                
-                frame = grab_bgr(roi)
-                g_ratio, r_ratio = calc_color_ratios(frame)
-                
-                # Notify UI
-                self._notify("on_green_ratio", g_ratio)
-                self._notify("on_red_ratio", r_ratio)
-                
-                # Check if mini-game is active
-                active_min = self.config.get("active_min_ratio", 0.03)
-                active_now = max(g_ratio, r_ratio) >= active_min
-                
-                if active_now:
-                    self.last_active_ts = time.time()
-                    
-                    # Check if we should click (green dominant)
-                    green_th = float(self.config.get("green_th", 0.14))
-                    if g_ratio >= green_th and g_ratio > r_ratio:
-                        self._notify("on_action", "CLICK")
-                        self._click_once()
-                        time.sleep(float(self.config.get("click_i", 0.035)))
-                    else:
-                        self._notify("on_action", "Idle")
-                        time.sleep(float(self.config.get("idle_i", 0.010)))
-                else:
-                    # Mini-game inactive - check for auto-recast
-                    idle_for = time.time() - self.last_active_ts
-                    inactive_to = float(self.config.get("inactive_to", 1.2))
-                    
-                    if self.config.get("auto_recast", True) and idle_for >= inactive_to:
-                        # Time to recast
-                        recast_delay = max(0.0, float(self.config.get("recast_delay", 0.30)))
-                        if recast_delay > 0:
-                            self._notify("on_action", f"Recast in {recast_delay:.2f}s...")
-                            time.sleep(recast_delay)
-                        self._hold_cast()
-                        self.last_active_ts = time.time()
-                        time.sleep(0.05)
-                    else:
-                        self._notify("on_action", "Menunggu mini-game...")
-                        time.sleep(float(self.config.get("idle_i", 0.010)))
+        regions = roi if isinstance(roi, RegionSet) else RegionSet({PRIMARY_REGION: roi})
+        handlers = {
+            EngineState.CASTING: self._state_casting,
+            EngineState.WAITING_FOR_BITE: self._state_monitor,
+            EngineState.MINIGAME: self._state_monitor,
+            EngineState.RECAST_DELAY: self._state_recast_delay,
+            EngineState.PAUSED: self._state_paused,
+        }
+        run_session = self._session
+        # Finer OS timer ticks for short sleeps (Windows); a previous run
+        # that is still winding down finishes before this one begins
+        with timer_resolution(1), self._run_lock:
+            with self._settings_lock:
+                self._stopped.clear()
+            actuator_generation = None
+            try:
+                self.thread_id = threading.get_ident()
+                self._control_at.clear()
+                actuator_generation = self.actuator.start()
+                if self.recorder is not None:
+                    self.recorder.start()
+                self._next_click_at = 0.0
+                if self.metrics is not None:
+                    self.metrics.reset()
+                self.states.reset(EngineState.CASTING)
+                self._wake.clear()
+                while self.running and run_session == self._session:
+                    # Adopt newly published settings between iterations
+                    if self.settings_store.current is not self.settings:
+                        self._apply_settings(self.settings_store.current)
+                    # cProfile sessions switch on/off between iterations
+                    session = self.profile_session
+                    if session is not None and session.mode == "cprofile" and not session.finished:
+                        session.on_iteration()
+                    # Check if paused by auto-pause system
+                    if self.paused and self.states.state is not EngineState.PAUSED:
+                        self._resume_state = self.states.state
+                        self.states.transition(EngineState.PAUSED)
+                        self._control_done("pause")
+                    handlers[self.states.state](regions)
+                    # Cleared before the flags are read again, so a request
+                    # arriving after this point still interrupts the next wait
+                    if self._wake.is_set():
+                        self._wake.clear()
                         
-        except Exception as e:
-            self._notify("on_action", f"Error: {e}")
-            self.running = False
+            except EOFError:
+                # Frame source ran out (e.g. replay finished)
+                self.telemetry.publish_action(Action.FINISHED)
+                self.running = False
+            except Exception as e:
+                self.telemetry.publish_action(Action.ERROR, detail=str(e))
+                self.running = False
+            finally:
+                # Releases the button if a hold was cut short by stop()
+                self.actuator.close(generation=actuator_generation)
+                self._control_done("stop")
+                if self.recorder is not None:
+                    # Flushes queued frames; a write error ends up in telemetry
+                    try:
+                        self.recorder.close()
+                    except Exception as e:
+                        self.telemetry.publish_action(Action.ERROR, detail=f"Recorder: {e}")
+                self.states.transition(None)
+                self.thread_id = None
+                if self.profile_session is not None and self.profile_session.mode == "cprofile":
+                    self.profile_session.stop()
+                self._dump_metrics()
+                with self._settings_lock:
+                    # Adopt a snapshot published after the last iteration
+                    try:
+                        if self.settings_store.current is not self.settings:
+                            self._apply_settings(self.settings_store.current)
+                    except Exception as e:
+                        self.telemetry.publish_action(Action.ERROR, detail=str(e))
+                    self._stopped.set()
+
+    def wait_stopped(self, timeout: float = None) -> bool:
+        """Wait until run() has returned.
+
+        Returns:
+            bool: False if it was still running after ``timeout`` seconds
+        """
+        return self._stopped.wait(timeout)
+    
+    def _state_casting(self, regions: RegionSet):
+        """CASTING: hold to cast, then wait for a bite."""
+        self._hold_cast()
+        self.last_active_ts = self.clock.now()
+        self.scheduler.reset()
+        self.scheduler.defer(0.05)
+        self.states.transition(EngineState.WAITING_FOR_BITE)
+        
+    def _state_recast_delay(self, regions: RegionSet):
+        """RECAST_DELAY: short pause before casting again."""
+        recast_delay = self.settings.recast_delay
+        if recast_delay > 0:
+            self.telemetry.publish_action(Action.RECAST, recast_delay)
+            self.clock.sleep(recast_delay, "recast_delay", self._wake)
+        self.states.transition(EngineState.CASTING)
+        
+    def _state_paused(self, regions: RegionSet):
+        """PAUSED: idle until auto-pause releases the engine."""
+        if self.paused:
+            self.telemetry.publish_action(Action.PAUSED)
+            # resume() and stop() wake this immediately
+            self.clock.sleep(0.5, interrupt=self._wake)
+            return
+        self.scheduler.reset()
+        self.states.transition(self._resume_state or EngineState.WAITING_FOR_BITE)
+        self._control_done("resume")
+        
+    def _state_monitor(self, regions: RegionSet):
+        """WAITING_FOR_BITE / MINIGAME: capture, classify and react."""
+        settings = self.settings
+        metrics = self.metrics
+        if metrics is not None:
+            t_start = time.perf_counter()
+        # One grab covers every region; each is classified on its own view
+        frame = self.source.grab(regions.union)
+        bar = regions.view(frame, regions.primary)
+        if self.recorder is not None:
+            # Only the bar is recorded, so a replay drives the bar logic
+            # the same way whatever regions were configured
+            self.recorder.submit(bar)
+        if metrics is not None:
+            t_capture = time.perf_counter()
+        g_ratio, r_ratio = self.classifier.ratios(bar.bgra)
+        extra = self.detector.detect(frame, regions) if regions.extra else ()
+        if metrics is not None:
+            t_classify = time.perf_counter()
+        self.telemetry.publish_ratios(g_ratio, r_ratio, extra)
+        input_s = 0.0
+        
+        # Check if mini-game is active
+        active_now = max(g_ratio, r_ratio) >= settings.active_min_ratio
+        
+        if active_now:
+            self.states.transition(EngineState.MINIGAME)
+            self.last_active_ts = self.clock.now()
+            self.scheduler.mark_active()
+            
+            # Check if we should click (green dominant)
+            if g_ratio >= settings.green_th and g_ratio > r_ratio:
+                self.telemetry.publish_action(Action.CLICK)
+                t_input = time.perf_counter()
+                if self._request_click(settings) and metrics is not None:
+                    metrics.clicks += 1
+                input_s = time.perf_counter() - t_input
+            else:
+                self.telemetry.publish_action(Action.IDLE)
+        else:
+            # Mini-game inactive - back off and check for auto-recast
+            self.states.transition(EngineState.WAITING_FOR_BITE)
+            self.scheduler.mark_inactive()
+            idle_for = self.clock.now() - self.last_active_ts
+            
+            if settings.auto_recast and idle_for >= settings.inactive_to:
+                # Time to recast
+                self.states.transition(EngineState.RECAST_DELAY)
+            else:
+                self.telemetry.publish_action(Action.WAITING)
+        
+        if metrics is not None:
+            t_decide = time.perf_counter()
+        # Debug copies come out of the slack before the next capture
+        tap = self.tap
+        if tap is not None:
+            tap.offer(bar, self.classifier, g_ratio, r_ratio)
+        # Sleep until the next capture deadline (unless leaving to recast).
+        # While a press is pending the wait must not spin: a spinning loop
+        # holds the GIL and delays the actuator thread's mouse_down
+        if self.states.state is not EngineState.RECAST_DELAY:
+            self.scheduler.wait(self._wake, 0.0 if self.actuator.busy else None)
+        if metrics is not None:
+            metrics.record_iteration(t_start, t_capture - t_start, t_classify - t_capture,
+                                     t_decide - t_classify - input_s, input_s,
+                                     time.perf_counter() - t_decide)
             
     def start(self):
-        """Start the fishing engine."""
+        """Start the fishing engine (call before each run())."""
+        self._session += 1
         self.running = True
         
     def stop(self):
-        """Stop the fishing engine."""
+        """Stop the fishing engine (a cast hold in progress is cut short)."""
         self.running = False
+        self._request_control("stop")
+        self.actuator.abort()
     
     def pause(self):
         """Pause the fishing engine (for auto-pause)."""
         self.paused = True
+        self._request_control("pause")
     
     def resume(self):
         """Resume the fishing engine (from auto-pause)."""
         self.paused = False
+        self._request_control("resume")
@@ -0,0 +1,417 @@
+"""Several fishing engines (one per game window) in a single process."""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+from .actuator import CLICK
+from .engine import FishingEngine
+from .states import EngineState
+from .input import InputBackend, make_input_backend
+from .metrics import LatencyHistogram
+from .regions import PRIMARY_REGION, ROI, RegionSet
+from .sources import FrameSource, MssFrameSource
+from .vision import Frame
+
+
+class SharedCapture:
+    """One screen grab per tick, sliced for every hosted engine.
+
+    Time is cut into ticks of ``tick`` seconds from ``origin``. Each
+    engine asks for its own region through a HostedSource; the first
+    request in a tick grabs the bounding union of all registered
+    regions, and every other request in the same tick gets a zero-copy
+    view of that frame. Hosted engines align their poll deadlines to
+    the same grid, so their requests fall into shared ticks.
+    """
+
+    def __init__(self, source: FrameSource, tick: float = 0.002,
+                 clock: Callable[[], float] = time.perf_counter):
+        """Initialize shared capture.
+
+        Args:
+            source: Underlying frame source
+            tick: Length (s) of the slot one grab is shared in (0 = never share)
+            clock: Time function (the engines' clock, perf_counter)
+        """
+        self.source = source
+        self.tick = tick
+        self.clock = clock
+        self.origin = clock()
+        self.requests = 0
+        self.grabs = 0
+        self._rois = {}
+        self._union = None
+        self._frame = None
+        self._epoch = None
+        self._lock = threading.Lock()
+
+    @property
+    def union(self) -> Optional[ROI]:
+        """Area currently grabbed per tick."""
+        return self._union
+
+    def _register(self, name: str, roi: ROI):
+        """Track the region of one engine, growing the union if needed."""
+        self._rois[name] = ROI(roi.x, roi.y, roi.w, roi.h)
+        rois = self._rois.values()
+        x0 = min(r.x for r in rois)
+        y0 = min(r.y for r in rois)
+        x1 = max(r.x + r.w for r in rois)
+        y1 = max(r.y + r.h for r in rois)
+        union = ROI(x0, y0, x1 - x0, y1 - y0)
+        if union != self._union:
+            self._union = union
+            self._frame = None
+
+    def grab(self, name: str, roi: ROI) -> Frame:
+        """Region ``roi`` of the current tick's frame, grabbing if it is stale.
+
+        Args:
+            name: Engine the region belongs to
+            roi: Region in screen coordinates
+
+        Returns:
+            Frame: View into the shared frame (not copied)
+        """
+        with self._lock:
+            self.requests += 1
+            if self._rois.get(name) != roi:
+                self._register(name, roi)
+            epoch = int((self.clock() - self.origin) // self.tick) if self.tick > 0 else None
+            frame = self._frame
+            if frame is None or epoch is None or epoch != self._epoch:
+                frame = self._frame = self.source.grab(self._union)
+                self._epoch = epoch
+                self.grabs += 1
+            union = self._union
+        x, y = roi.x - union.x, roi.y - union.y
+        return Frame(frame.bgra[y:y + roi.h, x:x + roi.w], frame.timestamp)
+
+    def stats(self) -> dict:
+        """Requests served and screen grabs made."""
+        return {
+            "requests": self.requests,
+            "grabs": self.grabs,
+            "shared": 1.0 - self.grabs / self.requests if self.requests else 0.0,
+            "union": None if self._union is None else vars(self._union).copy(),
+        }
+
+
+class HostedSource(FrameSource):
+    """Frame source of one hosted engine, backed by a SharedCapture."""
+
+    def __init__(self, shared: SharedCapture, name: str):
+        self.shared = shared
+        self.name = name
+
+    def grab(self, roi) -> Frame:
+        """Slice of the shared frame for this engine's region."""
+        return self.shared.grab(self.name, roi)
+
+
+class SharedInput:
+    """One mouse shared by every hosted engine.
+
+    A press holds the mouse until its release, so one engine can never
+    switch windows while another has the button down. When the next
+    press comes from a different engine, the cursor is moved into that
+    engine's window first (optionally after ``activate(window)``).
+
+    Clicks win over casts: a click that cannot get the mouse within its
+    instance's ``click_age`` is stale and dropped, and a cast waits while
+    any other instance is in the mini-game.
+
+    Priority only applies before a press starts. A cast that is already
+    holding the button (``hold_s``, 3 s by default) is not cut short,
+    because a shortened hold changes the cast. A mini-game that starts in
+    another window during that hold loses its clicks as stale until the
+    cast ends. A cast, in turn, waits up to ``max_wait`` (5 s) for the
+    other windows' mini-games and is dropped after that.
+    """
+
+    # Slice of the lock waits, so casts re-check priority and aborts
+    POLL_S = 0.005
+
+    def __init__(self, backend: InputBackend,
+                 activate: Optional[Callable[[object], None]] = None,
+                 max_wait: float = 5.0):
+        """Initialize shared input.
+
+        Args:
+            backend: Backend that talks to the OS
+            activate: Brings a window to the foreground (called on switches
+                      for instances bound to a window)
+            max_wait: Longest a cast waits for the mouse before it is dropped
+        """
+        self.backend = backend
+        self.activate = activate
+        self.max_wait = max_wait
+        self.owner = None
+        self.switches = 0
+        self.switch_time = LatencyHistogram()
+        self.instances = []
+        self._lock = threading.Lock()
+
+    def for_instance(self, name: str, point, window=None,
+                     click_age: float = 0.035) -> "InstanceInput":
+        """Input backend of one engine.
+
+        Args:
+            name: Engine name
+            point: (x, y) screen point inside the engine's window
+            window: Window handle passed to ``activate``
+            click_age: Longest a click may wait for the mouse (s)
+        """
+        inst = InstanceInput(self, name, point, window, click_age)
+        self.instances.append(inst)
+        return inst
+
+    def minigame_elsewhere(self, inst: "InstanceInput") -> bool:
+        """True if an instance other than ``inst`` is in the mini-game."""
+        return any(other is not inst and other.in_minigame() for other in self.instances)
+
+    def close(self):
+        """Release the backend."""
+        self.backend.close()
+
+
+class InstanceInput(InputBackend):
+    """Per-engine view of a SharedInput (what the engine's Actuator drives).
+
+    ``prepare()`` takes the shared mouse (or drops the press) and
+    ``mouse_up()`` gives it back.
+    """
+
+    name = "shared"
+
+    def __init__(self, shared: SharedInput, instance: str, point, window=None,
+                 click_age: float = 0.035):
+        self.shared = shared
+        self.instance = instance
+        self.point = point
+        self.window = window
+        self.click_age = click_age
+        # Set by the host: True while this instance's engine is in the mini-game
+        self.in_minigame = lambda: False
+        self.presses = 0
+        self.switches = 0
+        self.stale = 0
+        self.deferred = 0
+        self.timeouts = 0
+        self.click_wait = LatencyHistogram()
+        self.cast_wait = LatencyHistogram()
+
+    def prepare(self, kind: str, decided_at: float, abort=None) -> bool:
+        """Take the shared mouse for one press.
+
+        Clicks are dropped (``stale``) once older than ``click_age``; casts
+        yield to other instances' mini-games and give up after
+        ``max_wait`` (``timeouts``).
+        """
+        shared = self.shared
+        is_click = kind == CLICK
+        deadline = decided_at + (self.click_age if is_click else shared.max_wait)
+        t0 = time.perf_counter()
+        yielded = False
+        while True:
+            if abort is not None and abort.is_set():
+                return False
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                if is_click:
+                    self.stale += 1
+                else:
+                    self.timeouts += 1
+                return False
+            if not shared._lock.acquire(timeout=min(remaining, shared.POLL_S)):
+                continue
+            if is_click or not shared.minigame_elsewhere(self):
+                break
+            # Another window is mid mini-game: let its clicks through first
+            shared._lock.release()
+            yielded = True
+            time.sleep(shared.POLL_S)
+        if yielded:
+            self.deferred += 1
+        (self.click_wait if is_click else self.cast_wait).record(time.perf_counter() - t0)
+        return True
+
+    def mouse_down(self, button: str = "left"):
+        shared = self.shared
+        try:
+            if shared.owner is not self:
+                t0 = time.perf_counter()
+                if self.window is not None and shared.activate is not None:
+                    shared.activate(self.window)
+                shared.backend.move_to(*self.point)
+                shared.owner = self
+                shared.switches += 1
+                self.switches += 1
+                shared.switch_time.record(time.perf_counter() - t0)
+            shared.backend.mouse_down(button)
+        except Exception:
+            shared._lock.release()
+            raise
+        self.presses += 1
+
+    def mouse_up(self, button: str = "left"):
+        try:
+            self.shared.backend.mouse_up(button)
+        finally:
+            self.shared._lock.release()
+
+    def move_to(self, x: int, y: int):
+        self.shared.backend.move_to(x, y)
+
+    def stats(self) -> dict:
+        """Presses, window switches, drops and time spent waiting for the mouse."""
+        click = self.click_wait.snapshot()
+        cast = self.cast_wait.snapshot()
+        return {
+            "presses": self.presses,
+            "switches": self.switches,
+            "stale_clicks": self.stale,
+            "deferred_casts": self.deferred,
+            "timeouts": self.timeouts,
+            "click_wait_p50_ms": click["p50_ms"],
+            "click_wait_p99_ms": click["p99_ms"],
+            "click_wait_max_ms": click["max_ms"],
+            "cast_wait_p50_ms": cast["p50_ms"],
+            "cast_wait_max_ms": cast["max_ms"],
+        }
+
+
+class HostedEngine:
+    """One engine of an EngineHost with its regions and worker thread."""
+
+    def __init__(self, name: str, engine: FishingEngine, regions: RegionSet, window=None):
+        self.name = name
+        self.engine = engine
+        self.regions = regions
+        self.window = window
+        self.thread = None
+
+
+class EngineHost:
+    """Runs N FishingEngine instances, one per game window, in one process.
+
+    Every engine keeps its own loop thread, state machine, settings and
+    metrics. They share one SharedCapture (a single grab per tick covers
+    all windows' regions) and one SharedInput (presses are serialized and
+    the cursor moves between windows only between presses).
+    """
+
+    def __init__(self, config: dict, source: FrameSource = None,
+                 input_backend: InputBackend = None, tick: Optional[float] = None,
+                 activate: Optional[Callable[[object], None]] = None):
+        """Initialize host.
+
+        Args:
+            config: Configuration shared by all instances
+            source: Frame source for the shared capture (defaults to MSS)
+            input_backend: Mouse backend (defaults to ``config["input_backend"]``)
+            tick: Frame reuse window (defaults to ``config["active_i"]``)
+            activate: Brings a window handle to the foreground on switches
+        """
+        self.config = dict(config)
+        if tick is None:
+            tick = float(config.get("active_i", 0.002))
+        if input_backend is None:
+            input_backend = make_input_backend(config.get("input_backend", "pyautogui"))
+        self.capture = SharedCapture(source or MssFrameSource(), tick)
+        self.input = SharedInput(input_backend, activate)
+        self.instances: Dict[str, HostedEngine] = {}
+
+    def add(self, name: str, roi: Union[ROI, RegionSet], window=None,
+            config: Optional[dict] = None) -> FishingEngine:
+        """Create an engine bound to one window.
+
+        Args:
+            name: Unique instance name (also its metrics subdirectory)
+            roi: Bar region, or a RegionSet, in screen coordinates
+            window: Window handle passed to the ``activate`` callback
+            config: Per-instance overrides of the host configuration
+
+        Returns:
+            FishingEngine: The new engine
+        """
+        if name in self.instances:
+            raise ValueError(f"Instance {name!r} already exists")
+        regions = roi if isinstance(roi, RegionSet) else RegionSet({PRIMARY_REGION: roi})
+        # Aligned engines wake in the same slots; spinning there would make
+        # them fight for the GIL, so hosted engines block instead
+        cfg = dict(self.config, spin_s=0.0)
+        cfg.update(config or {})
+        if cfg.get("metrics_dir"):
+            cfg["metrics_dir"] = os.path.join(cfg["metrics_dir"], name)
+        bar = regions.rois[regions.primary]
+        point = (bar.x + bar.w // 2, bar.y + bar.h // 2)
+        # A click that waited longer than the click interval is stale
+        click_age = float(cfg.get("click_i", 0.035))
+        instance_input = self.input.for_instance(name, point, window, click_age)
+        engine = FishingEngine(cfg, source=HostedSource(self.capture, name),
+                               input_backend=instance_input)
+        instance_input.in_minigame = lambda: engine.states.state is EngineState.MINIGAME
+        engine.scheduler.align(self.capture.tick, self.capture.origin)
+        self.instances[name] = HostedEngine(name, engine, regions, window)
+        return engine
+
+    @property
+    def running(self) -> bool:
+        """True while any engine thread is alive."""
+        return any(inst.thread is not None and inst.thread.is_alive()
+                   for inst in self.instances.values())
+
+    def start(self):
+        """Start every engine on its own thread."""
+        for inst in self.instances.values():
+            if inst.thread is not None and inst.thread.is_alive():
+                continue
+            inst.engine.start()
+            inst.thread = threading.Thread(target=inst.engine.run, args=(inst.regions,),
+                                           name=f"engine-{inst.name}", daemon=True)
+            inst.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop every engine and wait for its thread."""
+        for inst in self.instances.values():
+            inst.engine.stop()
+        for inst in self.instances.values():
+            if inst.thread is not None:
+                inst.thread.join(timeout)
+                inst.thread = None
+
+    def pause(self):
+        """Pause every engine (auto-pause)."""
+        for inst in self.instances.values():
+            inst.engine.pause()
+
+    def resume(self):
+        """Resume every engine."""
+        for inst in self.instances.values():
+            inst.engine.resume()
+
+    def metrics(self) -> dict:
+        """Per-instance engine/input metrics plus shared capture and input figures."""
+        instances = {}
+        for name, inst in self.instances.items():
+            engine = inst.engine
+            instances[name] = {
+                "state": engine.states.state.value if engine.states.state else "stopped",
+                "engine": engine.metrics_snapshot(),
+                "input": engine.input.stats(),
+            }
+        return {
+            "instances": instances,
+            "capture": self.capture.stats(),
+            "input": {"switches": self.input.switches,
+                      "switch": self.input.switch_time.snapshot()},
+        }
+
+    def close(self):
+        """Stop the engines and release the shared capture and input."""
+        self.stop()
+        self.capture.source.close()
+        self.input.close()
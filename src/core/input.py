@@ -0,0 +1,234 @@
+"""Mouse input backends used by the engine."""
+
+import sys
+import threading
+import time
+from typing import Callable, List, Tuple
+
+_pag = None
+
+def get_pag():
+    """Import pyautogui on first use (it needs a display at import time)."""
+    global _pag
+    if _pag is None:
+        import pyautogui as pag
+        # PyAutoGUI safety
+        pag.FAILSAFE = True
+        pag.PAUSE = 0.01
+        _pag = pag
+    return _pag
+
+
+class InputBackend:
+    """Sends mouse button events to the OS."""
+
+    name = "base"
+
+    def mouse_down(self, button: str = "left"):
+        """Press a mouse button at the current cursor position."""
+        raise NotImplementedError
+
+    def mouse_up(self, button: str = "left"):
+        """Release a mouse button at the current cursor position."""
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int):
+        """Move the cursor to screen coordinates (x, y)."""
+        raise NotImplementedError
+
+    def prepare(self, kind: str, decided_at: float, abort=None) -> bool:
+        """Called by the actuator right before each press.
+
+        Args:
+            kind: "click" or "hold"
+            decided_at: When the engine asked for the press (perf_counter)
+            abort: Event set if the actuator is aborted meanwhile
+
+        Returns:
+            bool: False drops the press
+        """
+        return True
+
+    def close(self):
+        """Release OS resources."""
+        pass
+
+
+class PyAutoGuiBackend(InputBackend):
+    """pyautogui input (keeps its FAILSAFE corner abort and 10 ms PAUSE)."""
+
+    name = "pyautogui"
+
+    def mouse_down(self, button: str = "left"):
+        get_pag().mouseDown(button=button)
+
+    def mouse_up(self, button: str = "left"):
+        get_pag().mouseUp(button=button)
+
+    def move_to(self, x: int, y: int):
+        get_pag().moveTo(x, y)
+
+
+class DirectInputBackend(InputBackend):
+    """Low-level input without pyautogui's per-call pause and checks.
+
+    Uses SendInput on Windows and the XTest extension (python-xlib) on
+    X11. Note there is no FAILSAFE: moving the mouse to a corner does not
+    abort the macro.
+    """
+
+    name = "direct"
+
+    # MOUSEEVENTF_* flags for SendInput
+    _WIN_FLAGS = {
+        "left": (0x0002, 0x0004),
+        "right": (0x0008, 0x0010),
+        "middle": (0x0020, 0x0040),
+    }
+    _X11_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self):
+        """Initialize backend.
+
+        Raises:
+            RuntimeError: If no low-level input API is available
+        """
+        if sys.platform == "win32":
+            self._init_windows()
+        else:
+            self._init_x11()
+
+    def _init_windows(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                        ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class INPUT(ctypes.Structure):
+            # MOUSEINPUT is the largest member of the native union
+            _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
+
+        send_input = ctypes.windll.user32.SendInput
+        self._move = ctypes.windll.user32.SetCursorPos
+        size = ctypes.sizeof(INPUT)
+        # Prebuilt events, so a click is just one SendInput call
+        events = {}
+        for button, (down, up) in self._WIN_FLAGS.items():
+            events[button] = tuple(INPUT(0, MOUSEINPUT(0, 0, 0, flag, 0, 0))
+                                   for flag in (down, up))
+
+        def send(button: str, pressed: bool):
+            event = events[button][0 if pressed else 1]
+            send_input(1, ctypes.byref(event), size)
+
+        self._send = send
+
+    def _init_x11(self):
+        try:
+            from Xlib import X, display
+            from Xlib.ext import xtest
+        except ImportError as e:
+            raise RuntimeError("python-xlib is required for direct input on Linux") from e
+        try:
+            disp = display.Display()
+        except Exception as e:
+            raise RuntimeError(f"Cannot open X display: {e}") from e
+        if not disp.has_extension("XTEST"):
+            disp.close()
+            raise RuntimeError("X server has no XTEST extension")
+        self._display = disp
+        lock = threading.Lock()
+
+        def send(button: str, pressed: bool):
+            with lock:
+                xtest.fake_input(disp, X.ButtonPress if pressed else X.ButtonRelease,
+                                 self._X11_BUTTONS[button])
+                disp.sync()
+
+        def move(x: int, y: int):
+            with lock:
+                xtest.fake_input(disp, X.MotionNotify, x=x, y=y)
+                disp.sync()
+
+        self._send = send
+        self._move = move
+
+    def mouse_down(self, button: str = "left"):
+        self._send(button, True)
+
+    def mouse_up(self, button: str = "left"):
+        self._send(button, False)
+
+    def move_to(self, x: int, y: int):
+        self._move(x, y)
+
+    def close(self):
+        display = getattr(self, "_display", None)
+        if display is not None:
+            try:
+                display.close()
+            except Exception:
+                pass
+            self._display = None
+
+
+class MockInputBackend(InputBackend):
+    """Records timestamped events instead of touching the OS."""
+
+    name = "mock"
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Initialize mock backend.
+
+        Args:
+            clock: Time function used to stamp events
+        """
+        self.clock = clock
+        self.events: List[Tuple[float, str, str]] = []
+
+    def mouse_down(self, button: str = "left"):
+        self.events.append((self.clock(), "down", button))
+
+    def mouse_up(self, button: str = "left"):
+        self.events.append((self.clock(), "up", button))
+
+    def move_to(self, x: int, y: int):
+        self.events.append((self.clock(), "move", f"{x},{y}"))
+
+    @property
+    def clicks(self) -> int:
+        """Number of button presses recorded."""
+        return sum(1 for _, kind, _ in self.events if kind == "down")
+
+    def clear(self):
+        """Forget recorded events."""
+        self.events.clear()
+
+
+INPUT_BACKENDS = {
+    PyAutoGuiBackend.name: PyAutoGuiBackend,
+    DirectInputBackend.name: DirectInputBackend,
+    MockInputBackend.name: MockInputBackend,
+}
+
+
+def make_input_backend(name: str) -> InputBackend:
+    """Create the input backend registered under ``name``.
+
+    Unknown names, and a direct backend that cannot initialise on this
+    system, fall back to pyautogui.
+
+    Args:
+        name: "pyautogui", "direct" or "mock"
+
+    Returns:
+        InputBackend: Ready-to-use backend
+    """
+    cls = INPUT_BACKENDS.get(name, PyAutoGuiBackend)
+    try:
+        return cls()
+    except (RuntimeError, OSError, AttributeError):
+        return PyAutoGuiBackend()
@@ -0,0 +1,158 @@
+"""Per-stage loop latency histograms for the engine."""
+
+import csv
+import json
+import os
+import time
+from bisect import bisect_left
+
+# Stages of one monitor iteration
+STAGES = ("capture", "classify", "decide", "input", "sleep")
+
+# Upper bucket edges (seconds) on a 1-2-5 series from 10 µs to 1 s;
+# anything slower lands in a final overflow bucket
+BUCKET_EDGES = tuple(m * 10.0 ** e for e in range(-5, 0) for m in (1, 2, 5)) + (1.0,)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (constant memory, O(log n) record)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add one sample."""
+        self.counts[bisect_left(BUCKET_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper edge (s) of the bucket holding the q-th percentile (capped at max)."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKET_EDGES[i], self.max) if i < len(BUCKET_EDGES) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        """Summary in milliseconds plus the raw bucket counts."""
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": mean * 1000.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p95_ms": self.percentile(95) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+            "buckets": list(self.counts),
+        }
+
+
+class EngineMetrics:
+    """Loop instrumentation: stage histograms, achieved FPS and clicks.
+
+    Written by the engine thread only. Readers call ``snapshot()``, which
+    copies the current values; a snapshot taken mid-iteration may be one
+    sample behind on some stages.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Drop all samples (called when the engine starts)."""
+        self.stages = {name: LatencyHistogram() for name in STAGES}
+        self.iterations = 0
+        self.clicks = 0
+        self.started_at = time.perf_counter()
+        self.fps = 0.0
+        self._period = 0.0
+        self._last_start = None
+
+    def record_iteration(self, start: float, capture: float, classify: float,
+                         decide: float, input_s: float, sleep: float):
+        """Record the stage durations (s) of one iteration.
+
+        Args:
+            start: perf_counter timestamp when the iteration began
+            capture, classify, decide, input_s, sleep: Stage durations
+        """
+        stages = self.stages
+        stages["capture"].record(capture)
+        stages["classify"].record(classify)
+        stages["decide"].record(decide)
+        if input_s:
+            stages["input"].record(input_s)
+        stages["sleep"].record(sleep)
+        self.iterations += 1
+        if self._last_start is not None:
+            period = start - self._last_start
+            # Exponential moving average over roughly the last 32 iterations
+            self._period += (period - self._period) / 32.0 if self._period else period
+            self.fps = 1.0 / self._period if self._period > 0 else 0.0
+        self._last_start = start
+
+    def snapshot(self, extra: dict = None) -> dict:
+        """Current figures as a JSON-serializable dict.
+
+        Args:
+            extra: Additional entries merged into the result
+        """
+        elapsed = time.perf_counter() - self.started_at
+        snap = {
+            "elapsed_s": elapsed,
+            "iterations": self.iterations,
+            "fps": self.fps,
+            "avg_fps": self.iterations / elapsed if elapsed > 0 else 0.0,
+            "clicks": self.clicks,
+            "bucket_edges_ms": [edge * 1000.0 for edge in BUCKET_EDGES],
+            "stages": {name: hist.snapshot() for name, hist in self.stages.items()},
+        }
+        if extra:
+            snap.update(extra)
+        return snap
+
+    def summary_line(self) -> str:
+        """One-line summary for the status panel."""
+        stages = self.stages
+        return (f"{self.fps:.0f} fps · capture {stages['capture'].percentile(50) * 1000:.1f} ms"
+                f" · classify {stages['classify'].percentile(50) * 1000:.1f} ms"
+                f" · clicks {self.clicks}")
+
+    def dump(self, directory: str, name: str = "metrics", extra: dict = None) -> dict:
+        """Write the snapshot as ``<name>.json`` and ``<name>.csv``.
+
+        Args:
+            directory: Output directory (created if missing)
+            name: File name without extension
+            extra: Additional entries for the JSON file
+
+        Returns:
+            dict: The snapshot that was written
+        """
+        snap = self.snapshot(extra)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(snap, f, indent=2)
+        with open(os.path.join(directory, f"{name}.csv"), "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            edges = [f"le_{edge:g}ms" for edge in snap["bucket_edges_ms"]] + ["overflow"]
+            writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                             "max_ms"] + edges)
+            for stage, stats in snap["stages"].items():
+                writer.writerow([stage, stats["count"]]
+                                + [f"{stats[k]:.4f}" for k in
+                                   ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")]
+                                + stats["buckets"])
+        return snap
@@ -0,0 +1,138 @@
+"""On-demand profiling of the engine worker thread."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+PROFILE_MODES = ("sample", "cprofile")
+
+
+class ProfileSession:
+    """Profile one engine thread for a fixed duration.
+
+    ``sample`` mode polls the thread's stack from a separate thread via
+    ``sys._current_frames()`` and writes collapsed stacks (``.folded``,
+    flamegraph.pl / speedscope format); the engine itself is untouched.
+    ``cprofile`` mode runs a cProfile session inside the engine thread,
+    switched on and off at iteration boundaries, and writes ``.pstats``
+    plus a text summary. On Python 3.12+ cProfile observes every thread,
+    so prefer ``sample`` when other threads are busy.
+    """
+
+    def __init__(self, mode: str = "sample", duration: float = 10.0,
+                 output_dir: str = "config", interval: float = 0.001):
+        """Initialize profiling session.
+
+        Args:
+            mode: "sample" or "cprofile"
+            duration: Seconds to profile
+            output_dir: Directory the results are written to
+            interval: Sampling period in sample mode (s)
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.duration = float(duration)
+        self.output_dir = output_dir
+        self.interval = float(interval)
+        self.path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.samples = 0
+        self.done = threading.Event()
+        self._deadline = None
+        self._profile = None
+
+    @property
+    def finished(self) -> bool:
+        """True once results were written (or the session failed)."""
+        return self.done.is_set()
+
+    def _output_path(self, ext: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"profile-{stamp}.{ext}")
+
+    def _finish(self, write):
+        try:
+            write()
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.done.set()
+
+    # ---- sample mode ----
+
+    def start_sampler(self, thread_id: int):
+        """Start sampling the given thread from a daemon thread."""
+        threading.Thread(target=self._sample_loop, args=(thread_id,), daemon=True).start()
+
+    def _sample_loop(self, thread_id: int):
+        stacks = Counter()
+        deadline = time.perf_counter() + self.duration
+        while time.perf_counter() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                # Engine thread has exited
+                break
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+            time.sleep(self.interval)
+        self.samples = sum(stacks.values())
+
+        def write():
+            self.path = self._output_path("folded")
+            with open(self.path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        self._finish(write)
+
+    # ---- cprofile mode (called from the engine thread) ----
+
+    def on_iteration(self) -> bool:
+        """Start/stop the cProfile session at an iteration boundary.
+
+        Returns:
+            bool: False once the session has finished
+        """
+        if self._profile is None:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._deadline = time.perf_counter() + self.duration
+            self._profile.enable()
+            return True
+        self.samples += 1
+        if time.perf_counter() < self._deadline:
+            return True
+        self.stop()
+        return False
+
+    def stop(self):
+        """End a cProfile session early and write its results."""
+        profile, self._profile = self._profile, None
+        if self.finished:
+            return
+        if profile is None:
+            self.error = "Engine stopped before profiling started"
+            self.done.set()
+            return
+        profile.disable()
+
+        def write():
+            import io
+            import pstats
+            self.path = self._output_path("pstats")
+            profile.dump_stats(self.path)
+            text = io.StringIO()
+            pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(os.path.splitext(self.path)[0] + ".txt", "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+
+        self._finish(write)
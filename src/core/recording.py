@@ -0,0 +1,322 @@
+"""Frame recording to disk and memory-mapped playback.
+
+File layout (``.mfr``)::
+
+    header (64 bytes)
+    raw mode:        N fixed-stride records [ts <f8][frame h*w*c bytes]
+    compressed mode: N variable-length payloads, indexed by a sidecar
+                     ``<path>.idx`` of fixed-stride records
+                     [ts <f8][offset <u8][length <u4][kind u1][pad 3]
+
+Compressed payloads are lossless run-length encodings (over whole BGRA
+pixels) of either the frame itself (keyframe) or its XOR against the
+previous frame (delta).
+A keyframe is written every ``keyframe_interval`` frames so any frame can
+be decoded without reading the whole session.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"MFREC\x00\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIIIId")  # magic, version, flags, h, w, c, keyframe interval, created
+HEADER_SIZE = 64
+FLAG_COMPRESSED = 1
+
+# Payload kinds in compressed mode
+KIND_RAW = 0
+KIND_KEY = 1
+KIND_DELTA = 2
+
+INDEX_DTYPE = np.dtype([("ts", "<f8"), ("offset", "<u8"), ("length", "<u4"),
+                        ("kind", "u1"), ("pad", "u1", (3,))])
+
+
+def rle_encode(data: np.ndarray) -> bytes:
+    """Run-length encode a flat array (uint8 bytes or uint32 pixels).
+
+    Returns:
+        bytes: [runs <u4][values * runs][lengths <u4 * runs]
+    """
+    n = data.size
+    if n == 0:
+        return struct.pack("<I", 0)
+    starts = np.flatnonzero(data[1:] != data[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.concatenate((starts, [n]))).astype("<u4")
+    values = data[starts]
+    return struct.pack("<I", len(starts)) + values.tobytes() + lengths.tobytes()
+
+
+def rle_decode(payload, size: int, dtype=np.uint8) -> np.ndarray:
+    """Decode a payload produced by rle_encode.
+
+    Args:
+        payload: Encoded bytes (or uint8 array)
+        size: Expected number of decoded items
+        dtype: Item type that was encoded
+
+    Returns:
+        numpy.ndarray: Flat array of ``dtype``
+    """
+    buf = np.frombuffer(payload, dtype=np.uint8)
+    itemsize = np.dtype(dtype).itemsize
+    runs = int(buf[:4].view("<u4")[0])
+    end = 4 + runs * itemsize
+    values = buf[4:end].view(dtype)
+    lengths = buf[end:end + 4 * runs].view("<u4")
+    out = np.repeat(values, lengths)
+    if out.size != size:
+        raise ValueError(f"Corrupt RLE payload: {out.size} != {size} items")
+    return out
+
+
+def _pixel_dtype(channels: int):
+    """Item type used for RLE: whole pixels for BGRA, bytes otherwise."""
+    return np.dtype("<u4") if channels == 4 else np.dtype(np.uint8)
+
+
+class FrameRecorder:
+    """Appends frames to a recording from a background writer thread.
+
+    submit() only copies the frame into a preallocated slot and queues
+    it, so the engine loop never waits on the disk. Frames are dropped
+    (and counted) when every slot is busy or the ROI size changes
+    mid-recording.
+    """
+
+    def __init__(self, path: str, compress: bool = False, keyframe_interval: int = 60,
+                 max_queue: int = 64):
+        """Initialize recorder.
+
+        Args:
+            path: Output file (.mfr)
+            compress: Store delta/RLE payloads instead of raw frames
+            keyframe_interval: Frames between keyframes in compressed mode
+            max_queue: Frames buffered before new ones are dropped
+        """
+        self.path = path
+        self.compress = compress
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.max_queue = max(1, int(max_queue))
+        self.written = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._free: "queue.Queue" = queue.Queue()
+        self._slots = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+    def start(self):
+        """Start the writer thread."""
+        if self._thread is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Queue a frame for writing (never blocks).
+
+        Args:
+            frame: Frame with ``bgra`` and ``timestamp``
+        """
+        img = frame.bgra
+        if self._slots is None:
+            # Slot buffers are sized by the first frame
+            self._slots = np.empty((self.max_queue,) + img.shape, dtype=np.uint8)
+            for slot in range(self.max_queue):
+                self._free.put_nowait(slot)
+        elif img.shape != self._slots.shape[1:]:
+            self.dropped += 1
+            return
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        np.copyto(self._slots[slot], img)
+        self._queue.put_nowait((frame.timestamp, slot))
+
+    def close(self):
+        """Flush queued frames and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _writer(self):
+        """Writer thread: drain the queue into the file."""
+        data = index = None
+        prev = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                ts, slot = item
+                img = self._slots[slot]
+                if data is None:
+                    data = open(self.path, "wb")
+                    data.write(self._header(img.shape))
+                    if self.compress:
+                        index = open(self.path + ".idx", "wb")
+
+                if not self.compress:
+                    data.write(struct.pack("<d", ts))
+                    data.write(img)
+                    self.bytes_written += 8 + img.nbytes
+                else:
+                    flat = img.reshape(-1).view(_pixel_dtype(img.shape[2])).copy()
+                    if prev is None or self.written % self.keyframe_interval == 0:
+                        kind, payload = KIND_KEY, rle_encode(flat)
+                    else:
+                        kind, payload = KIND_DELTA, rle_encode(np.bitwise_xor(flat, prev))
+                    if len(payload) >= flat.nbytes:
+                        kind, payload = KIND_RAW, flat.tobytes()
+                    offset = data.tell()
+                    data.write(payload)
+                    index.write(struct.pack("<dQIB3x", ts, offset, len(payload), kind))
+                    self.bytes_written += len(payload) + INDEX_DTYPE.itemsize
+                    prev = flat
+                self._free.put(slot)
+                self.written += 1
+        except Exception as e:
+            self._error = e
+        finally:
+            if data is not None:
+                data.close()
+            if index is not None:
+                index.close()
+
+    def _header(self, shape) -> bytes:
+        """Build the file header for frames of the given shape."""
+        h, w, c = shape
+        flags = FLAG_COMPRESSED if self.compress else 0
+        raw = HEADER.pack(MAGIC, VERSION, flags, h, w, c, self.keyframe_interval, time.time())
+        return raw.ljust(HEADER_SIZE, b"\0")
+
+
+class FrameRecording:
+    """Read-only, memory-mapped view of a recording.
+
+    Nothing is loaded into RAM up front: raw recordings expose the frames
+    directly as a memmap, compressed ones decode frames on access.
+    """
+
+    def __init__(self, path: str):
+        """Open a recording.
+
+        Args:
+            path: Recording file (.mfr)
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(HEADER_SIZE)
+        if len(head) < HEADER.size:
+            raise ValueError(f"Not a frame recording: {path}")
+        magic, version, flags, h, w, c, keyframe_interval, created = HEADER.unpack_from(head)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a frame recording: {path}")
+        self.frame_shape = (h, w, c)
+        self.compressed = bool(flags & FLAG_COMPRESSED)
+        self.keyframe_interval = keyframe_interval
+        self.created = created
+        self._cache_index = -1
+        self._cache_frame = None
+
+        size = os.path.getsize(path) - HEADER_SIZE
+        if not self.compressed:
+            dtype = np.dtype([("ts", "<f8"), ("frame", "u1", self.frame_shape)])
+            count = size // dtype.itemsize  # A partly written last record is ignored
+            self._records = np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE,
+                                      shape=(count,)) if count else np.empty(0, dtype)
+            self.frames = self._records["frame"]
+            self.timestamps = self._records["ts"]
+        else:
+            index_path = path + ".idx"
+            count = os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+            self._index = np.memmap(index_path, dtype=INDEX_DTYPE, mode="r",
+                                    shape=(count,)) if count else np.empty(0, INDEX_DTYPE)
+            self._data = np.memmap(path, dtype=np.uint8, mode="r") if count else None
+            self.frames = self
+            self.timestamps = self._index["ts"]
+
+    @property
+    def shape(self):
+        """(N, h, w, c) shape of the frame sequence."""
+        return (len(self),) + self.frame_shape
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions of the frame sequence."""
+        return 4
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """Get frame i as an (h, w, c) uint8 array."""
+        if not self.compressed:
+            return self.frames[i]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        if i == self._cache_index:
+            return self._cache_frame.view(np.uint8).reshape(self.frame_shape)
+        # Decode forward from the nearest keyframe, or from the cached
+        # frame when it lies between that keyframe and i
+        kinds = self._index["kind"]
+        start = i
+        while start > 0 and kinds[start] == KIND_DELTA:
+            start -= 1
+        prev = None
+        if start <= self._cache_index < i:
+            start, prev = self._cache_index + 1, self._cache_frame
+        for j in range(start, i + 1):
+            prev = self._decode(j, prev)
+        self._cache_index, self._cache_frame = i, prev
+        return prev.view(np.uint8).reshape(self.frame_shape)
+
+    def _decode(self, j: int, prev: Optional[np.ndarray]) -> np.ndarray:
+        """Decode payload j given the previous decoded flat frame."""
+        entry = self._index[j]
+        dtype = _pixel_dtype(self.frame_shape[2])
+        size = int(np.prod(self.frame_shape)) // dtype.itemsize
+        offset = int(entry["offset"])
+        payload = self._data[offset:offset + int(entry["length"])]
+        kind = int(entry["kind"])
+        if kind == KIND_RAW:
+            return np.array(payload).view(dtype)
+        flat = rle_decode(payload, size, dtype)
+        if kind == KIND_DELTA:
+            np.bitwise_xor(flat, prev, out=flat)
+        return flat
+
+    def close(self):
+        """Drop memory maps."""
+        self._records = self._index = self._data = None
+        self.frames = self.timestamps = None
+        self._cache_frame = None
@@ -0,0 +1,154 @@
+"""Named screen regions captured as one union frame and classified per slice."""
+
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .classifier import ColorThresholds, select_classifier
+from .vision import Frame
+
+# Name of the mini-game bar region (the one the engine reacts to)
+PRIMARY_REGION = "bar"
+
+RegionResult = namedtuple("RegionResult", "name green red active green_on red_on")
+
+
+@dataclass
+class ROI:
+    """Region of Interest for screen capture."""
+    x: int
+    y: int
+    w: int
+    h: int
+
+    def to_monitor(self) -> dict:
+        """Convert to MSS monitor dict."""
+        return {"left": self.x, "top": self.y, "width": self.w, "height": self.h}
+
+
+@dataclass(frozen=True)
+class RegionThresholds:
+    """Detection thresholds of one region."""
+    green_th: float
+    red_th: float
+    active_min_ratio: float
+    colors: ColorThresholds
+
+
+class RegionSet:
+    """Named ROIs grabbed together as their bounding union.
+
+    The engine captures ``union`` once per iteration; every region is
+    then a numpy view into that frame, so no pixels are copied. Regions
+    that are far apart make the union (and the grab) larger than the
+    regions themselves, so keep them close.
+    """
+
+    def __init__(self, rois: Dict[str, ROI], primary: str = PRIMARY_REGION):
+        """Initialize region set.
+
+        Args:
+            rois: Region name -> ROI in screen coordinates (insertion order kept)
+            primary: Region the engine's mini-game logic runs on
+        """
+        if primary not in rois:
+            raise ValueError(f"Primary region {primary!r} missing")
+        self.rois = dict(rois)
+        self.primary = primary
+        x0 = min(r.x for r in self.rois.values())
+        y0 = min(r.y for r in self.rois.values())
+        x1 = max(r.x + r.w for r in self.rois.values())
+        y1 = max(r.y + r.h for r in self.rois.values())
+        self.union = ROI(x0, y0, x1 - x0, y1 - y0)
+        # Slice bounds relative to the union: name -> (y0, y1, x0, x1)
+        self._bounds = {name: (r.y - y0, r.y - y0 + r.h, r.x - x0, r.x - x0 + r.w)
+                        for name, r in self.rois.items()}
+        self.extra = tuple(name for name in self.rois if name != primary)
+
+    @classmethod
+    def from_config(cls, config: dict, roi: Optional[ROI] = None) -> "RegionSet":
+        """Build the set from ``config["roi"]`` and ``config["regions"]``.
+
+        Args:
+            config: Configuration dictionary
+            roi: Bar region overriding ``config["roi"]``
+
+        Returns:
+            RegionSet: Bar region plus every extra region with a full x/y/w/h
+        """
+        if roi is None:
+            stored = config["roi"]
+            roi = ROI(stored["x"], stored["y"], stored["w"], stored["h"])
+        rois = {PRIMARY_REGION: roi}
+        for name, section in (config.get("regions") or {}).items():
+            try:
+                rois[name] = ROI(int(section["x"]), int(section["y"]),
+                                 int(section["w"]), int(section["h"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls(rois)
+
+    def __len__(self) -> int:
+        return len(self.rois)
+
+    def view(self, frame: Frame, name: str) -> Frame:
+        """Region ``name`` of a union frame as a Frame (zero-copy view).
+
+        Args:
+            frame: Frame captured for ``union``
+            name: Region name
+
+        Returns:
+            Frame: The frame itself for a single-region set, else a view
+        """
+        if len(self.rois) == 1:
+            return frame
+        y0, y1, x0, x1 = self._bounds[name]
+        return Frame(frame.bgra[y0:y1, x0:x1], frame.timestamp)
+
+
+class RegionDetector:
+    """Classifies the extra regions of a set on their slices of one frame.
+
+    Each region keeps its own classifier so per-region color ranges are
+    only compiled when they change.
+    """
+
+    def __init__(self):
+        self._classifiers = {}
+        self._settings = None
+
+    def configure(self, settings):
+        """Adopt a settings snapshot (updates existing classifiers)."""
+        self._settings = settings
+        for name, classifier in list(self._classifiers.items()):
+            self._classifiers[name] = select_classifier(
+                settings.classifier, settings.region_thresholds(name).colors, classifier)
+
+    def _classifier(self, name: str):
+        classifier = self._classifiers.get(name)
+        if classifier is None:
+            settings = self._settings
+            classifier = self._classifiers[name] = select_classifier(
+                settings.classifier, settings.region_thresholds(name).colors)
+        return classifier
+
+    def detect(self, frame: Frame, regions: RegionSet) -> Tuple[RegionResult, ...]:
+        """Ratios of every extra region, in one pass over the union frame.
+
+        Args:
+            frame: Frame captured for ``regions.union``
+            regions: Region geometry
+
+        Returns:
+            tuple: One RegionResult per extra region
+        """
+        settings = self._settings
+        results = []
+        for name in regions.extra:
+            th = settings.region_thresholds(name)
+            green, red = self._classifier(name).ratios(regions.view(frame, name).bgra)
+            results.append(RegionResult(name, green, red,
+                                        max(green, red) >= th.active_min_ratio,
+                                        green >= th.green_th, red >= th.red_th))
+        return tuple(results)
@@ -0,0 +1,144 @@
+"""Adaptive capture cadence for the engine loop."""
+
+import math
+import threading
+from typing import Optional
+
+from .timing import Clock
+
+
+class PollScheduler:
+    """Deadline-based poll scheduler driven by the mini-game state.
+
+    While the mini-game is active the loop runs at ``active_interval``.
+    While it is inactive the interval starts at ``idle_interval`` and is
+    multiplied by ``backoff`` on every quiet tick, up to ``max_interval``.
+    Deadlines are absolute (perf_counter), so time spent capturing and
+    classifying is not added on top of the interval; a missed deadline is
+    dropped rather than caught up with a burst.
+    """
+
+    def __init__(self, active_interval: float = 0.002, idle_interval: float = 0.010,
+                 max_interval: float = 0.10, backoff: float = 2.0,
+                 clock: Optional[Clock] = None):
+        """Initialize scheduler.
+
+        Args:
+            active_interval: Poll interval while the mini-game is active (s)
+            idle_interval: First poll interval once it goes inactive (s)
+            max_interval: Upper bound of the inactive back-off (s)
+            backoff: Interval multiplier per inactive tick
+            clock: Clock used for deadlines and waits
+        """
+        self.clock = clock or Clock()
+        # Optional (period, origin) grid that deadlines are rounded up to
+        self.grid = None
+        self.configure(active_interval, idle_interval, max_interval, backoff)
+        self.reset()
+
+    def configure(self, active_interval: float, idle_interval: float,
+                  max_interval: float, backoff: float):
+        """Update cadence parameters (takes effect on the next tick)."""
+        self.active_interval = max(0.0, float(active_interval))
+        self.idle_interval = max(self.active_interval, float(idle_interval))
+        self.max_interval = max(self.idle_interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+
+    def align(self, period: float, origin: float = 0.0):
+        """Round every deadline up to the grid ``origin + k * period``.
+
+        Deadlines land on multiples of the current interval (in whole
+        periods), so schedulers aligned to the same grid wake in the same
+        slots and engines sharing a capture ask for frames in the same tick.
+
+        Args:
+            period: Grid spacing (s); 0 disables alignment
+            origin: Time of grid point 0
+        """
+        self.grid = (period, origin) if period > 0 else None
+
+    def reset(self):
+        """Restart cadence and statistics (e.g. after a cast)."""
+        now = self.clock.now()
+        self.interval = self.idle_interval
+        self.deadline = now
+        self._not_before = now
+        self._deferred = None
+        self.ticks = 0
+        self.overruns = 0
+        self.achieved_interval = 0.0
+        self._last_wake = None
+
+    def mark_active(self):
+        """Mini-game is active: snap to the maximum poll rate."""
+        self.interval = self.active_interval
+
+    def mark_inactive(self):
+        """Mini-game is inactive: back off exponentially."""
+        if self.interval < self.idle_interval:
+            self.interval = self.idle_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    def defer(self, seconds: float, label: str = "defer"):
+        """Hold the next tick until at least ``seconds`` from now.
+
+        Args:
+            seconds: Minimum delay
+            label: Jitter label for the deferred wake-up
+        """
+        self._not_before = max(self._not_before, self.clock.now() + seconds)
+        self._deferred = label
+
+    def wait(self, interrupt: Optional[threading.Event] = None,
+             spin: Optional[float] = None):
+        """Sleep until the next deadline and record the achieved cadence.
+
+        Args:
+            interrupt: Event that cuts the sleep short (engine control)
+            spin: Busy-wait budget override for this wait (see Clock.sleep_until)
+        """
+        now = self.clock.now()
+        target = self.deadline + self.interval
+        label = "tick"
+        if self._deferred and self._not_before >= target:
+            target, label = self._not_before, self._deferred
+        self._deferred = None
+        if self.grid is not None:
+            # Step by whole intervals on the grid, so engines polling at the
+            # same (or a multiple of the same) rate wake in the same slots
+            period, origin = self.grid
+            step = period * max(1, round(self.interval / period))
+            target = origin + math.ceil((target - origin) / step - 1e-9) * step
+        if target < now:
+            # Missed the slot: start over from now instead of bursting
+            if self.interval > 0:
+                self.overruns += 1
+            target = now
+            wake = now
+        else:
+            wake = self.clock.sleep_until(target, label, interrupt, spin)
+        self.deadline = target
+        if self._last_wake is not None:
+            period = wake - self._last_wake
+            # Exponential moving average over roughly the last 32 ticks
+            if self.achieved_interval:
+                self.achieved_interval += (period - self.achieved_interval) / 32.0
+            else:
+                self.achieved_interval = period
+        self._last_wake = wake
+        self.ticks += 1
+
+    @property
+    def achieved_hz(self) -> float:
+        """Measured poll rate (ticks per second)."""
+        return 1.0 / self.achieved_interval if self.achieved_interval > 0 else 0.0
+
+    def stats(self) -> dict:
+        """Current cadence figures."""
+        return {
+            "interval_s": self.interval,
+            "achieved_hz": self.achieved_hz,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+        }
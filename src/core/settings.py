@@ -0,0 +1,159 @@
+"""Compiled, immutable engine settings with versioned publication."""
+
+import threading
+
+from .classifier import CLASSIFIERS, ColorThresholds
+from .input import INPUT_BACKENDS
+from .regions import RegionThresholds
+
+
+def _float(config: dict, key: str, default: float, minimum: float = None) -> float:
+    """Read a numeric setting, falling back to the default when invalid."""
+    try:
+        value = float(config.get(key, default))
+    except (TypeError, ValueError):
+        value = float(default)
+    if minimum is not None:
+        value = max(minimum, value)
+    return value
+
+
+def _region_thresholds(config: dict, defaults: RegionThresholds) -> dict:
+    """Compile per-region thresholds from ``config["regions"]``.
+
+    Every key of a region section is optional and falls back to the
+    top-level (bar) value; its ``hsv`` section is merged over the
+    top-level one.
+    """
+    compiled = {}
+    for name, section in (config.get("regions") or {}).items():
+        if not isinstance(section, dict):
+            continue
+        hsv = dict(config.get("hsv") or {})
+        hsv.update(section.get("hsv") or {})
+        compiled[name] = RegionThresholds(
+            green_th=_float(section, "green_th", defaults.green_th, 0.0),
+            red_th=_float(section, "red_th", defaults.red_th, 0.0),
+            active_min_ratio=_float(section, "active_min_ratio", defaults.active_min_ratio, 0.0),
+            colors=ColorThresholds.from_config({"hsv": hsv}),
+        )
+    return compiled
+
+
+class EngineSettings:
+    """Frozen snapshot of everything the engine loop reads.
+
+    Values are parsed and clamped once when the snapshot is compiled, so
+    the loop only does attribute reads.
+    """
+
+    __slots__ = (
+        "version", "green_th", "red_th", "active_min_ratio",
+        "click_i", "idle_i", "active_i", "idle_max_i", "idle_backoff", "spin_s",
+        "hold_s", "down_s", "inactive_to", "recast_delay", "auto_recast",
+        "classifier", "thresholds", "input_backend", "regions",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EngineSettings is immutable; publish a new snapshot")
+
+    def __delattr__(self, name):
+        raise AttributeError("EngineSettings is immutable; publish a new snapshot")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"EngineSettings({fields})"
+
+    def region_thresholds(self, name: str) -> RegionThresholds:
+        """Thresholds of a named region (the bar's own when it has none)."""
+        th = self.regions.get(name)
+        if th is None:
+            th = RegionThresholds(self.green_th, self.red_th, self.active_min_ratio,
+                                  self.thresholds)
+        return th
+
+    @classmethod
+    def from_config(cls, config: dict, version: int = 0) -> "EngineSettings":
+        """Compile a configuration dictionary.
+
+        Args:
+            config: Configuration dictionary (missing keys use defaults)
+            version: Version number stamped on the snapshot
+
+        Returns:
+            EngineSettings: Validated snapshot
+        """
+        classifier = str(config.get("classifier", "lut")).lower()
+        if classifier not in CLASSIFIERS:
+            classifier = "lut"
+        input_backend = str(config.get("input_backend", "pyautogui")).lower()
+        if input_backend not in INPUT_BACKENDS:
+            input_backend = "pyautogui"
+        active_i = _float(config, "active_i", 0.002, 0.0)
+        idle_i = _float(config, "idle_i", 0.010, active_i)
+        bar = RegionThresholds(
+            green_th=_float(config, "green_th", 0.14, 0.0),
+            red_th=_float(config, "red_th", 0.10, 0.0),
+            active_min_ratio=_float(config, "active_min_ratio", 0.03, 0.0),
+            colors=ColorThresholds.from_config(config),
+        )
+        return cls(
+            version=version,
+            green_th=bar.green_th,
+            red_th=bar.red_th,
+            active_min_ratio=bar.active_min_ratio,
+            click_i=_float(config, "click_i", 0.035, 0.0),
+            idle_i=idle_i,
+            active_i=active_i,
+            idle_max_i=_float(config, "idle_max_i", 0.10, idle_i),
+            idle_backoff=_float(config, "idle_backoff", 2.0, 1.0),
+            spin_s=_float(config, "spin_s", 0.0015, 0.0),
+            hold_s=_float(config, "hold_s", 3.0, 0.1),
+            down_s=_float(config, "down_s", 0.01, 0.001),
+            inactive_to=_float(config, "inactive_to", 1.2, 0.0),
+            recast_delay=_float(config, "recast_delay", 0.30, 0.0),
+            auto_recast=bool(config.get("auto_recast", True)),
+            classifier=classifier,
+            thresholds=bar.colors,
+            input_backend=input_backend,
+            regions=_region_thresholds(config, bar),
+        )
+
+
+class SettingsStore:
+    """Holds the current settings snapshot and publishes replacements.
+
+    Any thread may publish; the engine thread picks up the new snapshot
+    by reading ``current`` at an iteration boundary. Swapping a single
+    reference means readers never see half-applied settings.
+    """
+
+    def __init__(self, config: dict):
+        """Initialize store with a first snapshot (version 1)."""
+        self._lock = threading.Lock()
+        self.config = dict(config)
+        self.current = EngineSettings.from_config(config, version=1)
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot."""
+        return self.current.version
+
+    def publish(self, config: dict) -> EngineSettings:
+        """Compile and publish new settings.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            EngineSettings: The published snapshot
+        """
+        with self._lock:
+            snapshot = EngineSettings.from_config(config, version=self.current.version + 1)
+            self.config = dict(config)
+            self.current = snapshot
+        return snapshot
@@ -0,0 +1,283 @@
+"""Closed-loop fishing mini-game simulator for headless end-to-end runs."""
+
+import random
+import time
+from typing import Optional
+
+import numpy as np
+
+from .input import InputBackend
+from .sources import FrameSource, SYN_BACKGROUND, SYN_GREEN, SYN_RED
+from .timing import VirtualClock
+from .vision import Frame
+
+# Indicator drawn over the bar (classified as neither green nor red)
+SIM_INDICATOR = (235, 235, 235)
+
+IDLE = "idle"
+WAITING = "waiting"
+MINIGAME = "minigame"
+
+
+class GameSimulator(FrameSource, InputBackend):
+    """Fishing mini-game that reacts to the engine's mouse input.
+
+    Casting (a press of at least ``min_cast_s``) is followed by a bite
+    after a random delay. The mini-game shows an indicator sweeping back
+    and forth over a bar with red fail zones at both ends and a green
+    catch zone. While the indicator is inside the catch zone the zone
+    lights up (large green area); otherwise only its outline is drawn.
+    A press while lit is a hit and moves the zone, a press while unlit is
+    a miss. ``hits_to_catch`` hits land the fish; ``max_misses`` misses or
+    ``game_timeout_s`` without a catch lose it.
+
+    All timing comes from the clock, so with a VirtualClock the game runs
+    as fast as the engine can process frames.
+    """
+
+    name = "sim"
+
+    def __init__(self, clock: VirtualClock, seed: int = 0, sweep_s: float = 1.2,
+                 zone_w: float = 0.22, fail_w: float = 0.05, hits_to_catch: int = 3,
+                 max_misses: int = 3, bite_s=(0.5, 2.0), min_cast_s: float = 0.3,
+                 game_timeout_s: float = 10.0, capture_s: float = 0.004):
+        """Initialize simulator.
+
+        Args:
+            clock: Time base shared with the engine
+            seed: Random seed (bite delays, zone positions)
+            sweep_s: Seconds for the indicator to cross the bar once
+            zone_w: Catch zone width (fraction of the bar)
+            fail_w: Width of each red fail zone at the bar ends
+            hits_to_catch: Hits needed to land a fish
+            max_misses: Misses before the fish escapes
+            bite_s: (min, max) delay between cast and bite
+            min_cast_s: Shortest press that counts as a cast
+            game_timeout_s: Mini-game length before the fish escapes
+            capture_s: Simulated capture latency added to every grab
+        """
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.sweep_s = sweep_s
+        self.zone_w = zone_w
+        self.fail_w = fail_w
+        self.hits_to_catch = hits_to_catch
+        self.max_misses = max_misses
+        self.bite_s = bite_s
+        self.min_cast_s = min_cast_s
+        self.game_timeout_s = game_timeout_s
+        self.capture_s = capture_s
+
+        self.state = IDLE
+        self.frames = 0
+        self.casts = 0
+        self.catches = 0
+        self.escapes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reactions = []
+        self._down_at = None
+        self._bite_at = None
+        self._game_start = 0.0
+        self._zone = (0.0, 0.0)
+        self._zone_since = 0.0
+        self._game_hits = 0
+        self._game_misses = 0
+        self._img = None
+
+    # ---- game model ----
+
+    def indicator(self, t: float) -> float:
+        """Indicator position (0..1 along the bar) at time t."""
+        phase = ((t - self._game_start) / self.sweep_s) % 2.0
+        return phase if phase < 1.0 else 2.0 - phase
+
+    def lit(self, t: float) -> bool:
+        """True while the indicator is inside the catch zone."""
+        return self._zone[0] <= self.indicator(t) <= self._zone[1]
+
+    def _place_zone(self, t: float):
+        lo = self.fail_w
+        hi = 1.0 - self.fail_w - self.zone_w
+        x0 = self.rng.uniform(lo, hi)
+        self._zone = (x0, x0 + self.zone_w)
+        self._zone_since = t
+
+    def _lit_since(self, t: float, step: float = 0.0005) -> float:
+        """When the current lit period began ("green appeared")."""
+        start = t
+        while start - step >= self._zone_since and self.lit(start - step):
+            start -= step
+        return start
+
+    def _update(self, now: float):
+        """Advance game state to the current time."""
+        if self.state == WAITING and now >= self._bite_at:
+            self.state = MINIGAME
+            self._game_start = self._bite_at
+            self._game_hits = 0
+            self._game_misses = 0
+            self._place_zone(self._bite_at)
+        elif self.state == MINIGAME and now - self._game_start >= self.game_timeout_s:
+            self._end_game(caught=False)
+
+    def _end_game(self, caught: bool):
+        self.state = IDLE
+        if caught:
+            self.catches += 1
+        else:
+            self.escapes += 1
+
+    # ---- InputBackend ----
+
+    def mouse_down(self, button: str = "left"):
+        now = self.clock.now()
+        self._update(now)
+        self._down_at = now
+        if self.state != MINIGAME:
+            return
+        if self.lit(now):
+            self.hits += 1
+            self._game_hits += 1
+            self.reactions.append(now - self._lit_since(now))
+            if self._game_hits >= self.hits_to_catch:
+                self._end_game(caught=True)
+            else:
+                self._place_zone(now)
+        else:
+            self.misses += 1
+            self._game_misses += 1
+            if self._game_misses >= self.max_misses:
+                self._end_game(caught=False)
+
+    def mouse_up(self, button: str = "left"):
+        now = self.clock.now()
+        self._update(now)
+        down_at, self._down_at = self._down_at, None
+        if self.state == IDLE and down_at is not None and now - down_at >= self.min_cast_s:
+            self.casts += 1
+            self.state = WAITING
+            self._bite_at = now + self.rng.uniform(*self.bite_s)
+
+    # ---- FrameSource ----
+
+    def render(self, w: int, h: int, t: float) -> np.ndarray:
+        """Render the ROI at time t (BGRA, reused buffer)."""
+        if self._img is None or self._img.shape[:2] != (h, w):
+            self._img = np.empty((h, w, 4), dtype=np.uint8)
+            self._img[:, :, 3] = 255
+        img = self._img
+        img[:, :, :3] = SYN_BACKGROUND
+        if self.state != MINIGAME:
+            return img
+        top, bottom = h // 10, h - h // 10
+        fail = int(round(w * self.fail_w))
+        img[top:bottom, :fail, :3] = SYN_RED
+        img[top:bottom, w - fail:, :3] = SYN_RED
+        x0 = int(round(w * self._zone[0]))
+        x1 = int(round(w * self._zone[1]))
+        if self.lit(t):
+            img[top:bottom, x0:x1, :3] = SYN_GREEN
+        else:
+            img[top:top + 2, x0:x1, :3] = SYN_GREEN
+            img[bottom - 2:bottom, x0:x1, :3] = SYN_GREEN
+            img[top:bottom, x0:x0 + 2, :3] = SYN_GREEN
+            img[top:bottom, x1 - 2:x1, :3] = SYN_GREEN
+        xi = int(round((w - 3) * self.indicator(t)))
+        img[:, xi:xi + 3, :3] = SIM_INDICATOR
+        return img
+
+    def grab(self, roi) -> Frame:
+        """Render the current game state, charging the capture latency."""
+        t = self.clock.now()
+        self._update(t)
+        if self.capture_s:
+            self.clock.advance(self.capture_s)
+        self.frames += 1
+        return Frame(self.render(roi.w, roi.h, t), t)
+
+    # ---- results ----
+
+    def report(self, sim_s: float) -> dict:
+        """Summary of the run.
+
+        Args:
+            sim_s: Simulated seconds covered
+
+        Returns:
+            dict: Reaction latency percentiles (ms), success rate, cycles/hour
+        """
+        reactions = np.asarray(self.reactions, dtype=np.float64) * 1000.0
+        cycles = self.catches + self.escapes
+        latency = None
+        if reactions.size:
+            p50, p95, p99 = np.percentile(reactions, [50, 95, 99])
+            latency = {
+                "count": int(reactions.size),
+                "mean_ms": float(reactions.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(reactions.max()),
+            }
+        return {
+            "sim_s": sim_s,
+            "frames": self.frames,
+            "casts": self.casts,
+            "catches": self.catches,
+            "escapes": self.escapes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "success_rate": self.catches / cycles if cycles else 0.0,
+            "cycles_per_hour": cycles * 3600.0 / sim_s if sim_s > 0 else 0.0,
+            "reaction": latency,
+        }
+
+
+class _SimDeadline(FrameSource):
+    """Ends the engine run (EOFError) once the simulated time is up."""
+
+    def __init__(self, game: GameSimulator, duration_s: float):
+        self.game = game
+        self.end = game.clock.now() + duration_s
+
+    def grab(self, roi) -> Frame:
+        if self.game.clock.now() >= self.end:
+            raise EOFError("Simulation finished")
+        return self.game.grab(roi)
+
+
+def run_simulation(config: dict, duration_s: float = 600.0, seed: int = 0,
+                   roi=None, capture_s: float = 0.004, game: Optional[dict] = None) -> dict:
+    """Drive a FishingEngine against the simulator in virtual time.
+
+    Args:
+        config: Engine configuration
+        duration_s: Simulated seconds to run
+        seed: Random seed
+        roi: ROI to render (defaults to ``config["roi"]``)
+        capture_s: Simulated capture latency per frame
+        game: Extra GameSimulator keyword arguments
+
+    Returns:
+        dict: GameSimulator.report() plus wall time and speed-up
+    """
+    from .engine import FishingEngine, ROI
+
+    if roi is None:
+        stored = config.get("roi", {"x": 0, "y": 0, "w": 526, "h": 70})
+        roi = ROI(stored["x"], stored["y"], stored["w"], stored["h"])
+    clock = VirtualClock()
+    sim = GameSimulator(clock, seed=seed, capture_s=capture_s, **(game or {}))
+    engine = FishingEngine(dict(config, metrics_dir=""), source=_SimDeadline(sim, duration_s),
+                           input_backend=sim, clock=clock)
+    wall = time.perf_counter()
+    engine.start()
+    engine.run(roi)
+    wall = time.perf_counter() - wall
+    sim_s = clock.now()
+    report = sim.report(sim_s)
+    report["wall_s"] = wall
+    report["speedup"] = sim_s / wall if wall > 0 else 0.0
+    report["states"] = engine.states.snapshot()
+    return report
@@ -0,0 +1,195 @@
+"""Frame sources feeding the fishing engine."""
+
+import math
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import cv2
+
+from .vision import Frame, get_thread_grabber
+from .recording import FrameRecording
+
+# BGR colors used by the synthetic mini-game
+SYN_BACKGROUND = (32, 30, 28)
+SYN_GREEN = (70, 200, 60)
+SYN_RED = (40, 40, 210)
+
+
+class FrameSource:
+    """Base class for anything that can produce ROI frames.
+
+    Sources raise EOFError from grab() when they run out of frames.
+    """
+
+    def grab(self, roi) -> Frame:
+        """Capture one frame of the given region.
+
+        Args:
+            roi: ROI object (x, y, w, h)
+
+        Returns:
+            Frame: Captured frame in BGRA layout
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the source."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MssFrameSource(FrameSource):
+    """Live screen capture through MSS (one grabber per calling thread)."""
+
+    def grab(self, roi) -> Frame:
+        """Capture screen region."""
+        return get_thread_grabber().grab(roi)
+
+
+class ReplayFrameSource(FrameSource):
+    """Replays recorded frames, either as fast as possible or in real time."""
+
+    def __init__(self, frames, timestamps=None, realtime: bool = False, loop: bool = False):
+        """Initialize replay source.
+
+        Args:
+            frames: (N, h, w, 3|4) uint8 array, or path to a .npy file or
+                    .mfr recording (both opened memory-mapped)
+            timestamps: Optional capture times in seconds, one per frame
+                        (read from the file for .mfr recordings)
+            realtime: Pace frames by their recorded timestamps
+            loop: Restart from the first frame instead of raising EOFError
+        """
+        if isinstance(frames, str):
+            if frames.endswith(".mfr"):
+                recording = FrameRecording(frames)
+                frames = recording.frames
+                if timestamps is None:
+                    timestamps = recording.timestamps
+            else:
+                frames = np.load(frames, mmap_mode="r")
+        if frames.ndim != 4 or frames.shape[3] not in (3, 4):
+            raise ValueError(f"Expected (N, h, w, 3|4) frames, got {frames.shape}")
+        self.frames = frames
+        self.timestamps = timestamps
+        self.realtime = realtime
+        self.loop = loop
+        self.index = 0
+        self._start = None
+        self._bgra = None
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def _frame_time(self, i: int) -> float:
+        """Recorded time of frame i, relative to the first frame."""
+        if self.timestamps is None:
+            return 0.0
+        return float(self.timestamps[i]) - float(self.timestamps[0])
+
+    def grab(self, roi=None) -> Frame:
+        """Return the next recorded frame (the ROI is ignored).
+
+        In real-time mode this behaves like a live screen: it waits for
+        the next frame to be due and skips frames the caller was too slow
+        to see.
+        """
+        if self.index >= len(self.frames):
+            if not self.loop or len(self.frames) == 0:
+                raise EOFError("Replay finished")
+            self.index = 0
+            self._start = None
+        i = self.index
+
+        if self.realtime:
+            now = time.perf_counter()
+            if self._start is None:
+                self._start = now - self._frame_time(i)
+            elapsed = now - self._start
+            delay = self._frame_time(i) - elapsed
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                while i + 1 < len(self.frames) and self._frame_time(i + 1) <= elapsed:
+                    i += 1
+        self.index = i + 1
+
+        img = self.frames[i]
+        if img.shape[2] == 3:
+            if self._bgra is None or self._bgra.shape[:2] != img.shape[:2]:
+                self._bgra = np.empty(img.shape[:2] + (4,), dtype=np.uint8)
+            img = cv2.cvtColor(np.asarray(img), cv2.COLOR_BGR2BGRA, dst=self._bgra)
+        return Frame(img, time.perf_counter())
+
+    def rewind(self):
+        """Restart from the first frame."""
+        self.index = 0
+        self._start = None
+
+
+class SyntheticFrameSource(FrameSource):
+    """Procedurally rendered fishing mini-game bar.
+
+    The bar alternates between an idle phase (plain background, as while
+    waiting for a bite) and a mini-game phase where a green catch zone
+    and a red fail zone grow and shrink, so the green ratio repeatedly
+    crosses the click threshold.
+    """
+
+    def __init__(self, idle_s: float = 1.5, game_s: float = 4.0, wave_s: float = 0.8,
+                 clock: Optional[Callable[[], float]] = None):
+        """Initialize synthetic source.
+
+        Args:
+            idle_s: Seconds without mini-game per cycle
+            game_s: Seconds of mini-game per cycle
+            wave_s: Period of the green/red zone oscillation
+            clock: Time function (defaults to time.perf_counter)
+        """
+        self.idle_s = idle_s
+        self.game_s = game_s
+        self.wave_s = wave_s
+        self.clock = clock or time.perf_counter
+        self._t0 = None
+
+    def zones(self, t: float):
+        """Zone widths at time t as fractions of the bar width.
+
+        Returns:
+            tuple: (green_fraction, red_fraction), both 0 while idle
+        """
+        phase = t % (self.idle_s + self.game_s)
+        if phase < self.idle_s:
+            return 0.0, 0.0
+        wave = 0.5 + 0.5 * math.sin(2.0 * math.pi * (phase - self.idle_s) / self.wave_s)
+        green = 0.05 + 0.35 * wave
+        red = 0.30 - 0.25 * wave
+        return green, red
+
+    def render(self, w: int, h: int, t: float) -> np.ndarray:
+        """Render the bar at time t as a BGRA image."""
+        img = np.empty((h, w, 4), dtype=np.uint8)
+        img[:, :, :3] = SYN_BACKGROUND
+        img[:, :, 3] = 255
+        green, red = self.zones(t)
+        if green or red:
+            top, bottom = h // 5, h - h // 5
+            gw = int(round(w * green))
+            rw = int(round(w * red))
+            x0 = (w - gw) // 2
+            img[top:bottom, x0:x0 + gw, :3] = SYN_GREEN
+            img[top:bottom, :rw // 2, :3] = SYN_RED
+            img[top:bottom, w - (rw - rw // 2):, :3] = SYN_RED
+        return img
+
+    def grab(self, roi) -> Frame:
+        """Render a frame of the ROI size."""
+        now = self.clock()
+        if self._t0 is None:
+            self._t0 = now
+        return Frame(self.render(roi.w, roi.h, now - self._t0), now)
@@ -0,0 +1,107 @@
+"""Fishing cycle state machine with per-state timing."""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+
+class EngineState(Enum):
+    """Phases of a fishing cycle."""
+    CASTING = "casting"
+    WAITING_FOR_BITE = "waiting_for_bite"
+    MINIGAME = "minigame"
+    RECAST_DELAY = "recast_delay"
+    PAUSED = "paused"
+
+
+class StateMachine:
+    """Tracks the current engine state and where the time goes.
+
+    Time spent in each state is accumulated both in total and per cycle.
+    A cycle starts every time CASTING is entered.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, history: int = 50):
+        """Initialize state machine.
+
+        Args:
+            clock: Monotonic time function
+            history: Completed cycles kept for averaging
+        """
+        self.clock = clock
+        self.hooks: List[Callable] = []
+        self.cycles = deque(maxlen=history)
+        self.reset()
+
+    def reset(self, state: Optional[EngineState] = None):
+        """Clear timings and optionally enter a first state."""
+        self.state: Optional[EngineState] = None
+        self.entered_at = self.clock()
+        self.totals: Dict[EngineState, float] = {s: 0.0 for s in EngineState}
+        self.cycles.clear()
+        self.cycle_count = 0
+        self._cycle: Optional[Dict[EngineState, float]] = None
+        if state is not None:
+            self.transition(state)
+
+    def add_hook(self, hook: Callable):
+        """Register ``hook(prev_state, new_state, now)`` for every transition."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable):
+        """Unregister a transition hook."""
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def transition(self, new_state: Optional[EngineState]) -> bool:
+        """Move to a new state (None marks the engine as stopped).
+
+        Returns:
+            bool: False if already in that state
+        """
+        prev = self.state
+        if new_state is prev:
+            return False
+        now = self.clock()
+        if prev is not None:
+            spent = now - self.entered_at
+            self.totals[prev] += spent
+            if self._cycle is not None:
+                self._cycle[prev] += spent
+        if new_state is EngineState.CASTING:
+            if self._cycle is not None:
+                self.cycles.append(self._cycle)
+                self.cycle_count += 1
+            self._cycle = {s: 0.0 for s in EngineState}
+        self.state = new_state
+        self.entered_at = now
+        for hook in self.hooks:
+            try:
+                hook(prev, new_state, now)
+            except Exception:
+                pass
+        return True
+
+    def time_in_state(self) -> float:
+        """Seconds spent in the current state so far."""
+        return self.clock() - self.entered_at
+
+    def snapshot(self) -> dict:
+        """Total seconds per state, including the state in progress."""
+        out = {s.value: t for s, t in self.totals.items()}
+        if self.state is not None:
+            out[self.state.value] += self.time_in_state()
+        return out
+
+    def cycle_summary(self) -> dict:
+        """Average seconds per state over the completed cycles.
+
+        Returns:
+            dict: {"cycles": n, "avg_cycle_s": x, "states": {state: avg_s}}
+        """
+        n = len(self.cycles)
+        if n == 0:
+            return {"cycles": 0, "avg_cycle_s": 0.0, "states": {}}
+        states = {s.value: sum(c[s] for c in self.cycles) / n for s in EngineState}
+        return {"cycles": n, "avg_cycle_s": sum(states.values()), "states": states}
@@ -0,0 +1,73 @@
+"""Rate-limited copies of the engine's frames and class maps for debug views."""
+
+from collections import namedtuple
+from typing import Optional
+
+import numpy as np
+
+TapFrame = namedtuple("TapFrame", "seq timestamp bgra classes green red")
+
+
+class FrameTap:
+    """Hands frames the engine already classified to a debug consumer.
+
+    The engine calls ``offer()`` after classifying each frame. At most
+    ``max_hz`` times per second the frame and its class map are copied
+    into one of two buffer pairs owned by the tap; everything else is a
+    timestamp comparison. Consumers poll ``latest`` at their own rate and
+    never classify again themselves.
+    """
+
+    def __init__(self, max_hz: float = 15.0):
+        """Initialize tap.
+
+        Args:
+            max_hz: Maximum copy rate (0 = every frame)
+        """
+        self.max_hz = max_hz
+        self.interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self.offered = 0
+        self.copied = 0
+        self._seq = 0
+        self._last_ts = None
+        self._pairs = [None, None]
+        self._index = 0
+        self._latest = None
+
+    def offer(self, frame, classifier, green: float, red: float) -> bool:
+        """Copy a frame and its class map if the consumer is due one.
+
+        Args:
+            frame: Frame the engine just classified
+            classifier: Classifier that produced the ratios (``last_classes``)
+            green, red: Ratios computed for the frame
+
+        Returns:
+            bool: True if the frame was copied
+        """
+        self.offered += 1
+        ts = frame.timestamp
+        if self._last_ts is not None and ts - self._last_ts < self.interval:
+            return False
+        classes = getattr(classifier, "last_classes", None)
+        if classes is None:
+            return False
+        src = frame.bgra
+        i = self._index
+        pair = self._pairs[i]
+        if pair is None or pair[0].shape != src.shape or pair[1].shape != classes.shape:
+            pair = self._pairs[i] = (np.empty_like(src), np.empty_like(classes))
+        np.copyto(pair[0], src)
+        np.copyto(pair[1], classes)
+        self._seq += 1
+        # Single reference swap: readers see the old or the new pair, never a mix
+        self._latest = TapFrame(self._seq, ts, pair[0], pair[1], green, red)
+        self._last_ts = ts
+        self._index = 1 - i
+        self.copied += 1
+        return True
+
+    @property
+    def latest(self) -> Optional[TapFrame]:
+        """Newest copied frame, if any (valid until the copy after next)."""
+        return self._latest
@@ -0,0 +1,104 @@
+"""Latest-value telemetry shared between the engine and its consumers."""
+
+import time
+from collections import namedtuple
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    """What the engine is doing, published as a compact code."""
+    IDLE = 0
+    HOLD = 1
+    MONITORING = 2
+    WAITING = 3
+    CLICK = 4
+    RECAST = 5
+    PAUSED = 6
+    FINISHED = 7
+    ERROR = 8
+
+
+# Display text per action; "{arg}" is the numeric argument (e.g. seconds)
+ACTION_TEXT = {
+    Action.IDLE: "Idle",
+    Action.HOLD: "Hold {arg:.2f}s...",
+    Action.MONITORING: "Monitoring...",
+    Action.WAITING: "Menunggu mini-game...",
+    Action.CLICK: "CLICK",
+    Action.RECAST: "Recast in {arg:.2f}s...",
+    Action.PAUSED: "⏸️ Auto-Paused...",
+    Action.FINISHED: "Selesai",
+    Action.ERROR: "Error: {detail}",
+}
+
+TelemetrySample = namedtuple("TelemetrySample", "seq ts green red action arg detail regions")
+
+
+def format_action(sample: TelemetrySample) -> str:
+    """Render the action of a sample for display."""
+    return ACTION_TEXT[sample.action].format(arg=sample.arg, detail=sample.detail)
+
+
+class Telemetry:
+    """Single-writer, many-reader latest-value channel.
+
+    The engine overwrites the fields in place; readers poll at their own
+    rate and only ever see the newest values. Writes are bracketed by a
+    sequence counter (odd while a write is in progress), so ``read()``
+    never returns ratios and action from two different updates.
+    """
+
+    __slots__ = ("seq", "ts", "green", "red", "action", "arg", "detail", "regions")
+
+    def __init__(self):
+        self.seq = 0
+        self.ts = 0.0
+        self.green = 0.0
+        self.red = 0.0
+        self.action = Action.IDLE
+        self.arg = 0.0
+        self.detail = ""
+        self.regions = ()
+
+    def publish_ratios(self, green: float, red: float, regions: tuple = ()):
+        """Store the latest green/red ratios (engine thread only).
+
+        Args:
+            green, red: Ratios of the bar region
+            regions: RegionResult per extra region
+        """
+        self.seq += 1
+        self.green = green
+        self.red = red
+        self.regions = regions
+        self.ts = time.perf_counter()
+        self.seq += 1
+
+    def publish_action(self, action: Action, arg: float = 0.0, detail: str = ""):
+        """Store the latest action (engine thread only).
+
+        Args:
+            action: Action code
+            arg: Numeric argument shown with the action (e.g. hold seconds)
+            detail: Free text, only used for errors
+        """
+        if action is self.action and arg == self.arg and detail == self.detail:
+            return
+        self.seq += 1
+        self.action = action
+        self.arg = arg
+        self.detail = detail
+        self.ts = time.perf_counter()
+        self.seq += 1
+
+    def read(self, retries: int = 100) -> TelemetrySample:
+        """Consistent copy of the latest values (any thread)."""
+        sample = None
+        for _ in range(retries):
+            seq = self.seq
+            sample = TelemetrySample(seq, self.ts, self.green, self.red,
+                                     self.action, self.arg, self.detail, self.regions)
+            if not seq & 1 and seq == self.seq:
+                return sample
+            time.sleep(0)
+        return sample
@@ -0,0 +1,237 @@
+"""High-resolution waits and jitter recording for clicks and loop deadlines."""
+
+import heapq
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class JitterLog:
+    """Ring buffer of scheduled vs. actual timestamps per label.
+
+    Errors are ``actual - scheduled``: positive means late.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """Initialize jitter log.
+
+        Args:
+            capacity: Samples kept (oldest are overwritten)
+        """
+        self.capacity = capacity
+        self._labels = {}
+        self._label_ids = np.zeros(capacity, dtype=np.uint8)
+        self._scheduled = np.zeros(capacity, dtype=np.float64)
+        self._actual = np.zeros(capacity, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, label: str, scheduled: float, actual: float):
+        """Store one sample (safe from several threads)."""
+        with self._lock:
+            label_id = self._labels.get(label)
+            if label_id is None:
+                label_id = self._labels.setdefault(label, len(self._labels))
+            i = self._count % self.capacity
+            self._label_ids[i] = label_id
+            self._scheduled[i] = scheduled
+            self._actual[i] = actual
+            self._count += 1
+
+    def clear(self):
+        """Drop all samples."""
+        self._count = 0
+
+    def errors_ms(self, label: str) -> np.ndarray:
+        """Timing errors (ms) recorded for a label, oldest first."""
+        label_id = self._labels.get(label)
+        n = min(self._count, self.capacity)
+        if label_id is None or n == 0:
+            return np.empty(0)
+        order = np.arange(self._count - n, self._count) % self.capacity
+        ids = self._label_ids[order]
+        keep = order[ids == label_id]
+        return (self._actual[keep] - self._scheduled[keep]) * 1000.0
+
+    def histogram(self, label: str, bin_ms: float = 0.25, low_ms: float = -2.0,
+                  high_ms: float = 5.0):
+        """Histogram of timing errors for a label.
+
+        Returns:
+            tuple: (counts, bin_edges_ms)
+        """
+        edges = np.arange(low_ms, high_ms + bin_ms, bin_ms)
+        errors = np.clip(self.errors_ms(label), low_ms, high_ms)
+        return np.histogram(errors, bins=edges)
+
+    def summary(self, tolerance_ms: float = 1.0) -> dict:
+        """Per-label error statistics.
+
+        Returns:
+            dict: label -> {count, mean_ms, p50_ms, p99_ms, max_ms, within}
+                  where ``within`` is the fraction inside ±tolerance_ms
+        """
+        out = {}
+        for label in list(self._labels):
+            errors = self.errors_ms(label)
+            if errors.size == 0:
+                continue
+            p50, p99 = np.percentile(errors, [50, 99])
+            out[label] = {
+                "count": int(errors.size),
+                "mean_ms": float(errors.mean()),
+                "p50_ms": float(p50),
+                "p99_ms": float(p99),
+                "max_ms": float(np.abs(errors).max()),
+                "within": float(np.mean(np.abs(errors) <= tolerance_ms)),
+            }
+        return out
+
+
+class Clock:
+    """Monotonic clock with hybrid sleep-then-spin waits.
+
+    Waits sleep until ``spin`` seconds before the deadline, then busy-wait
+    the remainder, which avoids the OS timer overshooting short waits.
+    """
+
+    # True for clocks that do not follow wall time (see VirtualClock)
+    virtual = False
+
+    def __init__(self, spin: float = 0.0015, jitter: Optional[JitterLog] = None):
+        """Initialize clock.
+
+        Args:
+            spin: Busy-wait budget before each deadline (s); 0 disables spinning
+            jitter: Optional log of scheduled vs. actual wake-ups
+        """
+        self.spin = max(0.0, float(spin))
+        self.jitter = jitter
+
+    @staticmethod
+    def now() -> float:
+        """Current time (time.perf_counter)."""
+        return time.perf_counter()
+
+    def sleep_until(self, deadline: float, label: Optional[str] = None,
+                    interrupt: Optional[threading.Event] = None,
+                    spin: Optional[float] = None) -> float:
+        """Wait until a perf_counter deadline.
+
+        Args:
+            deadline: Absolute time to wake up
+            label: Record the wake-up error under this label
+            interrupt: Event that ends the wait early once set
+            spin: Busy-wait budget for this wait (defaults to ``self.spin``);
+                  0 blocks for the whole wait and leaves the GIL to other threads
+
+        Returns:
+            float: Actual wake-up time (before the deadline if interrupted)
+        """
+        clock = time.perf_counter
+        remaining = deadline - clock() - (self.spin if spin is None else spin)
+        if remaining > 0:
+            if interrupt is None:
+                time.sleep(remaining)
+            elif interrupt.wait(remaining):
+                return clock()
+        now = clock()
+        while now < deadline:
+            if interrupt is not None and interrupt.is_set():
+                return now
+            now = clock()
+        if label is not None and self.jitter is not None:
+            self.jitter.record(label, deadline, now)
+        return now
+
+    def sleep(self, seconds: float, label: Optional[str] = None,
+              interrupt: Optional[threading.Event] = None) -> float:
+        """Wait for a duration (see sleep_until)."""
+        return self.sleep_until(time.perf_counter() + seconds, label, interrupt)
+
+
+class VirtualClock(Clock):
+    """Simulated clock: waits advance time instantly instead of sleeping.
+
+    Used to run the engine single-threaded and faster than real time.
+    Callbacks registered with ``call_at`` fire, in time order, whenever a
+    wait moves the clock past their due time.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0, jitter: Optional[JitterLog] = None):
+        """Initialize virtual clock.
+
+        Args:
+            start: Initial time (s)
+            jitter: Optional jitter log (virtual waits are always exact)
+        """
+        super().__init__(spin=0.0, jitter=jitter)
+        self._now = float(start)
+        self._timers = []
+        self._seq = 0
+
+    def now(self) -> float:
+        """Current simulated time."""
+        return self._now
+
+    def call_at(self, when: float, callback: Callable[[], None]):
+        """Run ``callback()`` once the clock reaches ``when``."""
+        heapq.heappush(self._timers, (when, self._seq, callback))
+        self._seq += 1
+
+    def advance(self, seconds: float):
+        """Move time forward, firing due callbacks."""
+        self.advance_to(self._now + seconds)
+
+    def advance_to(self, deadline: float):
+        """Move time forward to ``deadline``, firing due callbacks."""
+        while self._timers and self._timers[0][0] <= deadline:
+            when, _, callback = heapq.heappop(self._timers)
+            self._now = max(self._now, when)
+            callback()
+        self._now = max(self._now, deadline)
+
+    def sleep_until(self, deadline: float, label: Optional[str] = None,
+                    interrupt: Optional[threading.Event] = None,
+                    spin: Optional[float] = None) -> float:
+        """Jump to the deadline (see Clock.sleep_until)."""
+        if interrupt is not None and interrupt.is_set():
+            return self._now
+        self.advance_to(deadline)
+        if label is not None and self.jitter is not None:
+            self.jitter.record(label, deadline, self._now)
+        return self._now
+
+    def sleep(self, seconds: float, label: Optional[str] = None,
+              interrupt: Optional[threading.Event] = None) -> float:
+        """Jump forward by a duration."""
+        return self.sleep_until(self._now + seconds, label, interrupt)
+
+
+@contextmanager
+def timer_resolution(ms: int = 1):
+    """Raise the OS timer resolution for the duration of the block.
+
+    On Windows this wraps timeBeginPeriod/timeEndPeriod so time.sleep can
+    wake within ~1 ms instead of the default 15.6 ms tick. Elsewhere it
+    does nothing.
+    """
+    winmm = None
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            winmm = ctypes.WinDLL("winmm")
+            winmm.timeBeginPeriod(ms)
+        except Exception:
+            winmm = None
+    try:
+        yield
+    finally:
+        if winmm is not None:
+            winmm.timeEndPeriod(ms)
@@ -1,6 +1,7 @@
 """Computer vision utilities for fishing detection."""
 
 import threading
+import time
 import numpy as np
 import cv2
 import mss
@@ -24,6 +25,100 @@ def get_thread_sct():
         sct = _thread_local.sct
     return sct
 
+class Frame:
+    """Captured screen region in BGRA layout.
+    
+    ``bgra`` is a numpy view over the screenshot's own buffer (no copy).
+    A contiguous BGR image is only produced on request, into a buffer
+    that is reused between frames of the same size.
+    """
+    
+    __slots__ = ("bgra", "timestamp", "_bgr", "_bgr_buffer")
+    
+    def __init__(self, bgra: np.ndarray, timestamp: float, bgr_buffer: np.ndarray = None):
+        """Wrap a BGRA array.
+        
+        Args:
+            bgra: (h, w, 4) uint8 array
+            timestamp: Capture time (time.perf_counter)
+            bgr_buffer: Optional preallocated (h, w, 3) buffer for bgr()
+        """
+        self.bgra = bgra
+        self.timestamp = timestamp
+        self._bgr = None
+        self._bgr_buffer = bgr_buffer
+        
+    @property
+    def width(self) -> int:
+        """Frame width in pixels."""
+        return self.bgra.shape[1]
+    
+    @property
+    def height(self) -> int:
+        """Frame height in pixels."""
+        return self.bgra.shape[0]
+    
+    def bgr(self) -> np.ndarray:
+        """Get the frame as a contiguous BGR image.
+        
+        Returns:
+            numpy.ndarray: BGR image (may be overwritten by the next grab)
+        """
+        if self._bgr is None:
+            self._bgr = cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2BGR, dst=self._bgr_buffer)
+        return self._bgr
+
+class ScreenGrabber:
+    """MSS screen grabber producing zero-copy BGRA frames."""
+    
+    def __init__(self):
+        self.sct = None
+        self._bgr_buffer = None
+        
+    def grab(self, roi) -> Frame:
+        """Capture screen region.
+        
+        Args:
+            roi: ROI object with to_monitor() method
+            
+        Returns:
+            Frame: Captured frame
+        """
+        if self.sct is None:
+            self.sct = mss.mss()
+        shot = self.sct.grab(roi.to_monitor())
+        ts = time.perf_counter()
+        h, w = shot.height, shot.width
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(h, w, 4)
+        # BGR conversion buffer carries over while the ROI size is unchanged
+        if self._bgr_buffer is None or self._bgr_buffer.shape[:2] != (h, w):
+            self._bgr_buffer = np.empty((h, w, 3), dtype=np.uint8)
+        return Frame(bgra, ts, self._bgr_buffer)
+    
+    def close(self):
+        """Release the MSS instance."""
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+
+def get_thread_grabber() -> ScreenGrabber:
+    """Get thread-local screen grabber."""
+    grabber = getattr(_thread_local, "grabber", None)
+    if grabber is None:
+        grabber = _thread_local.grabber = ScreenGrabber()
+    return grabber
+
+def grab_frame(roi) -> Frame:
+    """Capture screen region as a BGRA Frame (no copy).
+    
+    Args:
+        roi: ROI object with to_monitor() method
+        
+    Returns:
+        Frame: Captured frame
+    """
+    return get_thread_grabber().grab(roi)
+
 def grab_bgr(roi):
     """Capture screen region as BGR numpy array.
     
@@ -31,24 +126,24 @@ def grab_bgr(roi):
         roi: ROI object with to_monitor() method
         
     Returns:
-        numpy.ndarray: BGR image
+        numpy.ndarray: Contiguous BGR image, reused by the next grab of the
+        same size in this thread
     """
-    mon = roi.to_monitor()
-    sct = get_thread_sct()
-    img = np.array(sct.grab(mon))
-    return img[:, :, :3]  # Remove alpha channel
+    return grab_frame(roi).bgr()
 
 def calc_color_ratios(frame_bgr: np.ndarray) -> tuple[float, float]:
     """Calculate green and red color ratios in frame.
     
     Args:
-        frame_bgr: BGR image as numpy array
+        frame_bgr: BGR (or BGRA) image as numpy array
         
     Returns:
         tuple: (green_ratio, red_ratio)
     """
     if frame_bgr.size == 0:
         return 0.0, 0.0
+    if frame_bgr.shape[2] == 4:
+        frame_bgr = cv2.cvtColor(frame_bgr, cv2.COLOR_BGRA2BGR)
         
     hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
     
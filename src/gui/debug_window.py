@@ -0,0 +1,200 @@
+"""OpenCV debug window showing the engine's view of the ROI (loaded on first use)."""
+
+import time
+
+import numpy as np
+import cv2
+
+from ..core.classifier import CLASS_GREEN, CLASS_RED, select_classifier
+from ..core.tap import FrameTap
+
+# Refresh cap when the config has no "debug_fps"
+DEFAULT_DEBUG_FPS = 15.0
+
+# Height of the per-column projection strip (green up, red down)
+PROJECTION_H = 48
+MASK_ALPHA = 0.6
+MIN_WIDTH = 480
+LINE_H = 16
+
+# Tint per class value (other, green, red, both) in BGR
+_PALETTE = np.array([[0, 0, 0], [0, 255, 0], [0, 0, 255], [0, 255, 255]], dtype=np.uint8)
+
+
+class DebugRenderer:
+    """Composes the debug image into buffers reused between frames.
+
+    Layout, top to bottom: the ROI (optionally tinted by its green/red
+    class map), a strip with the fraction of green (upwards) and red
+    (downwards) pixels in every column, and a text panel.
+    """
+
+    def __init__(self):
+        self.show_masks = True
+        self.show_projection = True
+        self.show_stats = True
+        self._canvas = None
+        self._tint = None
+        self._bits = None
+
+    def _layout(self, h: int, w: int, lines: int):
+        proj_h = PROJECTION_H if self.show_projection else 0
+        text_h = LINE_H * lines + 6 if lines else 0
+        shape = (h + proj_h + text_h, max(w, MIN_WIDTH), 3)
+        if self._canvas is None or self._canvas.shape != shape:
+            self._canvas = np.empty(shape, dtype=np.uint8)
+        if self._tint is None or self._tint.shape[:2] != (h, w):
+            self._tint = np.empty((h, w, 3), dtype=np.uint8)
+            self._bits = np.empty((h, w), dtype=np.uint8)
+        return proj_h
+
+    def column_fractions(self, classes: np.ndarray):
+        """Fraction of green and red pixels per column.
+
+        Returns:
+            tuple: (green, red) float arrays of length w
+        """
+        h = classes.shape[0]
+        np.bitwise_and(classes, CLASS_GREEN, out=self._bits)
+        green = cv2.reduce(self._bits, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] / float(h)
+        np.bitwise_and(classes, CLASS_RED, out=self._bits)
+        red = cv2.reduce(self._bits, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] / float(h * CLASS_RED)
+        return green, red
+
+    def render(self, bgra: np.ndarray, classes: np.ndarray, lines=()) -> np.ndarray:
+        """Draw one debug image.
+
+        Args:
+            bgra: ROI frame (h, w, 4)
+            classes: Class map of the frame (h, w)
+            lines: Text lines for the panel
+
+        Returns:
+            numpy.ndarray: BGR image (reused by the next call)
+        """
+        h, w = bgra.shape[:2]
+        lines = list(lines) if self.show_stats else []
+        proj_h = self._layout(h, w, len(lines))
+        canvas = self._canvas
+        canvas[:] = 24
+
+        roi = canvas[:h, :w]
+        roi[:] = bgra[:, :, :3]
+        if self.show_masks:
+            np.take(_PALETTE, classes, axis=0, out=self._tint)
+            cv2.addWeighted(roi, 1.0, self._tint, MASK_ALPHA, 0.0, dst=roi)
+
+        if proj_h:
+            green, red = self.column_fractions(classes)
+            half = proj_h // 2
+            strip = canvas[h:h + proj_h, :w]
+            strip[half, :] = 80
+            rows = np.arange(half)[:, None]
+            # Bars grow away from the middle line
+            strip[:half][rows >= half - np.rint(green * half)] = _PALETTE[CLASS_GREEN]
+            strip[half + 1:][rows[:proj_h - half - 1] < np.rint(red * (proj_h - half - 1))] = \
+                _PALETTE[CLASS_RED]
+
+        y = h + proj_h + LINE_H
+        for line in lines:
+            cv2.putText(canvas, line, (6, y - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.42,
+                        (235, 235, 235), 1, cv2.LINE_AA)
+            y += LINE_H
+        return canvas
+
+
+def stats_lines(engine, green: float, red: float, view_fps: float, fps_cap: float) -> list:
+    """Engine loop statistics for the text panel."""
+    state = engine.states.state.value if engine.states.state else "stopped"
+    lines = [f"G={green:.3f}  R={red:.3f}  {state}"]
+    metrics = engine.metrics
+    if metrics is not None and engine.running:
+        lines.append(f"engine {metrics.fps:.0f} fps  iter {metrics.iterations}  "
+                     f"clicks {metrics.clicks}")
+        lines.append("  ".join(
+            f"{name} {metrics.stages[name].percentile(50) * 1000:.2f}/"
+            f"{metrics.stages[name].percentile(99) * 1000:.2f}"
+            for name in ("capture", "classify", "decide", "sleep")) + "  ms p50/p99")
+    lines.append(f"view {view_fps:.0f}/{fps_cap:.0f} fps   [m] mask  [p] proj  [s] stats  [ESC]")
+    return lines
+
+
+def run_debug_window(app, fps: float = None):
+    """Show the ROI as the engine sees it until ESC or ``app.debug_open`` is cleared.
+
+    While the engine runs, frames and class maps come from a FrameTap it
+    fills, so nothing is captured or classified twice. While it is
+    stopped, frames come from the shared capture service and are
+    classified here.
+
+    Args:
+        app: Main application (provides engine, capture, roi, config and debug_open)
+        fps: Refresh cap (defaults to ``config["debug_fps"]``)
+    """
+    if fps is None:
+        fps = float(app.config.get("debug_fps", DEFAULT_DEBUG_FPS))
+    fps = max(1.0, fps)
+    period = 1.0 / fps
+    engine = app.engine
+
+    # Create window and set it to stay on top
+    window_name = "ROI Debug (ESC to close)"
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
+
+    tap = FrameTap(max_hz=fps)
+    engine.tap = tap
+    sub = app.capture.subscribe(max_hz=fps, name="debug")
+    renderer = DebugRenderer()
+    classifier = None
+    seq = 0
+    view_fps = 0.0
+    last_shown = None
+    next_t = time.perf_counter()
+    try:
+        while app.debug_open:
+            item = None
+            sub.active = not engine.running
+            if engine.running:
+                latest = tap.latest
+                if latest is not None and latest.seq != seq:
+                    seq = latest.seq
+                    item = (latest.bgra, latest.classes, latest.green, latest.red)
+            else:
+                frame = sub.poll(app.roi)
+                if frame is not None:
+                    settings = engine.settings
+                    classifier = select_classifier(settings.classifier, settings.thresholds,
+                                                   classifier)
+                    g, r = classifier.ratios(frame.bgra)
+                    item = (frame.bgra, classifier.last_classes, g, r)
+
+            if item is not None:
+                bgra, classes, g, r = item
+                now = time.perf_counter()
+                if last_shown is not None:
+                    view_fps += ((1.0 / max(now - last_shown, 1e-6)) - view_fps) / 8.0
+                last_shown = now
+                image = renderer.render(bgra, classes, stats_lines(engine, g, r, view_fps, fps))
+                cv2.imshow(window_name, image)
+
+            # waitKey doubles as the frame-rate limiter
+            next_t = max(next_t + period, time.perf_counter())
+            delay = max(1, int((next_t - time.perf_counter()) * 1000))
+            key = cv2.waitKey(delay) & 0xFF
+            if key == 27:
+                app.debug_open = False
+            elif key == ord("m"):
+                renderer.show_masks = not renderer.show_masks
+            elif key == ord("p"):
+                renderer.show_projection = not renderer.show_projection
+            elif key == ord("s"):
+                renderer.show_stats = not renderer.show_stats
+    except Exception as e:
+        print(f"Debug window error: {e}")
+        app.debug_open = False
+    finally:
+        if engine.tap is tap:
+            engine.tap = None
+        sub.close()
+        cv2.destroyAllWindows()
@@ -1,24 +1,24 @@
 """Main application window."""
 
+import os
 import time
 import threading
 import re
 import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
-import cv2
-import numpy as np
 
+from ..core.capture import CaptureService
 from ..core.engine import FishingEngine
-from ..core.vision import grab_bgr
+from ..core.regions import RegionSet
+from ..core.sources import MssFrameSource
+from ..core.telemetry import format_action
 from ..utils.config import ConfigManager
 from ..utils.screen import make_default_roi, clamp_roi
-from ..utils.updater import AutoUpdater
-from ..utils.auto_pause import AutoPauseMonitor
-from ..utils.system_tray import SystemTrayManager
 from ..version import __version__
 from .pages import HomePage, SettingsPage, KeybindsPage, CreditPage
 from .simple_window import SimpleWindow
+from .preview import PreviewRenderer
 
 # Windows DPI awareness
 try:
@@ -27,13 +27,6 @@ try:
 except Exception:
     pass
 
-# Optional PIL for preview
-HAVE_PIL = True
-try:
-    from PIL import Image
-except Exception:
-    HAVE_PIL = False
-
 # Optional keyboard for global hotkeys
 HAVE_KB = True
 try:
@@ -70,40 +63,34 @@ class App(ctk.CTk):
         self.config_manager = ConfigManager("config/settings.json")
         self.config = self.config_manager.load()
         
-        # Auto-updater
-        self.updater = AutoUpdater(__version__, GITHUB_REPO)
+        # Auto-updater, auto-pause and tray are created on first use (see properties)
+        self._updater = None
+        self._auto_pause_monitor = None
+        self._tray_manager = None
         
         # State
         self.roi = make_default_roi()
+        # Regions of the current run (bar plus config extras)
+        self.regions = RegionSet.from_config(self.config, self.roi)
         self.running = False
         self.debug_open = False
         self.worker = None
-        self._preview_img = None
         self._tk_bound_pattern = None
         self._roi_tk_pattern = None
         
-        # Engine
-        self.engine = FishingEngine(self.config)
-        self.engine.set_callback("on_green_ratio", self._on_green_ratio)
-        self.engine.set_callback("on_red_ratio", self._on_red_ratio)
-        self.engine.set_callback("on_action", self._on_action)
-        
-        # Auto-pause monitor
-        self.auto_pause_monitor = AutoPauseMonitor(
-            pause_callback=self._on_auto_pause,
-            resume_callback=self._on_auto_resume
-        )
-        
-        # System tray manager
-        self.tray_manager = SystemTrayManager(self)
+        # Engine owns the only screen grabber; preview and debug window
+        # subscribe to decimated copies of its frames
+        self.capture = CaptureService(MssFrameSource())
+        self.engine = FishingEngine(self.config, source=self.capture)
+        self.engine.metrics_dir = self.config_manager.resolve_path(self.engine.metrics_dir)
+        self._preview_sub = self.capture.subscribe(max_hz=8.0, name="preview")
+        self._telemetry_seq = -1
         
         # Simple mode
         self.simple_window = None
         self.is_simple_mode = False
         
         # UI Variables
-        self.var_g = tk.DoubleVar(value=0.0)
-        self.var_r = tk.DoubleVar(value=0.0)
         self.var_act = tk.StringVar(value="Idle")
         self.var_status = tk.StringVar(value="Stopped")
         
@@ -140,12 +127,19 @@ class App(ctk.CTk):
         self.var_key = tk.StringVar(value=self.config.get("key", "F1"))
         self.var_roi_key = tk.StringVar(value=self.config.get("roi_key", "F2"))
         
+        # Profiler
+        self.var_profile_mode = tk.StringVar(value="sample")
+        self.var_profile_s = tk.DoubleVar(value=10.0)
+        self.var_profile_status = tk.StringVar(value="")
+        
         # Build UI
         self._build_ui()
+        self.preview = PreviewRenderer(self.page_home.preview, self._preview_sub)
         self._bind_hotkey(self.var_key.get())
         
         # Bind F2 for drag-select ROI (or custom key)
         self._bind_roi_hotkey(self.var_roi_key.get())
+        self._bind_profile_hotkey(self.config.get("profile_key", "F3"))
         
         # Handle window close
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -251,19 +245,41 @@ class App(ctk.CTk):
         if name in pages:
             pages[name].pack(fill="both", expand=True, padx=12, pady=12)
             
-    # ==================== Engine Callbacks ====================
+    # ==================== Lazy Services ====================
     
-    def _on_green_ratio(self, ratio: float):
-        """Callback for green ratio update."""
-        self.var_g.set(ratio)
-        
-    def _on_red_ratio(self, ratio: float):
-        """Callback for red ratio update."""
-        self.var_r.set(ratio)
-        
-    def _on_action(self, action: str):
-        """Callback for action update."""
-        self.var_act.set(action)
+    @property
+    def updater(self):
+        """Auto-updater (imports requests on first use)."""
+        if self._updater is None:
+            from ..utils.updater import AutoUpdater
+            self._updater = AutoUpdater(__version__, GITHUB_REPO)
+        return self._updater
+    
+    @property
+    def auto_pause_monitor(self):
+        """Auto-pause monitor (imports pynput/pywin32 on first use)."""
+        if self._auto_pause_monitor is None:
+            from ..utils.auto_pause import AutoPauseMonitor
+            self._auto_pause_monitor = AutoPauseMonitor(
+                pause_callback=self._on_auto_pause,
+                resume_callback=self._on_auto_resume
+            )
+        return self._auto_pause_monitor
+    
+    @property
+    def tray_manager(self):
+        """System tray manager (imports pystray on first use)."""
+        if self._tray_manager is None:
+            from ..utils.system_tray import SystemTrayManager
+            self._tray_manager = SystemTrayManager(self)
+        return self._tray_manager
+        
+    def _stop_auto_pause(self):
+        """Stop the auto-pause monitor if it was ever started."""
+        if self._auto_pause_monitor is not None and self._auto_pause_monitor.is_running:
+            self._auto_pause_monitor.stop()
+    
+    # ==================== Engine Callbacks ====================
     
     def _on_auto_pause(self):
         """Callback when auto-pause triggers."""
@@ -282,6 +298,10 @@ class App(ctk.CTk):
     def toggle_start(self):
         """Toggle macro start/stop."""
         if not self.running:
+            # Quick Stop -> Start: the previous run must exit first
+            if not self._join_worker(2.0):
+                self.var_status.set("Masih berhenti, coba lagi")
+                return
             self.running = True
             self.engine.start()
             self._update_button_text()
@@ -295,6 +315,10 @@ class App(ctk.CTk):
                 self.auto_pause_monitor.set_resume_delay(self.var_auto_pause_resume_delay.get())
                 self.auto_pause_monitor.start()
             
+            self.regions = regions = RegionSet.from_config(self.config, self.roi)
+            # Preview shows the bar only, not the union of all regions
+            self._preview_sub.view = lambda frame: regions.view(frame, regions.primary)
+            
             self.worker = threading.Thread(target=self._run_engine, daemon=True)
             self.worker.start()
         else:
@@ -302,14 +326,28 @@ class App(ctk.CTk):
             self.engine.stop()
             
             # Stop auto-pause monitor
-            if self.auto_pause_monitor.is_running:
-                self.auto_pause_monitor.stop()
+            self._stop_auto_pause()
             self._update_button_text()
             self.var_status.set("Stopped")
             
+    def _join_worker(self, timeout: float) -> bool:
+        """Wait for the engine thread of the previous run to exit.
+        
+        Returns:
+            bool: False if it was still running after ``timeout`` seconds
+        """
+        if not self.engine.wait_stopped(timeout):
+            return False
+        if self.worker is not None:
+            self.worker.join(timeout)
+            if self.worker.is_alive():
+                return False
+            self.worker = None
+        return True
+        
     def _run_engine(self):
         """Run the fishing engine in a separate thread."""
-        self.engine.run(self.roi)
+        self.engine.run(self.regions)
             
     def apply_wh(self):
         """Apply width/height changes to ROI."""
@@ -409,37 +447,9 @@ class App(ctk.CTk):
         
     def _debug_window(self):
         """Show debug window with ROI overlay."""
-        from ..core.vision import calc_color_ratios
-        
-        # Create window and set it to stay on top
-        window_name = "ROI Debug (ESC to close)"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
-        
-        while self.debug_open:
-            try:
-                frame = grab_bgr(self.roi)
-                # Ensure frame is contiguous for OpenCV
-                if not frame.flags['C_CONTIGUOUS']:
-                    frame = np.ascontiguousarray(frame)
-                    
-                g, r = calc_color_ratios(frame)
-                info = f"G={g:.2f} R={r:.2f}"
-                
-                # Make a copy to ensure writability
-                display_frame = frame.copy()
-                cv2.putText(display_frame, info, (6, 18), cv2.FONT_HERSHEY_SIMPLEX, 
-                           0.6, (255,255,255), 2, cv2.LINE_AA)
-                cv2.imshow(window_name, display_frame)
-                
-                if (cv2.waitKey(1) & 0xFF) == 27:
-                    self.debug_open = False
-                    break
-            except Exception as e:
-                print(f"Debug window error: {e}")
-                self.debug_open = False
-                break
-        cv2.destroyAllWindows()
+        # OpenCV highgui is only needed here
+        from .debug_window import run_debug_window
+        run_debug_window(self)
         
     # ==================== Settings ====================
     
@@ -461,7 +471,7 @@ class App(ctk.CTk):
             "pause_on_focus_loss": self.var_pause_on_focus_loss.get(),
             "auto_pause_resume_delay": self.var_auto_pause_resume_delay.get(),
         })
-        self.engine.config = self.config
+        self.engine.publish_config(self.config)
         
     def save_settings(self):
         """Save settings to file."""
@@ -587,6 +597,49 @@ class App(ctk.CTk):
         except Exception:
             pass
             
+    def _bind_profile_hotkey(self, key: str):
+        """Bind hotkey for starting a profiling session."""
+        canonical = self._canonicalize_key(key)
+        if canonical is None:
+            return False, f"Key tidak valid: {key}"
+        
+        if HAVE_KB:
+            try:
+                keyboard.add_hotkey(canonical, lambda: self.after(0, self.start_profile))
+                return True, "OK"
+            except Exception:
+                pass
+        
+        try:
+            self.bind_all(self._tk_pattern(canonical), lambda e: self.start_profile())
+            return True, "OK"
+        except Exception as e:
+            return False, f"Gagal bind: {e}"
+            
+    def start_profile(self):
+        """Profile the running engine thread for the configured duration."""
+        if not self.running:
+            self.var_profile_status.set("Jalankan macro dulu untuk profiling")
+            return
+        output_dir = os.path.dirname(self.config_manager.config_file) or "."
+        try:
+            session = self.engine.start_profile(self.var_profile_mode.get(),
+                                                self.var_profile_s.get(), output_dir)
+        except Exception as e:
+            self.var_profile_status.set(f"Gagal: {e}")
+            return
+        self.var_profile_status.set(f"Profiling {session.duration:.0f}s ({session.mode})...")
+        self.after(500, lambda: self._poll_profile(session))
+        
+    def _poll_profile(self, session):
+        """Report the profiling result once the session has finished."""
+        if not session.finished:
+            self.after(500, lambda: self._poll_profile(session))
+        elif session.error:
+            self.var_profile_status.set(f"Gagal: {session.error}")
+        else:
+            self.var_profile_status.set(f"Tersimpan: {session.path}")
+            
     def _bind_hotkey(self, key: str):
         """Bind hotkey for start/stop."""
         canonical = self._canonicalize_key(key)
@@ -738,38 +791,46 @@ class App(ctk.CTk):
     
     def _tick_ui(self):
         """Update UI periodically."""
-        # Update progress bars
-        g = max(0.0, min(1.0, self.var_g.get()))
-        r = max(0.0, min(1.0, self.var_r.get()))
-        try:
-            self.page_home.pb_g.set_value(g)
-            self.page_home.pb_r.set_value(r)
-        except Exception:
-            pass
+        # Poll the latest engine telemetry (only redraw when it changed)
+        sample = self.engine.telemetry.read()
+        if sample.seq != self._telemetry_seq:
+            self._telemetry_seq = sample.seq
+            self.var_act.set(format_action(sample))
+            try:
+                self.page_home.pb_g.set_value(max(0.0, min(1.0, sample.green)))
+                self.page_home.pb_r.set_value(max(0.0, min(1.0, sample.red)))
+            except Exception:
+                pass
+                
+        # Loop metrics
+        if self.running and self.engine.metrics is not None:
+            try:
+                self.page_home.lbl_metrics.configure(text=self.engine.metrics.summary_line())
+            except Exception:
+                pass
             
-        # Update preview
-        if HAVE_PIL and self.running:
+        # Update preview (skipped while hidden: nothing is delivered or drawn)
+        visible = self.running and self._preview_visible()
+        self.preview.active = visible
+        if visible:
             try:
-                frame = grab_bgr(self.roi)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(rgb)
-                # Smaller preview for compact window
-                target_w = max(180, min(360, int(self.roi.w * 0.7)))
-                target_h = max(120, min(240, int(self.roi.h * 0.7)))
-                self._preview_img = ctk.CTkImage(
-                    light_image=img, 
-                    dark_image=img, 
-                    size=(target_w, target_h)
-                )
-                self.page_home.preview.configure(image=self._preview_img, text="")
+                # On-demand grabs use the union too, so the view fits them
+                self.preview.render(self.regions.union)
             except Exception:
-                self.page_home.preview.configure(
-                    text="Preview ROI (aktif saat jalan)", 
-                    image=None
-                )
+                self.preview.clear("Preview ROI (aktif saat jalan)")
                 
         self.after(120, self._tick_ui)
     
+    def _preview_visible(self) -> bool:
+        """True if the preview label can actually be seen."""
+        if self.is_simple_mode:
+            return False
+        try:
+            # Tray and simple mode withdraw the window
+            return self.state() in ("normal", "zoomed") and self.page_home.preview.winfo_ismapped()
+        except Exception:
+            return False
+    
     # ==================== Simple Mode & System Tray ====================
     
     def toggle_simple_mode(self):
@@ -821,11 +882,13 @@ class App(ctk.CTk):
         if self.running:
             self.running = False
             self.engine.stop()
-            if self.auto_pause_monitor.is_running:
-                self.auto_pause_monitor.stop()
+            self._stop_auto_pause()
+        # Settings below are then applied and saved after the run ended
+        self._join_worker(2.0)
         
         # Stop system tray
-        self.tray_manager.stop()
+        if self._tray_manager is not None:
+            self._tray_manager.stop()
         
         # Save settings
         self._update_config()
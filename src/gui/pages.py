@@ -82,7 +82,7 @@ class HomePage:
         right = ctk.CTkFrame(self.frame)
         right.grid(row=0, column=1, sticky="nsew", padx=(4,6), pady=6)
         right.grid_columnconfigure(0, weight=1)
-        right.grid_rowconfigure(3, weight=1)
+        right.grid_rowconfigure(4, weight=1)
         
         # Status header
         head = ctk.CTkFrame(right, fg_color="transparent")
@@ -105,13 +105,18 @@ class HomePage:
                                        font=ctk.CTkFont(size=13))
         self.lbl_action.grid(row=2, column=0, sticky="ew", padx=10, pady=(0,6))
         
+        # Loop metrics (fps, stage latency, clicks)
+        self.lbl_metrics = ctk.CTkLabel(right, text="", text_color="gray60",
+                                        font=ctk.CTkFont(size=10))
+        self.lbl_metrics.grid(row=3, column=0, sticky="ew", padx=10)
+        
         # Preview
         self.preview = ctk.CTkLabel(right, text="Preview ROI (aktif saat jalan)", 
                                    width=380, height=240,
                                    fg_color=("gray20","gray16"), 
                                    corner_radius=8,
                                    font=ctk.CTkFont(size=11))
-        self.preview.grid(row=3, column=0, sticky="nsew", padx=10, pady=(4,10))
+        self.preview.grid(row=4, column=0, sticky="nsew", padx=10, pady=(4,10))
         
     def pack(self, **kwargs):
         """Pack the frame."""
@@ -175,9 +180,26 @@ class SettingsPage:
         CompactSwitch(card3.content, text="Aktifkan Auto Recast", 
                      variable=self.app.var_auto_recast).pack(anchor="w", pady=(6,4))
         
+        # Profiler Card
+        card4 = Card(self.scrollable, title="Profiler", icon="🔬")
+        card4.grid(row=3, column=0, sticky="ew", padx=12, pady=8)
+        
+        SettingSlider(card4.content, "Durasi (s)", self.app.var_profile_s, 
+                     5.0, 60.0, 5.0).pack(fill="x", pady=4)
+        prof_row = ctk.CTkFrame(card4.content, fg_color="transparent")
+        prof_row.pack(fill="x", pady=(4,2))
+        ctk.CTkOptionMenu(prof_row, values=["sample", "cprofile"], 
+                         variable=self.app.var_profile_mode, width=110, 
+                         height=28).pack(side="left", padx=(0,6))
+        ActionButton(prof_row, text="🔬 Profile", 
+                    command=self.app.start_profile, width=110).pack(side="left")
+        ctk.CTkLabel(card4.content, textvariable=self.app.var_profile_status, 
+                    font=ctk.CTkFont(size=11), text_color="gray60", 
+                    wraplength=420, justify="left").pack(anchor="w", pady=(2,0))
+        
         # Preset buttons
         preset = ctk.CTkFrame(self.scrollable, fg_color="transparent")
-        preset.grid(row=3, column=0, sticky="ew", padx=12, pady=(8,12))
+        preset.grid(row=4, column=0, sticky="ew", padx=12, pady=(8,12))
         
         ActionButton(preset, text="💾 Simpan Preset", 
                     command=self.app.save_settings, width=140).pack(side="left", padx=(0,6))
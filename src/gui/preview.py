@@ -0,0 +1,93 @@
+"""ROI preview drawn into one persistent Tk PhotoImage."""
+
+import tkinter as tk
+
+import numpy as np
+import cv2
+
+
+class PreviewRenderer:
+    """Renders decimated capture frames into a label.
+
+    Each frame is downsized with INTER_AREA into a buffer sized to the
+    label (keeping the ROI aspect ratio) and converted straight into the
+    pixel area of a binary PPM image, which is loaded into the same
+    PhotoImage every time. Buffers and the PhotoImage are only recreated
+    when the target size changes; the bytes handed to Tk are the only
+    per-frame allocation.
+    """
+
+    def __init__(self, label, subscription, margin: int = 8):
+        """Initialize renderer.
+
+        Args:
+            label: Widget showing the preview (CTkLabel or tk.Label)
+            subscription: Capture subscription delivering the frames
+            margin: Pixels kept free around the image inside the label
+        """
+        self.label = label
+        self.subscription = subscription
+        self.margin = margin
+        self.photo = None
+        self.frames = 0
+        self._size = None
+        self._ppm = None
+        self._rgb = None
+        self._small = None
+
+    @property
+    def active(self) -> bool:
+        """Whether frames are delivered to the preview."""
+        return self.subscription.active
+
+    @active.setter
+    def active(self, value: bool):
+        self.subscription.active = value
+
+    def target_size(self, frame_w: int, frame_h: int) -> tuple:
+        """Largest (w, h) with the frame's aspect ratio that fits the label."""
+        box_w = max(1, self.label.winfo_width() - 2 * self.margin)
+        box_h = max(1, self.label.winfo_height() - 2 * self.margin)
+        scale = min(box_w / frame_w, box_h / frame_h, 1.0)
+        return max(1, int(frame_w * scale)), max(1, int(frame_h * scale))
+
+    def _allocate(self, w: int, h: int):
+        header = f"P6 {w} {h} 255\n".encode("ascii")
+        self._ppm = bytearray(len(header) + w * h * 3)
+        self._ppm[:len(header)] = header
+        # RGB view over the PPM pixel area, written in place by cvtColor
+        self._rgb = np.frombuffer(self._ppm, dtype=np.uint8, offset=len(header)).reshape(h, w, 3)
+        self._small = np.empty((h, w, 4), dtype=np.uint8)
+        self.photo = tk.PhotoImage(master=self.label, width=w, height=h)
+        self.label.configure(image=self.photo, text="")
+        self._size = (w, h)
+
+    def render(self, roi=None) -> bool:
+        """Draw the newest frame, if any.
+
+        Args:
+            roi: Region to capture on demand while nothing else captures
+
+        Returns:
+            bool: True if the preview was updated
+        """
+        frame = self.subscription.poll(roi)
+        if frame is None:
+            return False
+        src = frame.bgra
+        h, w = src.shape[:2]
+        size = self.target_size(w, h)
+        if size != self._size:
+            self._allocate(*size)
+        if size != (w, h):
+            src = cv2.resize(src, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(src, cv2.COLOR_BGRA2RGB, dst=self._rgb)
+        self.photo.configure(data=bytes(self._ppm), format="ppm")
+        self.frames += 1
+        return True
+
+    def clear(self, text: str = ""):
+        """Drop the image and show text instead."""
+        self.label.configure(image=None, text=text)
+        self.photo = None
+        self._size = None
@@ -0,0 +1,249 @@
+"""Cold-start import time check.
+
+Imports each entry module in a fresh interpreter with ``-X importtime``,
+keeps the fastest of several runs and compares it against a stored
+budget, so an eager import of a heavy dependency shows up as a failure.
+Independently of timing, modules that must stay lazy are looked up in the
+import list, which gives the same verdict on every machine.
+
+Usage:
+    python -m src.import_budget
+    python -m src.import_budget -n 1          # Lazy-import check only
+    python -m src.import_budget --budget import_budget.json
+    python -m src.import_budget --save-budget import_budget.json
+    python -m src.import_budget -m src.cli -n 10 --top 20
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+# Entry points measured by default (GUI and headless)
+DEFAULT_MODULES = ("src.gui.main_window", "src.cli")
+
+# Allowed slowdown before a module counts as over budget (import time is noisy)
+DEFAULT_TOLERANCE = 0.25
+
+# Modules only a feature that is switched on may import (package prefixes);
+# src.gui.debug_window is the only user of OpenCV highgui
+FORBIDDEN_MODULES = ("requests", "pystray", "pynput", "psutil", "src.gui.debug_window")
+
+# Separates interpreter startup (site, encodings) from the measured import
+_MARKER = "-- import budget --"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse ``-X importtime`` output after the marker line.
+
+    Returns:
+        list: (name, self_us, cumulative_us, depth) per imported module
+    """
+    entries = []
+    lines = stderr.splitlines()
+    if _MARKER in lines:
+        lines = lines[lines.index(_MARKER) + 1:]
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # Header line
+        raw = parts[2].rstrip()
+        name = raw.lstrip()
+        depth = (len(raw) - len(name) - 1) // 2
+        entries.append((name, self_us, cumulative_us, depth))
+    return entries
+
+
+def find_forbidden(entries, forbidden=FORBIDDEN_MODULES) -> list:
+    """Names of imported modules that should only be imported lazily.
+
+    Args:
+        entries: Output of ``parse_importtime``
+        forbidden: Module names; submodules match too
+
+    Returns:
+        list: Offending module names in import order
+    """
+    found = []
+    for name, _, _, _ in entries:
+        if any(name == module or name.startswith(module + ".") for module in forbidden):
+            found.append(name)
+    return found
+
+
+def measure_once(module: str) -> dict:
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        dict: Total import time in ms and per-module entries, or an error
+    """
+    code = (f"import sys; sys.stderr.write({_MARKER!r} + '\\n'); sys.stderr.flush(); "
+            f"import {module}")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()
+        return {"error": last[-1] if last else f"exit code {proc.returncode}"}
+    entries = parse_importtime(proc.stderr)
+    total_us = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+    return {"ms": total_us / 1000.0, "entries": entries}
+
+
+def measure(module: str, runs: int = 5, top: int = 10) -> dict:
+    """Fastest of several cold imports of a module.
+
+    Args:
+        module: Dotted module name
+        runs: Fresh interpreters to start
+        top: Heaviest imports (by self time) to keep from the fastest run
+
+    Returns:
+        dict: ``ms``, ``modules`` (count), ``forbidden`` and ``heaviest``,
+        or ``error``
+    """
+    best = None
+    for _ in range(max(1, runs)):
+        result = measure_once(module)
+        if "error" in result:
+            return result
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    heaviest = sorted(best["entries"], key=lambda e: e[1], reverse=True)[:top]
+    return {
+        "ms": round(best["ms"], 2),
+        "modules": len(best["entries"]),
+        "forbidden": find_forbidden(best["entries"]),
+        "heaviest": [{"name": name, "self_ms": round(self_us / 1000.0, 2),
+                      "cumulative_ms": round(cumulative_us / 1000.0, 2)}
+                     for name, self_us, cumulative_us, _ in heaviest],
+    }
+
+
+def run_budget(modules, runs: int = 5, top: int = 10) -> dict:
+    """Measure every entry module."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "results": {module: measure(module, runs, top) for module in modules},
+    }
+
+
+def check_forbidden(report: dict) -> list:
+    """Find entry modules that eagerly import a lazy-only dependency.
+
+    Returns:
+        list: Human-readable violations (empty if none)
+    """
+    violations = []
+    for module, result in report["results"].items():
+        if "error" in result:
+            violations.append(f"{module}: import failed ({result['error']})")
+        elif result.get("forbidden"):
+            violations.append(f"{module}: imports {', '.join(result['forbidden'])}")
+    return violations
+
+
+def compare(current: dict, budget: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Find modules whose import time went over budget.
+
+    A module that has a budget but no longer imports also counts.
+
+    Returns:
+        list: Human-readable violations (empty if none)
+    """
+    violations = []
+    for module, result in current["results"].items():
+        base = budget.get("results", {}).get(module)
+        if not base or "ms" not in base:
+            continue
+        if "error" in result:
+            violations.append(f"{module}: import failed ({result['error']})")
+        elif result["ms"] > base["ms"] * (1.0 + tolerance):
+            violations.append(f"{module}: {result['ms']:.1f} ms vs budget {base['ms']:.1f} ms")
+    return violations
+
+
+def format_report(report: dict) -> str:
+    """Render a report as plain text."""
+    lines = []
+    for module, result in report["results"].items():
+        if "error" in result:
+            lines.append(f"{module:<24} error: {result['error']}")
+            continue
+        lines.append(f"{module:<24} {result['ms']:>8.1f} ms  ({result['modules']} modules)")
+        for entry in result["heaviest"]:
+            lines.append(f"    {entry['name']:<40} self {entry['self_ms']:>7.2f} ms  "
+                         f"cumulative {entry['cumulative_ms']:>7.2f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check cold-start import time.")
+    parser.add_argument("-m", "--module", action="append",
+                        help="Module to import (repeatable, default: GUI and CLI)")
+    parser.add_argument("-n", "--runs", type=int, default=5,
+                        help="Fresh interpreters per module (fastest is kept)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Heaviest imports to list per module")
+    parser.add_argument("--budget", help="Compare against a stored JSON budget")
+    parser.add_argument("--save-budget", help="Store results as the new budget")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown (fraction) before failing")
+    args = parser.parse_args(argv)
+
+    budget = None
+    if args.budget:
+        try:
+            with open(args.budget, "r", encoding="utf-8") as f:
+                budget = json.load(f)
+        except FileNotFoundError:
+            print(f"Budget file not found: {args.budget}\n"
+                  f"Record one on this machine first with --save-budget {args.budget}")
+            return 2
+        except ValueError as e:
+            print(f"Budget file {args.budget} is not valid JSON: {e}")
+            return 2
+
+    report = run_budget(args.module or DEFAULT_MODULES, args.runs, args.top)
+    print(format_report(report))
+
+    if args.save_budget:
+        with open(args.save_budget, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    violations = check_forbidden(report)
+    if violations:
+        print("\nEager imports of lazy-only modules:")
+        for line in violations:
+            print(f"  {line}")
+        status = 1
+    else:
+        print("\nNo lazy-only modules imported at startup.")
+
+    if budget is not None:
+        violations = compare(report, budget, args.tolerance)
+        if violations:
+            print("\nOver budget:")
+            for line in violations:
+                print(f"  {line}")
+            return 1
+        print("\nWithin import budget.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
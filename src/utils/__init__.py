@@ -1,7 +1,32 @@
-"""Utility modules."""
+"""Utility modules.
 
-from .config import ConfigManager
-from .updater import AutoUpdater
-from .screen import screen_size, make_default_roi, clamp_roi
+Submodules are imported on first attribute access (PEP 562), so importing
+``src.utils.config`` does not pull in requests through the updater.
+"""
 
-__all__ = ["ConfigManager", "AutoUpdater", "screen_size", "make_default_roi", "clamp_roi"]
+import importlib
+
+_LAZY = {
+    "ConfigManager": ".config",
+    "AutoUpdater": ".updater",
+    "FocusTracker": ".focus",
+    "screen_size": ".screen",
+    "make_default_roi": ".screen",
+    "roi_for_screen": ".screen",
+    "clamp_roi": ".screen",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -2,23 +2,24 @@
 
 import time
 import threading
-import win32gui
-import win32process
-import psutil
 from pynput import keyboard
 from typing import Callable, Optional
 
+from .focus import FocusBackend, FocusTracker
+
 
 class AutoPauseMonitor:
     """Monitor for automatic pausing based on user interaction."""
     
-    def __init__(self, pause_callback: Callable, resume_callback: Callable):
+    def __init__(self, pause_callback: Callable, resume_callback: Callable,
+                 focus_backend: Optional[FocusBackend] = None):
         """
         Initialize auto-pause monitor.
         
         Args:
             pause_callback: Function to call when macro should pause
             resume_callback: Function to call when macro should resume
+            focus_backend: Foreground-window backend (platform default if None)
         """
         self.pause_callback = pause_callback
         self.resume_callback = resume_callback
@@ -34,9 +35,14 @@ class AutoPauseMonitor:
         self.resume_delay = 2.0  # seconds after last activity to resume
         self.roblox_window_title = "Roblox"  # Partial match
         
+        # Foreground window tracking (events where available, cached lookups)
+        self.focus = FocusTracker(focus_backend, title_hint=self.roblox_window_title)
+        self.focus.add_listener(self._on_focus_change)
+        
         # Threading
         self._monitor_thread: Optional[threading.Thread] = None
         self._keyboard_listener: Optional[keyboard.Listener] = None
+        self._wake = threading.Event()
         
     def start(self):
         """Start monitoring for auto-pause conditions."""
@@ -46,6 +52,8 @@ class AutoPauseMonitor:
         self.is_running = True
         self.is_paused = False
         self.last_activity_time = time.time()
+        self._wake.clear()
+        self.focus.start()
         
         # Start keyboard listener
         if self.pause_on_typing:
@@ -59,6 +67,8 @@ class AutoPauseMonitor:
     def stop(self):
         """Stop monitoring."""
         self.is_running = False
+        self._wake.set()
+        self.focus.stop()
         
         if self._keyboard_listener:
             self._keyboard_listener.stop()
@@ -73,27 +83,40 @@ class AutoPauseMonitor:
         if not self.is_running or not self.pause_on_typing:
             return
         
-        # Check if Roblox window is focused
-        if self._is_roblox_focused():
+        # Check if Roblox window is focused (cached, no per-key window queries)
+        if self.focus.is_target_focused():
             # User is typing in game
             self._trigger_pause("Typing detected")
             self.last_activity_time = time.time()
     
+    def _on_focus_change(self, focused: bool, info):
+        """Game window gained or lost focus (called by the focus tracker)."""
+        if not self.is_running:
+            return
+        if not focused and self.pause_on_focus_loss:
+            self._trigger_pause("Game window lost focus")
+        # Re-evaluate the resume timer right away
+        self._wake.set()
+    
     def _monitor_loop(self):
-        """Main monitoring loop."""
+        """Main monitoring loop (sleeps until the resume is due or focus changes)."""
         while self.is_running:
             try:
-                # Check window focus
-                if self.pause_on_focus_loss and not self._is_roblox_focused():
+                timeout = 0.5
+                if self.pause_on_focus_loss and not self.focus.focused:
                     if not self.is_paused:
                         self._trigger_pause("Game window lost focus")
                 else:
                     # Check if enough time has passed since last activity
                     time_since_activity = time.time() - self.last_activity_time
-                    if self.is_paused and time_since_activity >= self.resume_delay:
-                        self._trigger_resume("Activity resumed")
+                    if self.is_paused:
+                        if time_since_activity >= self.resume_delay:
+                            self._trigger_resume("Activity resumed")
+                        else:
+                            timeout = self.resume_delay - time_since_activity
                 
-                time.sleep(0.5)  # Check every 500ms
+                self._wake.wait(timeout)
+                self._wake.clear()
                 
             except Exception as e:
                 print(f"AutoPauseMonitor error: {e}")
@@ -101,31 +124,7 @@ class AutoPauseMonitor:
     
     def _is_roblox_focused(self) -> bool:
         """Check if Roblox window is currently focused."""
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd == 0:
-                return False
-            
-            # Get window title
-            title = win32gui.GetWindowText(hwnd)
-            
-            # Check if it's Roblox
-            if self.roblox_window_title.lower() in title.lower():
-                return True
-            
-            # Alternative: Check process name
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            try:
-                process = psutil.Process(pid)
-                if "roblox" in process.name().lower():
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-            
-            return False
-            
-        except Exception:
-            return False
+        return self.focus.is_target_focused()
     
     def _trigger_pause(self, reason: str):
         """Trigger pause if not already paused."""
@@ -167,6 +166,7 @@ class AutoPauseMonitor:
     def manual_resume(self):
         """Manually resume (reset activity timer)."""
         self.last_activity_time = 0  # Force resume on next check
+        self._wake.set()
 
 
 # Example usage
@@ -7,17 +7,31 @@ from typing import Dict, Any
 # Default configuration values
 DEFAULT_CONFIG = {
     "roi": {"x": 0, "y": 0, "w": 526, "h": 70},
+    # Extra regions captured with the bar in one grab, e.g.
+    # {"popup": {"x": 0, "y": 80, "w": 200, "h": 40, "green_th": 0.2}};
+    # threshold keys (green_th, red_th, active_min_ratio, hsv) default to the bar's
+    "regions": {},
     "green_th": 0.14,
     "red_th": 0.10,
     "click_i": 0.035,
     "idle_i": 0.010,
+    "active_i": 0.002,       # Poll interval while the mini-game is active
+    "idle_max_i": 0.10,      # Max poll interval while waiting (exponential back-off)
+    "idle_backoff": 2.0,
+    "spin_s": 0.0015,        # Busy-wait budget before click/loop deadlines
     "hold_s": 3.0,
     "down_s": 0.01,
     "inactive_to": 1.2,
     "recast_delay": 0.30,
     "auto_recast": True,
     "active_min_ratio": 0.03,
+    "classifier": "lut",  # "lut" (lookup table) or "hsv" (cvtColor + inRange)
+    "input_backend": "pyautogui",  # "pyautogui", "direct" (SendInput / XTest) or "mock"
+    "metrics": True,         # Per-stage loop latency histograms
+    "metrics_dir": ".",      # metrics.json / metrics.csv on stop (relative to this file)
+    "debug_fps": 15.0,       # Debug window refresh cap
     "key": "F1",
+    "profile_key": "F3",  # Start a profiling session of the engine thread
     # Auto-pause settings
     "auto_pause_enabled": False,
     "pause_on_typing": True,
@@ -48,8 +62,7 @@ class ConfigManager:
             
         try:
             with open(self.config_file, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-                self.config.update(loaded)
+                self.config.update(json.load(f))
         except Exception as e:
             print(f"Failed to load config: {e}")
             
@@ -78,6 +91,20 @@ class ConfigManager:
             print(f"Failed to save config: {e}")
             return False
             
+    def resolve_path(self, path: str) -> str:
+        """Resolve a path from the config against the config file's folder.
+        
+        Args:
+            path: Path as stored in the config
+            
+        Returns:
+            str: ``path`` joined to the config file's directory, unchanged
+            if it is empty or absolute
+        """
+        if not path or os.path.isabs(path):
+            return path
+        return os.path.normpath(os.path.join(os.path.dirname(self.config_file), path))
+        
     def get(self, key: str, default=None):
         """Get configuration value.
         
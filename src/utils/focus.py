@@ -0,0 +1,609 @@
+"""Foreground-window tracking with cached game-window detection."""
+
+import importlib.util
+import os
+import select
+import sys
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+WindowInfo = namedtuple("WindowInfo", "handle pid title process")
+
+
+class FocusBackend:
+    """Platform hooks for foreground-window and process queries.
+
+    The base class knows no windows (nothing is ever in front). Backends
+    that can deliver foreground-change events implement ``watch()`` and
+    set ``supports_events``; the others are polled.
+    """
+
+    name = "none"
+    supports_events = False
+
+    def foreground(self) -> Optional[int]:
+        """Handle of the foreground window (None if unknown)."""
+        return None
+
+    def window_pid(self, handle: int) -> Optional[int]:
+        """Process id owning a window."""
+        return None
+
+    def window_title(self, handle: int) -> str:
+        """Title of a window."""
+        return ""
+
+    def process_name(self, pid: int) -> str:
+        """Executable name of a process."""
+        try:
+            import psutil
+            return psutil.Process(pid).name()
+        except Exception:
+            return ""
+
+    def watch(self, callback: Callable[[Optional[int]], None],
+              lost: Optional[Callable[[], None]] = None) -> bool:
+        """Call ``callback(handle)`` on every foreground change.
+
+        Args:
+            callback: Receives the new foreground handle
+            lost: Called if events stop without unwatch() (watcher died)
+
+        Returns:
+            bool: False if the platform offers no such events
+        """
+        return False
+
+    def unwatch(self):
+        """Stop delivering foreground-change events."""
+
+    def close(self):
+        """Release platform resources."""
+        self.unwatch()
+
+
+class FakeFocusBackend(FocusBackend):
+    """Scriptable backend for tests.
+
+    Windows and processes are plain dicts; ``set_foreground()`` switches
+    the active window and, if watched, fires the change event, and
+    ``kill_watcher()`` stops events the way a crashed watcher would.
+    ``calls`` counts every query so tests can check what the cache avoided.
+    """
+
+    name = "fake"
+
+    def __init__(self, events: bool = True):
+        """Initialize fake backend.
+
+        Args:
+            events: Deliver change events (False forces polling)
+        """
+        self.supports_events = events
+        self.windows = {}    # handle -> (pid, title)
+        self.processes = {}  # pid -> name
+        self.active = None
+        self.calls = {"foreground": 0, "window_pid": 0, "window_title": 0, "process_name": 0}
+        self._callback = None
+        self._lost = None
+
+    def add_window(self, handle: int, pid: int, title: str, process: str = ""):
+        """Register a window and its owning process."""
+        self.windows[handle] = (pid, title)
+        if process:
+            self.processes[pid] = process
+
+    def set_foreground(self, handle: Optional[int]):
+        """Bring a window to the front (fires the change event)."""
+        self.active = handle
+        if self._callback is not None:
+            self._callback(handle)
+
+    def kill_watcher(self):
+        """Stop delivering events without unwatch() (reports ``lost``)."""
+        lost = self._lost
+        self._callback = self._lost = None
+        if lost is not None:
+            lost()
+
+    def foreground(self) -> Optional[int]:
+        self.calls["foreground"] += 1
+        return self.active
+
+    def window_pid(self, handle: int) -> Optional[int]:
+        self.calls["window_pid"] += 1
+        entry = self.windows.get(handle)
+        return entry[0] if entry else None
+
+    def window_title(self, handle: int) -> str:
+        self.calls["window_title"] += 1
+        entry = self.windows.get(handle)
+        return entry[1] if entry else ""
+
+    def process_name(self, pid: int) -> str:
+        self.calls["process_name"] += 1
+        return self.processes.get(pid, "")
+
+    def watch(self, callback, lost=None) -> bool:
+        if not self.supports_events:
+            return False
+        self._callback = callback
+        self._lost = lost
+        return True
+
+    def unwatch(self):
+        self._callback = self._lost = None
+
+
+class Win32FocusBackend(FocusBackend):
+    """Windows: pywin32 queries plus a WinEvent hook for foreground changes.
+
+    ``SetWinEventHook(EVENT_SYSTEM_FOREGROUND)`` runs out of context on a
+    dedicated thread with its own message loop, so no polling is needed.
+    """
+
+    name = "win32"
+    supports_events = True
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        import win32gui
+        import win32process
+        self._win32gui = win32gui
+        self._win32process = win32process
+        self._thread = None
+        self._thread_id = None
+        self._callback = None
+        self._lost = None
+        self._hook_proc = None
+
+    def foreground(self) -> Optional[int]:
+        return self._win32gui.GetForegroundWindow() or None
+
+    def window_pid(self, handle: int) -> Optional[int]:
+        _, pid = self._win32process.GetWindowThreadProcessId(handle)
+        return pid or None
+
+    def window_title(self, handle: int) -> str:
+        return self._win32gui.GetWindowText(handle)
+
+    def watch(self, callback, lost=None) -> bool:
+        self._callback = callback
+        self._lost = lost
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._hook_loop, args=(ready,),
+                                        name="focus-hook", daemon=True)
+        self._thread.start()
+        ready.wait(2.0)
+        return self._thread_id is not None
+
+    def _hook_loop(self, ready: threading.Event):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                       wintypes.LONG, wintypes.LONG, wintypes.DWORD,
+                                       wintypes.DWORD)
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            callback = self._callback
+            if callback is not None:
+                try:
+                    callback(hwnd or None)
+                except Exception:
+                    pass
+
+        # Keep a reference: the hook must outlive this frame's locals
+        self._hook_proc = proc_type(on_event)
+        hook = user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+                                      0, self._hook_proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+        if not hook:
+            self._thread = None
+            ready.set()
+            return
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        ready.set()
+        msg = wintypes.MSG()
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWinEvent(hook)
+            self._thread_id = None
+        # unwatch() clears the callbacks before it posts WM_QUIT
+        lost = self._lost
+        if lost is not None:
+            lost()
+
+    def unwatch(self):
+        self._callback = self._lost = None
+        if self._thread is not None:
+            if self._thread_id is not None:
+                import ctypes
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+            self._thread.join(1.0)
+            self._thread = None
+
+
+class X11FocusBackend(FocusBackend):
+    """X11: ``_NET_ACTIVE_WINDOW`` on the root window, via python-xlib.
+
+    Foreground changes arrive as PropertyNotify events on a second display
+    connection owned by a watcher thread, which blocks in ``select()`` on
+    the X socket and a wake-up pipe; nothing is polled. Works with any
+    EWMH window manager, including under Xvfb, and with Wine/Proton
+    windows (``_NET_WM_PID`` is the Wine process running the game).
+    """
+
+    name = "x11"
+    supports_events = True
+
+    def __init__(self, display_name: Optional[str] = None):
+        """Initialize X11 backend.
+
+        Args:
+            display_name: X display (defaults to $DISPLAY)
+        """
+        from Xlib import X, display
+        self._X = X
+        self._display_name = display_name
+        self._display = display.Display(display_name)
+        self._root = self._display.screen().root
+        self._atoms = {name: self._display.intern_atom(name) for name in (
+            "_NET_ACTIVE_WINDOW", "_NET_WM_PID", "_NET_WM_NAME", "UTF8_STRING")}
+        # Xlib connections are not thread-safe: queries share this one
+        self._lock = threading.Lock()
+        self._thread = None
+        self._callback = None
+        self._lost = None
+        self._pipe = None
+        # Guards _thread/_pipe between unwatch() and a dying watcher
+        self._watch_lock = threading.Lock()
+
+    def _active_window(self, root) -> Optional[int]:
+        prop = root.get_full_property(self._atoms["_NET_ACTIVE_WINDOW"], self._X.AnyPropertyType)
+        if prop is None or not len(prop.value):
+            return None
+        return int(prop.value[0]) or None
+
+    def foreground(self) -> Optional[int]:
+        with self._lock:
+            try:
+                return self._active_window(self._root)
+            except Exception:
+                return None
+
+    def window_pid(self, handle: int) -> Optional[int]:
+        with self._lock:
+            try:
+                window = self._display.create_resource_object("window", handle)
+                prop = window.get_full_property(self._atoms["_NET_WM_PID"], self._X.AnyPropertyType)
+            except Exception:
+                return None
+        if prop is None or not len(prop.value):
+            return None
+        return int(prop.value[0]) or None
+
+    def window_title(self, handle: int) -> str:
+        with self._lock:
+            try:
+                window = self._display.create_resource_object("window", handle)
+                prop = window.get_full_property(self._atoms["_NET_WM_NAME"],
+                                                self._atoms["UTF8_STRING"])
+                title = prop.value if prop is not None else window.get_wm_name()
+            except Exception:
+                return ""
+        if isinstance(title, bytes):
+            title = title.decode("utf-8", "replace")
+        return title or ""
+
+    def watch(self, callback, lost=None) -> bool:
+        self._callback = callback
+        self._lost = lost
+        with self._watch_lock:
+            if self._thread is not None:
+                return True
+            try:
+                from Xlib import display
+                events = display.Display(self._display_name)
+            except Exception:
+                return False
+            self._pipe = os.pipe()
+            self._thread = threading.Thread(target=self._event_loop, args=(events,),
+                                            name="focus-x11", daemon=True)
+            self._thread.start()
+        return True
+
+    def _event_loop(self, events):
+        X = self._X
+        active = self._atoms["_NET_ACTIVE_WINDOW"]
+        wake_fd = self._pipe[0]
+        root = events.screen().root
+        try:
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+            events.flush()
+            while True:
+                changed = False
+                while events.pending_events():
+                    event = events.next_event()
+                    if event.type == X.PropertyNotify and event.atom == active:
+                        changed = True
+                if changed:
+                    callback = self._callback
+                    if callback is not None:
+                        try:
+                            callback(self._active_window(root))
+                        except Exception:
+                            pass
+                ready, _, _ = select.select([events, wake_fd], [], [])
+                if wake_fd in ready:
+                    return
+        except Exception as e:
+            print(f"X11 focus watcher error: {e}")
+        finally:
+            try:
+                events.close()
+            except Exception:
+                pass
+        # Died on its own: detach so watch() can start a new watcher,
+        # unless unwatch() already took over the thread and pipe
+        with self._watch_lock:
+            pipe = self._pipe if self._thread is threading.current_thread() else None
+            if pipe is not None:
+                self._thread = self._pipe = None
+        if pipe is not None:
+            for fd in pipe:
+                os.close(fd)
+            lost = self._lost
+            if lost is not None:
+                lost()
+
+    def unwatch(self):
+        self._callback = self._lost = None
+        with self._watch_lock:
+            thread, pipe = self._thread, self._pipe
+            self._thread = self._pipe = None
+        if thread is not None:
+            os.write(pipe[1], b"x")
+            thread.join(1.0)
+            for fd in pipe:
+                os.close(fd)
+
+    def close(self):
+        self.unwatch()
+        try:
+            self._display.close()
+        except Exception:
+            pass
+
+
+def _select_backend():
+    """Pick the backend class for this platform (run once, at import)."""
+    if sys.platform == "win32":
+        if importlib.util.find_spec("win32gui") is not None:
+            return Win32FocusBackend
+    elif os.environ.get("DISPLAY"):
+        if importlib.util.find_spec("Xlib") is not None:
+            return X11FocusBackend
+    return FocusBackend
+
+
+# Backend class for this platform, chosen when the module is imported
+PlatformFocusBackend = _select_backend()
+
+
+def default_backend() -> FocusBackend:
+    """Instance of the platform backend (a no-op one if it fails to start)."""
+    try:
+        return PlatformFocusBackend()
+    except Exception:
+        return FocusBackend()
+
+
+class FocusTracker:
+    """Tracks the foreground window and whether it belongs to the game.
+
+    Foreground changes arrive as backend events where available;
+    otherwise (or once the backend's watcher dies) a thread polls,
+    starting at ``min_poll`` after a change and backing off to
+    ``max_poll`` while nothing changes. The game check (title and
+    process name) is cached per window handle for ``ttl`` seconds, so
+    ``is_target_focused()`` costs a dict lookup, plus one foreground
+    query when events are not available. When an entry expires the
+    owning pid is read again, so a handle reused by another process is
+    caught within ``ttl``.
+    """
+
+    def __init__(self, backend: Optional[FocusBackend] = None, title_hint: str = "Roblox",
+                 process_hint: str = "roblox", ttl: float = 30.0, min_poll: float = 0.1,
+                 max_poll: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize focus tracker.
+
+        Args:
+            backend: Platform backend (defaults to default_backend())
+            title_hint: Case-insensitive part of the game window title
+            process_hint: Case-insensitive part of the game process name
+            ttl: Seconds a cached window classification stays valid
+            min_poll: Polling interval right after a change (no events)
+            max_poll: Longest polling interval while nothing changes
+            clock: Time function for cache expiry
+        """
+        self.backend = backend or default_backend()
+        self.title_hint = title_hint.lower()
+        self.process_hint = process_hint.lower()
+        self.ttl = ttl
+        self.min_poll = min_poll
+        self.max_poll = max(min_poll, max_poll)
+        self.clock = clock
+        self.handle = None
+        self.info = None
+        self.focused = False
+        self._valid = False
+        self._expires = 0.0
+        self.changes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = {}  # handle -> (is_target, WindowInfo, expires_at)
+        self._listeners = []
+        self._events = False
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+        # Serializes start/stop with the fallback from events to polling
+        self._mode_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @property
+    def event_driven(self) -> bool:
+        """True if foreground changes arrive as events (no polling)."""
+        return self._events
+
+    def add_listener(self, callback: Callable[[bool, Optional[WindowInfo]], None]):
+        """Call ``callback(focused, info)`` whenever the game gains or loses focus."""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Begin tracking (events if the backend has them, else polling)."""
+        with self._mode_lock:
+            if self._running:
+                return
+            self._running = True
+            self._stop.clear()
+            self.update(self.backend.foreground())
+            self._events = (self.backend.supports_events
+                            and self.backend.watch(self.update, self._events_lost))
+            if not self._events:
+                self._start_polling()
+
+    def stop(self):
+        """Stop tracking."""
+        with self._mode_lock:
+            self._running = False
+            self._stop.set()
+            events, self._events = self._events, False
+            thread, self._thread = self._thread, None
+        # Outside the lock: a dying watcher may be waiting for it
+        if events:
+            self.backend.unwatch()
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _start_polling(self):
+        self._thread = threading.Thread(target=self._poll_loop, name="focus-poll",
+                                        daemon=True)
+        self._thread.start()
+
+    def _events_lost(self):
+        """Backend watcher died: poll from now on (called on its thread)."""
+        with self._mode_lock:
+            if not self._running or not self._events:
+                return
+            self._events = False
+            self._start_polling()
+
+    def _poll_loop(self):
+        interval = self.min_poll
+        while not self._stop.wait(interval):
+            try:
+                changed = self.update(self.backend.foreground())
+            except Exception:
+                changed = False
+            interval = self.min_poll if changed else min(self.max_poll, interval * 1.5)
+
+    def classify(self, handle: Optional[int]):
+        """Whether a window belongs to the game, from the cache when possible.
+
+        Returns:
+            tuple: (is_target, WindowInfo or None)
+        """
+        return self._lookup(handle)[:2]
+
+    def _lookup(self, handle: Optional[int]):
+        if handle is None:
+            return False, None, float("inf")
+        now = self.clock()
+        entry = self._cache.get(handle)
+        if entry is not None and entry[2] > now:
+            # Fast path: no backend query until the entry expires
+            self.cache_hits += 1
+            return entry
+        self.cache_misses += 1
+        pid = self.backend.window_pid(handle)
+        title = self.backend.window_title(handle) or ""
+        if entry is not None and entry[1].pid == pid:
+            # Same process behind the handle: its name cannot have changed
+            process = entry[1].process
+        else:
+            process = self.backend.process_name(pid) if pid else ""
+        info = WindowInfo(handle, pid, title, process)
+        is_target = ((bool(self.title_hint) and self.title_hint in title.lower())
+                     or (bool(self.process_hint) and self.process_hint in process.lower()))
+        if len(self._cache) > 256:
+            self._cache = {k: v for k, v in self._cache.items() if v[2] > now}
+        entry = self._cache[handle] = (is_target, info, now + self.ttl)
+        return entry
+
+    def update(self, handle: Optional[int], force: bool = False) -> bool:
+        """Adopt a new foreground window (event callback / poll result).
+
+        Args:
+            handle: Foreground window handle
+            force: Re-check the window even if it did not change
+
+        Returns:
+            bool: True if the foreground window changed
+        """
+        with self._lock:
+            changed = handle != self.handle or not self._valid
+            if not changed and not force:
+                return False
+            try:
+                focused, info, expires = self._lookup(handle)
+            except Exception:
+                focused, info, expires = False, None, self.clock() + self.ttl
+            was_focused = self.focused
+            self.handle = handle
+            self.info = info
+            self.focused = focused
+            self._expires = expires
+            self._valid = True
+            if changed:
+                self.changes += 1
+        if focused != was_focused:
+            for callback in list(self._listeners):
+                try:
+                    callback(focused, info)
+                except Exception:
+                    pass
+        return changed
+
+    def is_target_focused(self) -> bool:
+        """Whether the game window is in front right now.
+
+        With events this only reads the tracked state; when polling it
+        also asks the backend for the foreground handle, so a switch
+        between two polls is not missed.
+        """
+        if not self._events:
+            handle = self.backend.foreground()
+            if handle != self.handle or not self._valid:
+                self.update(handle)
+                return self.focused
+        if self.clock() >= self._expires:
+            # Cached answer is stale (e.g. the window was renamed)
+            self.update(self.handle, force=True)
+        return self.focused
+
+    def invalidate(self):
+        """Drop all cached classifications."""
+        with self._lock:
+            self._cache.clear()
+            self._valid = False
@@ -1,6 +1,5 @@
 """Screen utilities for ROI management."""
 
-import pyautogui as pag
 from ..core.engine import ROI
 
 # Default ROI ratio (cx, cy, w, h) relative to screen
@@ -12,6 +11,7 @@ def screen_size() -> tuple[int, int]:
     Returns:
         tuple: (width, height)
     """
+    import pyautogui as pag  # Needs a display, so only on use
     w, h = pag.size()
     return int(w), int(h)
 
@@ -21,7 +21,17 @@ def make_default_roi() -> ROI:
     Returns:
         ROI: Default region of interest
     """
-    sw, sh = screen_size()
+    return roi_for_screen(*screen_size())
+
+def roi_for_screen(sw: int, sh: int) -> ROI:
+    """Create default ROI for a given screen size.
+    
+    Args:
+        sw, sh: Screen width and height
+        
+    Returns:
+        ROI: Default region of interest
+    """
     cx, cy, wr, hr = DEFAULT_ROI_RATIO
     w = int(sw * wr)
     h = int(sh * hr)
@@ -0,0 +1,95 @@
+"""Actuator queue, coalescing and latency stamps against MockInputBackend."""
+
+import time
+
+import pytest
+
+from src.core.actuator import Actuator
+from src.core.input import MockInputBackend
+
+
+@pytest.fixture
+def mock():
+    return MockInputBackend()
+
+
+@pytest.fixture
+def actuator(mock):
+    act = Actuator(mock, max_queue=2)
+    act.start()
+    yield act
+    act.abort()
+    act.close()
+
+
+def wait_for(condition, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.001)
+    return condition()
+
+
+def test_click_in_flight_coalesces_the_next(actuator, mock):
+    first = actuator.click(0.1)
+    assert first is not None
+    assert actuator.click(0.01) is None
+    assert actuator.coalesced == 1
+    actuator.wait(first)
+    # Once the first click is done, a new one goes through
+    second = actuator.click(0.01)
+    assert second is not None
+    actuator.wait(second)
+    assert mock.clicks == 2
+    assert actuator.sent == 2
+
+
+def test_bounded_queue_drops_overflow(actuator, mock):
+    busy = actuator.hold(0.3)
+    assert wait_for(lambda: mock.clicks == 1)
+    # The hold is executing; two more fit in the queue, the next does not
+    assert actuator.hold(0.01) is not None
+    assert actuator.hold(0.01) is not None
+    assert actuator.hold(0.01) is None
+    assert actuator.dropped == 1
+    actuator.wait(busy)
+    assert actuator.wait_idle(2.0)
+    assert mock.clicks == 3
+
+
+def test_abort_cuts_a_hold_short(actuator, mock):
+    cmd = actuator.hold(5.0)
+    assert wait_for(lambda: mock.clicks == 1)
+    started = time.perf_counter()
+    actuator.abort()
+    assert cmd.done.wait(1.0)
+    assert time.perf_counter() - started < 0.5
+    assert [kind for _, kind, _ in mock.events] == ["down", "up"]
+    # Aborted until the next start(): new commands are dropped
+    assert actuator.click(0.01) is None
+
+
+def test_latency_stamps_are_ordered(actuator):
+    decided = actuator.clock.now()
+    cmd = actuator.click(0.02, decided_at=decided)
+    actuator.wait(cmd)
+    assert cmd.decided_at == decided
+    assert cmd.sent_at >= cmd.decided_at
+    assert cmd.released_at >= cmd.sent_at + 0.02 - 0.002
+    assert cmd.latency == cmd.sent_at - cmd.decided_at
+    assert actuator.stats()["sent"] == 1
+
+
+def test_close_from_an_older_session_is_ignored(mock):
+    act = Actuator(mock)
+    old = act.start()
+    new = act.start()
+    assert new != old
+    act.close(generation=old)
+    cmd = act.click(0.01)
+    assert cmd is not None
+    act.wait(cmd)
+    assert mock.clicks == 1
+    act.close(generation=new)
+    assert act._thread is None
@@ -0,0 +1,62 @@
+"""LutClassifier against the HsvClassifier reference on synthetic frames."""
+
+import numpy as np
+import pytest
+
+from src.core.classifier import ColorThresholds, HsvClassifier, LutClassifier
+from src.core.sources import SyntheticFrameSource
+
+
+@pytest.fixture(scope="module")
+def pair():
+    return LutClassifier(), HsvClassifier()
+
+
+def assert_same_ratios(pair, frame):
+    lut, hsv = pair
+    assert lut.ratios(frame) == hsv.ratios(frame)
+
+
+def test_every_color_gets_the_reference_class(pair):
+    lut, hsv = pair
+    # All 2**24 BGR colors in one 4096x4096 image
+    packed = np.arange(1 << 24, dtype=np.uint32).reshape(4096, 4096)
+    frame = np.empty((4096, 4096, 3), dtype=np.uint8)
+    frame[:, :, 0] = packed & 0xFF
+    frame[:, :, 1] = (packed >> 8) & 0xFF
+    frame[:, :, 2] = packed >> 16
+    hsv.ratios(frame)
+    assert np.array_equal(lut.classify(frame), hsv.last_classes)
+
+
+@pytest.mark.parametrize("t", [0.1, 0.35, 0.5, 0.7, 0.9, 1.3])
+def test_synthetic_bar_frames(pair, t):
+    source = SyntheticFrameSource(idle_s=0.2, game_s=1.0)
+    frame = source.render(526, 70, t)
+    assert_same_ratios(pair, frame)
+    green, red = pair[0].ratios(frame)
+    if source.zones(t) != (0.0, 0.0):
+        assert green > 0.0 and red > 0.0
+
+
+def test_random_bgra_and_bgr_frames(pair):
+    rng = np.random.default_rng(1)
+    for shape in [(70, 526, 4), (70, 526, 3), (1, 1, 4), (33, 17, 3)]:
+        assert_same_ratios(pair, rng.integers(0, 256, shape, dtype=np.uint8))
+
+
+def test_region_view_of_a_larger_frame(pair):
+    # Regions classify slices of the shared grab without copying
+    frame = SyntheticFrameSource(idle_s=0.0).render(526, 140, 0.3)
+    assert_same_ratios(pair, frame[70:, 100:400])
+
+
+def test_overlapping_ranges_count_pixels_for_both():
+    # Green range wide enough to include the red hues as well
+    thresholds = ColorThresholds(green_low=(0, 50, 50), green_high=(179, 255, 255))
+    lut, hsv = LutClassifier(thresholds), HsvClassifier(thresholds)
+    assert lut._overlap
+    frame = SyntheticFrameSource(idle_s=0.0).render(526, 70, 0.3)
+    assert_same_ratios((lut, hsv), frame)
+    green, red = lut.ratios(frame)
+    assert 0.0 < red < green
@@ -0,0 +1,95 @@
+"""FishingEngine run lifecycle with the synthetic source and mock input."""
+
+import threading
+import time
+
+from src.core.engine import FishingEngine
+from src.core.regions import ROI
+from src.core.sources import SyntheticFrameSource
+from src.utils.config import DEFAULT_CONFIG
+
+ROI_BAR = ROI(0, 0, 526, 70)
+
+
+class BlockingRecorder:
+    """Recorder whose close() waits for the test, holding run() in teardown."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def start(self):
+        pass
+
+    def submit(self, frame):
+        pass
+
+    def close(self):
+        self.release.wait(5.0)
+
+
+def make_engine(**kwargs) -> FishingEngine:
+    config = dict(DEFAULT_CONFIG, input_backend="mock", metrics=False, hold_s=0.05)
+    engine = FishingEngine(config, source=SyntheticFrameSource(idle_s=0.0), **kwargs)
+    applied = []
+    apply_settings = engine._apply_settings
+
+    def spy(settings):
+        applied.append((settings.green_th, threading.current_thread().name))
+        apply_settings(settings)
+
+    engine._apply_settings = spy
+    return engine, applied
+
+
+def start_run(engine: FishingEngine) -> threading.Thread:
+    engine.start()
+    worker = threading.Thread(target=engine.run, args=(ROI_BAR,), name="engine", daemon=True)
+    worker.start()
+    return worker
+
+
+def test_publish_during_shutdown_is_applied_on_engine_thread():
+    recorder = BlockingRecorder()
+    engine, applied = make_engine(recorder=recorder)
+    worker = start_run(engine)
+    time.sleep(0.2)
+    engine.stop()
+    # run() is still in its finally block: running is False, but it has not exited
+    engine.publish_config(dict(engine.config, green_th=0.2))
+    assert not engine.wait_stopped(0.05)
+    assert (0.2, "MainThread") not in applied
+    recorder.release.set()
+    assert engine.wait_stopped(2.0)
+    worker.join(2.0)
+    assert (0.2, "engine") in applied
+    assert engine.settings.green_th == 0.2
+
+
+def test_publish_after_wait_stopped_is_applied_on_caller_thread():
+    engine, applied = make_engine()
+    worker = start_run(engine)
+    time.sleep(0.2)
+    engine.stop()
+    assert engine.wait_stopped(2.0)
+    worker.join(2.0)
+    engine.publish_config(dict(engine.config, green_th=0.3))
+    assert applied[-1] == (0.3, "MainThread")
+    assert engine.settings.green_th == 0.3
+
+
+def test_quick_restart_runs_one_loop_with_a_live_actuator():
+    engine, _ = make_engine()
+    first = start_run(engine)
+    time.sleep(0.3)
+    engine.stop()
+    # No wait: the old loop must exit and the new run must still click
+    second = start_run(engine)
+    first.join(2.0)
+    assert not first.is_alive()
+    sent = engine.actuator.sent
+    time.sleep(1.5)
+    assert second.is_alive()
+    assert engine.actuator.sent > sent
+    engine.stop()
+    assert engine.wait_stopped(2.0)
+    second.join(2.0)
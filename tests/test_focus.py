@@ -0,0 +1,201 @@
+"""FocusTracker driven through FakeFocusBackend, and X11FocusBackend under Xvfb."""
+
+import importlib.util
+import os
+import time
+
+import pytest
+
+from src.utils.focus import FakeFocusBackend, FocusTracker
+
+ROBLOX, TERMINAL = 1, 2
+
+
+class FakeClock:
+    """Manually advanced time for cache expiry."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def make_tracker(events: bool = True, ttl: float = 30.0):
+    backend = FakeFocusBackend(events=events)
+    backend.add_window(ROBLOX, 100, "Roblox", "RobloxPlayerBeta.exe")
+    backend.add_window(TERMINAL, 200, "bash", "xterm")
+    backend.active = TERMINAL
+    clock = FakeClock()
+    tracker = FocusTracker(backend, ttl=ttl, min_poll=0.01, max_poll=0.02, clock=clock)
+    return tracker, backend, clock
+
+
+def wait_for(condition, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def test_events_update_focus_and_listeners():
+    tracker, backend, _ = make_tracker()
+    seen = []
+    tracker.add_listener(lambda focused, info: seen.append((focused, info.handle)))
+    tracker.start()
+    try:
+        assert tracker.event_driven
+        assert not tracker.is_target_focused()
+        backend.set_foreground(ROBLOX)
+        assert tracker.is_target_focused()
+        backend.set_foreground(TERMINAL)
+        assert not tracker.is_target_focused()
+        assert seen == [(True, ROBLOX), (False, TERMINAL)]
+    finally:
+        tracker.stop()
+
+
+def test_cache_hits_skip_backend_queries():
+    tracker, backend, _ = make_tracker()
+    tracker.start()
+    try:
+        for _ in range(5):
+            backend.set_foreground(ROBLOX)
+            backend.set_foreground(TERMINAL)
+        for _ in range(100):
+            tracker.is_target_focused()
+        # Each window was classified once; later switches are cache hits
+        assert tracker.cache_misses == 2
+        assert tracker.cache_hits == 9
+        assert backend.calls["window_pid"] == 2
+        assert backend.calls["window_title"] == 2
+        assert backend.calls["process_name"] == 2
+        # Event-driven: checking focus never asks for the foreground window
+        assert backend.calls["foreground"] == 1
+    finally:
+        tracker.stop()
+
+
+def test_ttl_expiry_rechecks_pid_and_title():
+    tracker, backend, clock = make_tracker(ttl=5.0)
+    tracker.start()
+    try:
+        backend.set_foreground(ROBLOX)
+        assert tracker.is_target_focused()
+        clock.t = 6.0
+        backend.windows[ROBLOX] = (100, "Roblox - renamed")
+        assert tracker.is_target_focused()
+        assert tracker.info.title == "Roblox - renamed"
+        # Same pid: the process name comes from the expired entry
+        assert backend.calls["process_name"] == 2
+
+        clock.t = 12.0
+        backend.add_window(ROBLOX, 300, "Notes", "notepad.exe")
+        assert not tracker.is_target_focused()
+        assert tracker.info.pid == 300
+        assert backend.calls["process_name"] == 3
+    finally:
+        tracker.stop()
+
+
+def test_polling_without_events():
+    tracker, backend, _ = make_tracker(events=False)
+    tracker.start()
+    try:
+        assert not tracker.event_driven
+        backend.set_foreground(ROBLOX)
+        # Asks the backend, so a switch between two polls is not missed
+        assert tracker.is_target_focused()
+        backend.active = TERMINAL
+        assert wait_for(lambda: not tracker.focused)
+    finally:
+        tracker.stop()
+
+
+def test_dead_watcher_falls_back_to_polling():
+    tracker, backend, _ = make_tracker()
+    tracker.start()
+    try:
+        backend.set_foreground(ROBLOX)
+        assert tracker.focused
+        backend.kill_watcher()
+        assert not tracker.event_driven
+        # No event for this switch: only the polling thread can see it
+        backend.active = TERMINAL
+        assert wait_for(lambda: not tracker.focused)
+    finally:
+        tracker.stop()
+    assert tracker._thread is None
+
+
+def test_stop_detaches_from_backend():
+    tracker, backend, _ = make_tracker()
+    tracker.start()
+    tracker.stop()
+    assert not tracker.event_driven
+    backend.set_foreground(ROBLOX)
+    assert not tracker.focused
+
+
+# X11FocusBackend against a real X server (e.g. ``xvfb-run python -m pytest``)
+needs_x11 = pytest.mark.skipif(
+    not os.environ.get("DISPLAY") or importlib.util.find_spec("Xlib") is None,
+    reason="needs an X display (Xvfb) and python-xlib")
+
+
+@pytest.fixture
+def x11_windows():
+    from Xlib import Xatom, display
+    try:
+        conn = display.Display()
+    except Exception as e:
+        pytest.skip(f"X display unavailable: {e}")
+    screen = conn.screen()
+    atoms = {name: conn.intern_atom(name) for name in (
+        "_NET_ACTIVE_WINDOW", "_NET_WM_PID", "_NET_WM_NAME", "UTF8_STRING")}
+    windows = []
+    for title in (b"Roblox", b"xterm"):
+        window = screen.root.create_window(0, 0, 10, 10, 0, screen.root_depth)
+        window.change_property(atoms["_NET_WM_PID"], Xatom.CARDINAL, 32, [os.getpid()])
+        window.change_property(atoms["_NET_WM_NAME"], atoms["UTF8_STRING"], 8, title)
+        windows.append(window)
+    conn.sync()
+
+    def activate(handle: int):
+        # What an EWMH window manager does when focus moves
+        screen.root.change_property(atoms["_NET_ACTIVE_WINDOW"], Xatom.WINDOW, 32, [handle])
+        conn.sync()
+
+    yield windows[0].id, windows[1].id, activate
+    for window in windows:
+        window.destroy()
+    conn.close()
+
+
+@needs_x11
+def test_x11_focus_changes_arrive_as_property_events(x11_windows):
+    from src.utils.focus import X11FocusBackend
+    game, other, activate = x11_windows
+    activate(other)
+    backend = X11FocusBackend()
+    tracker = FocusTracker(backend, title_hint="Roblox", process_hint="")
+    tracker.start()
+    try:
+        assert tracker.event_driven
+        assert tracker.handle == other
+        assert not tracker.focused
+        activate(game)
+        assert wait_for(lambda: tracker.focused)
+        assert tracker.handle == game
+        assert tracker.info.title == "Roblox"
+        activate(other)
+        assert wait_for(lambda: not tracker.focused)
+        assert tracker.changes == 3
+        # Seen through PropertyNotify: no polling thread was ever started
+        assert tracker.event_driven
+        assert tracker._thread is None
+    finally:
+        tracker.stop()
+        backend.close()
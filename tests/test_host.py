@@ -0,0 +1,58 @@
+"""EngineHost with two instances on the synthetic source and mock input."""
+
+import time
+
+import pytest
+
+from src.core.host import EngineHost
+from src.core.regions import ROI
+from src.core.sources import SyntheticFrameSource
+from src.utils.config import DEFAULT_CONFIG
+
+
+@pytest.fixture(scope="module")
+def hosted():
+    config = dict(DEFAULT_CONFIG, input_backend="mock", metrics_dir="", hold_s=0.2)
+    host = EngineHost(config, source=SyntheticFrameSource(idle_s=0.3, game_s=1.5))
+    host.add("w1", ROI(0, 0, 526, 70))
+    host.add("w2", ROI(0, 70, 526, 70))
+    host.start()
+    time.sleep(3.0)
+    host.stop()
+    yield host, host.metrics()
+    host.close()
+
+
+def test_one_grab_per_tick_is_shared(hosted):
+    host, metrics = hosted
+    capture = metrics["capture"]
+    assert capture["union"] == {"x": 0, "y": 0, "w": 526, "h": 140}
+    assert capture["grabs"] < capture["requests"]
+    assert capture["shared"] > 0.0
+
+
+def test_every_instance_presses(hosted):
+    host, metrics = hosted
+    presses = {name: inst["input"]["presses"] for name, inst in metrics["instances"].items()}
+    assert all(count > 0 for count in presses.values()), presses
+    # Every press of an instance reached the one shared backend
+    assert sum(presses.values()) == host.input.backend.clicks
+
+
+def test_presses_and_window_switches_are_serialized(hosted):
+    host, metrics = hosted
+    events = [kind for _, kind, _ in host.input.backend.events]
+    down = False
+    for kind in events:
+        if kind == "down":
+            assert not down, "press while the button was already down"
+            down = True
+        elif kind == "up":
+            assert down, "release without a press"
+            down = False
+        elif kind == "move":
+            assert not down, "cursor moved to another window mid-press"
+    assert not down
+    switches = sum(inst["input"]["switches"] for inst in metrics["instances"].values())
+    assert switches == metrics["input"]["switches"] == events.count("move")
+    assert switches >= 2  # Both windows got the mouse at least once
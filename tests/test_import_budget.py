@@ -0,0 +1,43 @@
+"""Cold-start imports: no lazy-only modules, and time within the recorded budget."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.import_budget import FORBIDDEN_MODULES, REPO_ROOT, find_forbidden, measure_once
+
+# Recorded with ``--save-budget`` (machine and Python version are in the file)
+BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+# Allowed slowdown against the budget; generous because the budget was
+# recorded on one machine and import time varies with disk and CPU
+HEADROOM = 1.0
+
+
+def assert_no_forbidden(module: str):
+    result = measure_once(module)
+    assert "error" not in result, result.get("error")
+    found = find_forbidden(result["entries"])
+    assert not found, f"{module} imports {found} at startup (lazy-only: {FORBIDDEN_MODULES})"
+
+
+def test_cli_imports_no_lazy_only_modules():
+    assert_no_forbidden("src.cli")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("customtkinter") is None,
+                    reason="customtkinter not installed")
+def test_gui_imports_no_lazy_only_modules():
+    assert_no_forbidden("src.gui.main_window")
+
+
+def test_cli_import_time_within_budget():
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.import_budget", "-m", "src.cli", "-n", "3", "--top", "0",
+         "--budget", BUDGET, "--tolerance", str(HEADROOM)],
+        cwd=REPO_ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "Within import budget." in proc.stdout
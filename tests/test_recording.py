@@ -0,0 +1,98 @@
+"""Frame recordings: RLE codec and .mfr round-trips, raw and via the .idx sidecar."""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.core.recording import (INDEX_DTYPE, KIND_DELTA, KIND_KEY, KIND_RAW, FrameRecorder,
+                                FrameRecording, rle_decode, rle_encode)
+from src.core.sources import SyntheticFrameSource
+from src.core.vision import Frame
+
+
+def make_frames():
+    """Synthetic bar frames plus one noise frame that RLE cannot shrink."""
+    source = SyntheticFrameSource(idle_s=0.1, game_s=1.0)
+    frames = [source.render(120, 20, 0.05 * i) for i in range(12)]
+    rng = np.random.default_rng(4)
+    frames[7] = rng.integers(0, 256, frames[7].shape, dtype=np.uint8)
+    return frames
+
+
+def record(path: str, frames, **kwargs) -> FrameRecorder:
+    # One slot per frame so the writer thread never causes a drop
+    with FrameRecorder(path, max_queue=len(frames), **kwargs) as recorder:
+        for i, img in enumerate(frames):
+            recorder.submit(Frame(img, 100.0 + i))
+    return recorder
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.dtype("<u4")])
+def test_rle_round_trip(dtype):
+    data = np.array([0, 0, 0, 7, 7, 1, 0, 0, 255, 255, 255, 255], dtype=dtype)
+    payload = rle_encode(data)
+    assert int(np.frombuffer(payload[:4], "<u4")[0]) == 5  # runs
+    assert np.array_equal(rle_decode(payload, data.size, dtype), data)
+    assert rle_decode(rle_encode(data[:0]), 0, dtype).size == 0
+
+
+def test_rle_rejects_wrong_size():
+    payload = rle_encode(np.zeros(10, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        rle_decode(payload, 11)
+
+
+def test_raw_round_trip(tmp_path):
+    frames = make_frames()
+    path = str(tmp_path / "raw.mfr")
+    recorder = record(path, frames)
+    assert (recorder.written, recorder.dropped) == (len(frames), 0)
+    assert not os.path.exists(path + ".idx")
+
+    # A partly written last record is ignored
+    with open(path, "ab") as f:
+        f.write(b"\0" * 10)
+    recording = FrameRecording(path)
+    assert not recording.compressed
+    assert recording.shape == (len(frames), 20, 120, 4)
+    assert np.array_equal(recording.timestamps, 100.0 + np.arange(len(frames)))
+    for i, img in enumerate(frames):
+        assert np.array_equal(recording[i], img)
+    recording.close()
+
+
+def test_compressed_round_trip_through_index(tmp_path):
+    frames = make_frames()
+    path = str(tmp_path / "rle.mfr")
+    recorder = record(path, frames, compress=True, keyframe_interval=4)
+    assert recorder.written == len(frames)
+    assert os.path.getsize(path + ".idx") == len(frames) * INDEX_DTYPE.itemsize
+
+    recording = FrameRecording(path)
+    assert recording.compressed and recording.keyframe_interval == 4
+    kinds = list(recording._index["kind"])
+    assert kinds[0] == kinds[4] == kinds[8] == KIND_KEY
+    assert kinds[7] == KIND_RAW  # Noise is stored as is
+    assert kinds[1] == KIND_DELTA
+    # Synthetic frames compress well despite the raw noise frame
+    assert os.path.getsize(path) < len(frames) * frames[0].nbytes / 2
+    assert np.array_equal(recording.timestamps, 100.0 + np.arange(len(frames)))
+
+    # Backwards (decodes from keyframes), forwards (from the cached frame)
+    # and negative indices all give the recorded frames
+    for i in [*reversed(range(len(frames))), *range(len(frames))]:
+        assert np.array_equal(recording[i], frames[i]), i
+    assert np.array_equal(recording[-1], frames[-1])
+    with pytest.raises(IndexError):
+        recording[len(frames)]
+    recording.close()
+
+
+def test_size_change_mid_recording_is_dropped(tmp_path):
+    path = str(tmp_path / "mixed.mfr")
+    frames = make_frames()[:3]
+    frames.insert(1, np.zeros((10, 10, 4), dtype=np.uint8))
+    recorder = record(path, frames)
+    assert (recorder.written, recorder.dropped) == (3, 1)
+    assert len(FrameRecording(path)) == 3
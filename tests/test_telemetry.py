@@ -0,0 +1,79 @@
+"""Telemetry seqlock: readers never see fields from two different writes."""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from src.core.telemetry import Action, Telemetry, format_action
+
+
+@pytest.fixture
+def fast_switching():
+    # Switch threads as often as possible so a read lands mid-write
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_publish_bumps_sequence_by_two():
+    telemetry = Telemetry()
+    telemetry.publish_ratios(0.5, 0.25)
+    sample = telemetry.read()
+    assert sample.seq == 2
+    assert (sample.green, sample.red) == (0.5, 0.25)
+    telemetry.publish_action(Action.HOLD, 1.5)
+    assert telemetry.read().seq == 4
+    assert format_action(telemetry.read()) == "Hold 1.50s..."
+
+
+def test_unchanged_action_is_not_republished():
+    telemetry = Telemetry()
+    telemetry.publish_action(Action.CLICK)
+    seq = telemetry.seq
+    telemetry.publish_action(Action.CLICK)
+    assert telemetry.seq == seq
+    telemetry.publish_action(Action.RECAST, 0.5)
+    assert telemetry.seq == seq + 2
+
+
+def test_concurrent_reads_are_never_torn(fast_switching):
+    telemetry = Telemetry()
+    stop = threading.Event()
+
+    def writer():
+        # Every write keeps green == -red and arg == green
+        i = 0
+        while not stop.is_set():
+            i += 1
+            telemetry.publish_ratios(float(i), float(-i), regions=(i,))
+            telemetry.publish_action(Action.HOLD if i & 1 else Action.RECAST, float(i))
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    reads = 0
+    last_seq = 0
+    deadline = time.monotonic() + 0.5
+    try:
+        while time.monotonic() < deadline:
+            sample = telemetry.read()
+            reads += 1
+            assert not sample.seq & 1
+            assert sample.seq >= last_seq
+            last_seq = sample.seq
+            if sample.seq == 0:
+                continue
+            assert sample.green == -sample.red
+            assert sample.regions == (int(sample.green),)
+            # The action is written after the ratios of the same step
+            step = int(sample.green)
+            assert sample.arg in (step, step - 1)
+            expected = Action.HOLD if int(sample.arg) & 1 else Action.RECAST
+            assert sample.action is expected or sample.arg == 0.0
+    finally:
+        stop.set()
+        thread.join()
+    assert reads > 100
+    assert last_seq > 0